@@ -0,0 +1,98 @@
+import ast
+import os
+import struct
+import sys
+
+LOCALES_DIR = "locales"
+DOMAIN = "binity"
+MO_MAGIC = 0x950412DE
+
+
+def _unquote(text):
+    return ast.literal_eval(text)
+
+
+def parse_po(path):
+    messages = {}
+    msgid = None
+    msgstr = None
+    section = None
+
+    def _flush():
+        if msgid is not None and msgstr is not None:
+            messages[msgid] = msgstr
+
+    with open(path, "r", encoding="utf-8") as fh:
+        for raw_line in fh:
+            line = raw_line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("msgid "):
+                _flush()
+                msgid = _unquote(line[6:])
+                msgstr = None
+                section = "msgid"
+            elif line.startswith("msgstr "):
+                msgstr = _unquote(line[7:])
+                section = "msgstr"
+            elif line.startswith('"'):
+                if section == "msgid":
+                    msgid += _unquote(line)
+                elif section == "msgstr":
+                    msgstr += _unquote(line)
+    _flush()
+    return messages
+
+
+def build_mo(messages):
+    keys = sorted(messages.keys())
+    ids = b""
+    strs = b""
+    offsets = []
+    for key in keys:
+        key_b = key.encode("utf-8")
+        value_b = messages[key].encode("utf-8")
+        offsets.append((len(ids), len(key_b), len(strs), len(value_b)))
+        ids += key_b + b"\0"
+        strs += value_b + b"\0"
+
+    count = len(keys)
+    key_table_start = 7 * 4
+    value_table_start = key_table_start + count * 8
+    ids_start = value_table_start + count * 8
+    strs_start = ids_start + len(ids)
+
+    key_table = []
+    value_table = []
+    for id_offset, id_len, str_offset, str_len in offsets:
+        key_table += [id_len, ids_start + id_offset]
+        value_table += [str_len, strs_start + str_offset]
+
+    header = struct.pack("Iiiiiii", MO_MAGIC, 0, count, key_table_start, value_table_start, 0, 0)
+    return (
+        header
+        + struct.pack(f"{len(key_table)}i", *key_table)
+        + struct.pack(f"{len(value_table)}i", *value_table)
+        + ids
+        + strs
+    )
+
+
+def compile_all(root=LOCALES_DIR):
+    compiled = []
+    for language in sorted(os.listdir(root)):
+        po_path = os.path.join(root, language, "LC_MESSAGES", f"{DOMAIN}.po")
+        if not os.path.exists(po_path):
+            continue
+        mo_path = po_path[:-3] + ".mo"
+        with open(mo_path, "wb") as fh:
+            fh.write(build_mo(parse_po(po_path)))
+        compiled.append(mo_path)
+    return compiled
+
+
+if __name__ == "__main__":
+    base = os.path.dirname(os.path.abspath(__file__))
+    for path in compile_all(os.path.join(base, LOCALES_DIR)):
+        print(f"Compiled {os.path.relpath(path, base)}")
+    sys.exit(0)
@@ -0,0 +1,59 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+LATENCIES_SEC = (0.0, 0.05, 0.2)
+SEGMENT_COUNTS = (1, 2, 4)
+PAYLOAD_BYTES = 8 * 1024 * 1024
+CONNECTION_RATE = 4 * 1024 * 1024
+
+
+def main():
+    # Update caches go to a throwaway folder so the benchmark never touches a real profile.
+    sandbox = tempfile.mkdtemp(prefix="binity-dlbench-")
+    os.environ["APPDATA"] = os.path.join(sandbox, "Roaming")
+    os.environ["LOCALAPPDATA"] = os.path.join(sandbox, "Local")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from src.core import updater as updater_module
+    from src.core.settings import Settings
+    from src.core.updater import Updater
+    from tests.asset_server import AssetServer
+
+    updater_module.SEGMENTED_MIN_SIZE = 1024 * 1024
+    server = AssetServer(os.urandom(PAYLOAD_BYTES))
+    server.connection_rate = CONNECTION_RATE
+    results = []
+    try:
+        for latency in LATENCIES_SEC:
+            server.latency = latency
+            for segments in SEGMENT_COUNTS:
+                updater_module.DOWNLOAD_SEGMENTS = segments
+                updater = Updater(Settings())
+                partial, meta_path = updater._partial_paths("Binity.exe")
+                partial.parent.mkdir(parents=True, exist_ok=True)
+                updater._discard_partial(partial, meta_path)
+
+                started = time.perf_counter()
+                updater._download_to_partial(server.url, PAYLOAD_BYTES, partial, meta_path, None, None)
+                elapsed = time.perf_counter() - started
+                updater.http.close()
+                results.append(
+                    {
+                        "latency_ms": int(latency * 1000),
+                        "segments": segments,
+                        "seconds": round(elapsed, 3),
+                        "mib_per_sec": round(PAYLOAD_BYTES / elapsed / (1024 * 1024), 1),
+                    }
+                )
+    finally:
+        server.close()
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
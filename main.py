@@ -1,5 +1,27 @@
-from src.main import main
+import sys
+
+from src.core.update_swap import APPLY_UPDATE_SWITCH
 
 
 if __name__ == "__main__":
+    if APPLY_UPDATE_SWITCH in sys.argv:
+        from src.core.update_swap import main as apply_update
+
+        raise SystemExit(apply_update(sys.argv))
+
+    from src.cli import is_cli_invocation
+
+    if is_cli_invocation(sys.argv[1:]):
+        from src.cli import main as run_cli
+
+        raise SystemExit(run_cli(sys.argv[1:]))
+
+    from src.core.ipc import forward_to_running_instance
+
+    forwarded = forward_to_running_instance(sys.argv[1:])
+    if forwarded is not None:
+        raise SystemExit(forwarded)
+
+    from src.main import main
+
     raise SystemExit(main())
@@ -0,0 +1,69 @@
+import json
+import os
+import sys
+import tempfile
+
+SECONDS_PER_HOUR = 3600
+
+
+def _flush_deferred_deletes(app):
+    from PyQt6.QtCore import QCoreApplication, QEvent
+
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    app.processEvents()
+
+
+def main():
+    # Settings, logs and update caches go to a throwaway folder so the benchmark never touches a real profile.
+    sandbox = tempfile.mkdtemp(prefix="binity-membench-")
+    os.environ["APPDATA"] = os.path.join(sandbox, "Roaming")
+    os.environ["LOCALAPPDATA"] = os.path.join(sandbox, "Local")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from PyQt6.QtWidgets import QApplication
+
+    from src.core.i18n import I18n
+    from src.core.memory import current_rss, freeze_startup_objects, trim_working_set
+    from src.core.settings import Settings
+    from src.ui.tray.tray_app import TrayApp
+
+    results = []
+
+    def record(stage):
+        rss = current_rss()
+        results.append({"stage": stage, "rss_bytes": rss, "rss_mib": round(rss / (1024 * 1024), 2)})
+
+    app = QApplication(sys.argv[:1])
+    app.setQuitOnLastWindowClosed(False)
+    settings = Settings()
+    settings.set("auto_check_updates", False)
+    tray_app = TrayApp(settings=settings, i18n=I18n(settings.language))
+    app.processEvents()
+    freeze_startup_objects()
+    record("startup")
+
+    tray_app.show_about()
+    app.processEvents()
+    tray_app._about_dialog.hide()
+    app.processEvents()
+    record("after_about_dialog")
+
+    ticks = SECONDS_PER_HOUR // settings.update_interval_sec
+    for _ in range(ticks):
+        tray_app._refresh_state()
+        app.processEvents()
+    record(f"after_{ticks}_refresh_ticks")
+
+    tray_app.release_idle_resources()
+    _flush_deferred_deletes(app)
+    trim_working_set()
+    record("after_idle_release")
+
+    tray_app.quit_app()
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,9 +7,11 @@ import subprocess
 import shutil
 import time
 
+from src.core.delta import create_patch, file_sha256
+
 # --- CONFIGURATION ---
 REPO = "Volfheim/Binity"
-BUILD_CMD = 'pyinstaller --noconsole --onefile --icon=icons/bin_full.ico --add-data "icons;icons" --add-data "sounds;sounds" --name "Binity" main.py'
+BUILD_CMD = 'pyinstaller --noconsole --onefile --icon=icons/bin_full.ico --add-data "icons;icons" --add-data "sounds;sounds" --add-data "locales;locales" --name "Binity" main.py'
 
 RELEASES = [
     {
@@ -172,6 +174,7 @@ def request(url, method="GET", data=None, content_type="application/json"):
 
 def build_exe():
     print("  Building EXE...")
+    subprocess.check_call([sys.executable, "compile_translations.py"])
     
     for _ in range(3):
         try:
@@ -198,6 +201,54 @@ def build_exe():
     if os.path.exists(exe_path): return exe_path
     return None
 
+def upload_asset(release, path, name, content_type="application/octet-stream"):
+    print(f"  Uploading {name}...")
+    upload_url = release['upload_url'].replace("{?name,label}", f"?name={name}")
+    with open(path, 'rb') as f:
+        file_content = f.read()
+    req = urllib.request.Request(
+        upload_url,
+        data=file_content,
+        headers={**headers, "Content-Type": content_type},
+        method="POST"
+    )
+    try:
+        with urllib.request.urlopen(req): print(f"  {name} uploaded!")
+    except Exception as e: print(f"  Upload failed: {e}")
+
+def build_delta_patch(prev, tag, exe_path):
+    if not prev or not exe_path: return None
+    try:
+        previous = request(f"https://api.github.com/repos/{REPO}/releases/tags/{prev}")
+    except urllib.error.HTTPError:
+        print(f"  No release {prev}, skipping delta patch")
+        return None
+
+    asset = next((a for a in previous.get("assets", []) if a.get("name", "").lower() == "binity.exe"), None)
+    if not asset:
+        print(f"  {prev} has no Binity.exe, skipping delta patch")
+        return None
+
+    print(f"  Building delta patch {prev} -> {tag}...")
+    previous_exe = os.path.join("build", f"Binity-{prev}.exe")
+    os.makedirs("build", exist_ok=True)
+    req = urllib.request.Request(asset["browser_download_url"], headers={"User-Agent": "Binity-Release"})
+    with urllib.request.urlopen(req) as src, open(previous_exe, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+
+    patch_name = f"Binity-{prev.lstrip('vV')}-to-{tag.lstrip('vV')}.patch"
+    patch_path = os.path.join("dist", patch_name)
+    size = create_patch(previous_exe, exe_path, patch_path)
+    print(f"    {patch_name}: {size} bytes (full exe: {os.path.getsize(exe_path)} bytes)")
+    return patch_path
+
+def write_checksum_manifest(paths):
+    manifest_path = os.path.join("dist", "SHA256SUMS.txt")
+    with open(manifest_path, "w", encoding="utf-8", newline="\n") as fh:
+        for path in paths:
+            fh.write(f"{file_sha256(path).hex()}  {os.path.basename(path)}\n")
+    return manifest_path
+
 def process_releases():
     subprocess.call("git checkout main", shell=True)
     
@@ -244,19 +295,22 @@ def process_releases():
 
         # 5. UPLOAD ASSET
         if exe_path:
-            print(f"  Uploading Binity.exe...")
-            upload_url = release['upload_url'].replace("{?name,label}", f"?name=Binity.exe")
-            with open(exe_path, 'rb') as f:
-                file_content = f.read()
-            req = urllib.request.Request(
-                upload_url, 
-                data=file_content, 
-                headers={**headers, "Content-Type": "application/vnd.microsoft.portable-executable"}, 
-                method="POST"
-            )
-            try:
-                with urllib.request.urlopen(req): print("  Asset uploaded!")
-            except Exception as e: print(f"  Upload failed: {e}")
+            upload_asset(release, exe_path, "Binity.exe", "application/vnd.microsoft.portable-executable")
+
+        # 6. DELTA PATCH FROM PREVIOUS RELEASE
+        try:
+            patch_path = build_delta_patch(prev, tag, exe_path)
+        except Exception as e:
+            print(f"  Delta patch failed: {e}")
+            patch_path = None
+        if patch_path:
+            upload_asset(release, patch_path, os.path.basename(patch_path))
+
+        # 7. CHECKSUM MANIFEST
+        manifest_inputs = [path for path in (exe_path, patch_path) if path]
+        if manifest_inputs:
+            manifest_path = write_checksum_manifest(manifest_inputs)
+            upload_asset(release, manifest_path, "SHA256SUMS.txt", "text/plain")
 
     subprocess.call("git checkout main", shell=True)
 
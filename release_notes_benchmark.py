@@ -0,0 +1,89 @@
+import ast
+import json
+import os
+import re
+import sys
+import time
+
+CHANGELOG_COPIES = 50
+REPEATS = 5
+RELEASE_HELPER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "release_helper.py")
+
+
+def load_releases():
+    # release_helper looks up a GitHub token on import, so the RELEASES literal is read without running it.
+    with open(RELEASE_HELPER, "r", encoding="utf-8") as fh:
+        tree = ast.parse(fh.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(target, "id", "") == "RELEASES" for target in node.targets):
+            return ast.literal_eval(node.value)
+    return []
+
+
+def legacy_format_release_notes(raw):
+    # The multi-pass renderer the update dialog used before release_notes.py; kept as the baseline.
+    text = str(raw or "").strip()
+    if not text:
+        return "-"
+
+    lines = []
+    for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        current = line.rstrip()
+        if not current.strip():
+            lines.append("")
+            continue
+        current = re.sub(r"^\s{0,3}#{1,6}\s*", "", current)
+        bullet = bool(re.match(r"^\s*[-*+]\s+", current))
+        if bullet:
+            current = re.sub(r"^\s*[-*+]\s+", "", current)
+        current = re.sub(r"!\[([^\]]*)\]\(([^)]+)\)", r"\1", current)
+        current = re.sub(r"\[([^\]]+)\]\((https?://[^)]+)\)", r"\1 (\2)", current)
+        current = re.sub(r"`([^`]*)`", r"\1", current)
+        current = current.replace("**", "").replace("__", "")
+        current = re.sub(r"~~([^~]+)~~", r"\1", current)
+        current = current.strip()
+        if bullet and current:
+            current = f"- {current}"
+        lines.append(current)
+
+    normalized = "\n".join(lines)
+    normalized = re.sub(r"\n{3,}", "\n\n", normalized).strip()
+    normalized = re.sub(r"\*\*(.*?)\*\*", r"\1", normalized)
+    normalized = re.sub(r"__(.*?)__", r"\1", normalized)
+    normalized = re.sub(r"\*(.*?)\*", r"\1", normalized)
+    normalized = re.sub(r"_(.*?)_", r"\1", normalized)
+    return normalized or "-"
+
+
+def _best_ms(render, text):
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        render(text)
+        timings.append(time.perf_counter() - started)
+    return round(min(timings) * 1000, 4)
+
+
+def main():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from src.core.release_notes import format_release_notes
+
+    changelog = "\n\n".join(release["body"] for release in load_releases()) * CHANGELOG_COPIES
+
+    def _cold(text):
+        format_release_notes.cache_clear()
+        return format_release_notes(text)
+
+    results = {
+        "changelog_chars": len(changelog),
+        "legacy_ms": _best_ms(legacy_format_release_notes, changelog),
+        "single_pass_ms": _best_ms(_cold, changelog),
+        "cached_ms": _best_ms(format_release_notes, changelog),
+    }
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
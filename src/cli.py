@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict
+
+from src.core.formatting import format_size
+from src.core.ipc import IPC_COMMANDS
+from src.core.settings import Settings
+from src.services.recycle_bin import (
+    SECURE_DELETE_MODES,
+    SECURE_DELETE_OFF,
+    SECURE_DELETE_ZERO,
+    RecycleBinService,
+)
+
+CLI_COMMANDS = ("status", "empty", "wipe")
+JSON_SWITCH = "--json"
+
+
+def is_cli_invocation(argv: list[str]) -> bool:
+    """Headless when asked for JSON, or for commands the tray does not handle."""
+    command = next((arg for arg in argv if not arg.startswith("-")), "")
+    if command not in CLI_COMMANDS:
+        return False
+    return JSON_SWITCH in argv or command not in IPC_COMMANDS
+
+
+def _attach_console() -> None:
+    # The frozen build is a GUI-subsystem exe with no stdout; borrow the parent's console.
+    if sys.stdout is not None or os.name != "nt":
+        return
+    try:
+        import ctypes
+
+        if ctypes.windll.kernel32.AttachConsole(-1):
+            sys.stdout = open("CONOUT$", "w", encoding="utf-8")
+            sys.stderr = sys.stdout
+    except Exception:
+        pass
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    # --json is accepted on either side of the subcommand.
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(JSON_SWITCH, dest="json", action="store_true", help="print machine-readable JSON")
+
+    parser = argparse.ArgumentParser(prog="Binity", description="Recycle Bin tools without the tray UI.", parents=[common])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    status = commands.add_parser("status", parents=[common], help="show recycle bin size and item count")
+    status.add_argument("--drives", action="store_true", help="include per-drive statistics")
+
+    empty = commands.add_parser("empty", parents=[common], help="empty the recycle bin")
+    empty.add_argument("--secure", choices=sorted(SECURE_DELETE_MODES), help="override the secure delete mode")
+
+    wipe = commands.add_parser("wipe", parents=[common], help="overwrite recycled files, then empty the bin")
+    wipe.add_argument("--mode", choices=sorted(SECURE_DELETE_MODES - {SECURE_DELETE_OFF}))
+    return parser
+
+
+def _print(payload: dict, as_json: bool, text: str) -> None:
+    print(json.dumps(payload, ensure_ascii=False) if as_json else text)
+
+
+def _run_status(args: argparse.Namespace) -> int:
+    payload = RecycleBinService.status(per_drive=args.drives)
+    lines = [f"Items: {payload['items']}", f"Size: {payload['size']}"]
+    for letter, drive in payload.get("drives", {}).items():
+        lines.append(f"  {letter}: {drive['items']} items, {format_size(drive['size_bytes'])}")
+    _print({"ok": True, **payload}, args.json, "\n".join(lines))
+    return 0
+
+
+def _run_empty(secure_mode: str, as_json: bool) -> int:
+    result = RecycleBinService.empty_bin(secure_mode)
+    text = "Recycle Bin emptied" if result.success else "Failed to empty the Recycle Bin"
+    if result.secure_mode != SECURE_DELETE_OFF:
+        text += f" ({result.wiped_files} files, {format_size(result.wiped_bytes)} wiped, {result.wipe_failures} failed)"
+    _print({"ok": result.success, **asdict(result)}, as_json, text)
+    return 0 if result.success else 1
+
+
+def main(argv: list[str]) -> int:
+    _attach_console()
+    args = _build_parser().parse_args(argv)
+    args.json = JSON_SWITCH in argv
+
+    if args.command == "status":
+        return _run_status(args)
+
+    settings = Settings()
+    if args.command == "empty":
+        return _run_empty(args.secure or settings.secure_delete_mode, args.json)
+
+    mode = args.mode or settings.secure_delete_mode
+    if mode == SECURE_DELETE_OFF:
+        mode = SECURE_DELETE_ZERO
+    return _run_empty(mode, args.json)
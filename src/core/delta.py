@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator
+
+PATCH_MAGIC = b"BNDELTA1"
+OP_COPY = b"C"
+OP_INSERT = b"I"
+OP_END = b"E"
+
+_HEADER = struct.Struct("<Q32sQ32s")
+_COPY = struct.Struct("<QI")
+_INSERT = struct.Struct("<II")
+
+CHUNK_MIN_SIZE = 2 * 1024
+CHUNK_MAX_SIZE = 64 * 1024
+INSERT_MAX_SIZE = 1024 * 1024
+# zlib can grow incompressible input by a few hundred bytes; anything beyond this is corrupt.
+INSERT_MAX_PACKED_SIZE = INSERT_MAX_SIZE + 4096
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Content-defined chunk boundaries: any of these byte pairs ends a chunk, so an
+# insertion only shifts the chunks around it instead of every block after it.
+_BOUNDARY_RE = re.compile(
+    b"|".join(
+        re.escape(bytes(pair))
+        for pair in ((0x8F, 0x3A), (0x1D, 0xC4), (0x6B, 0x59), (0xE2, 0x07), (0x35, 0xB1), (0xC9, 0x6E))
+    )
+)
+
+
+class DeltaError(RuntimeError):
+    pass
+
+
+def file_sha256(path: Path, buffer_size: int = COPY_BUFFER_SIZE) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while True:
+            block = fh.read(buffer_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.digest()
+
+
+def _iter_chunks(data: bytes) -> Iterator[tuple[int, int]]:
+    start = 0
+    size = len(data)
+    for match in _BOUNDARY_RE.finditer(data):
+        end = match.end()
+        while end - start > CHUNK_MAX_SIZE:
+            yield start, start + CHUNK_MAX_SIZE
+            start += CHUNK_MAX_SIZE
+        if end - start >= CHUNK_MIN_SIZE:
+            yield start, end
+            start = end
+    while start < size:
+        end = min(start + CHUNK_MAX_SIZE, size)
+        yield start, end
+        start = end
+
+
+def _chunk_key(block: bytes) -> bytes:
+    return hashlib.blake2b(block, digest_size=16).digest()
+
+
+def create_patch(old_path: Path, new_path: Path, patch_path: Path) -> int:
+    old_data = Path(old_path).read_bytes()
+    new_data = Path(new_path).read_bytes()
+
+    index: dict[bytes, int] = {}
+    for start, end in _iter_chunks(old_data):
+        index.setdefault(_chunk_key(old_data[start:end]), start)
+
+    ops: list[tuple[bytes, int, int]] = []
+    for start, end in _iter_chunks(new_data):
+        old_offset = index.get(_chunk_key(new_data[start:end]))
+        length = end - start
+        if old_offset is not None:
+            if ops and ops[-1][0] == OP_COPY and ops[-1][1] + ops[-1][2] == old_offset:
+                ops[-1] = (OP_COPY, ops[-1][1], ops[-1][2] + length)
+            else:
+                ops.append((OP_COPY, old_offset, length))
+        elif ops and ops[-1][0] == OP_INSERT and ops[-1][2] + length <= INSERT_MAX_SIZE:
+            ops[-1] = (OP_INSERT, ops[-1][1], ops[-1][2] + length)
+        else:
+            ops.append((OP_INSERT, start, length))
+
+    with open(patch_path, "wb") as out:
+        out.write(PATCH_MAGIC)
+        out.write(
+            _HEADER.pack(
+                len(old_data),
+                hashlib.sha256(old_data).digest(),
+                len(new_data),
+                hashlib.sha256(new_data).digest(),
+            )
+        )
+        for op, offset, length in ops:
+            if op == OP_COPY:
+                out.write(OP_COPY + _COPY.pack(offset, length))
+            else:
+                payload = zlib.compress(new_data[offset:offset + length], 9)
+                out.write(OP_INSERT + _INSERT.pack(length, len(payload)))
+                out.write(payload)
+        out.write(OP_END)
+        return out.tell()
+
+
+def _read_exact(fh: BinaryIO, size: int) -> bytes:
+    data = fh.read(size)
+    if len(data) != size:
+        raise DeltaError("Patch is truncated")
+    return data
+
+
+def _read_header(fh: BinaryIO) -> tuple[int, bytes, int, bytes]:
+    if _read_exact(fh, len(PATCH_MAGIC)) != PATCH_MAGIC:
+        raise DeltaError("Not a Binity delta patch")
+    return _HEADER.unpack(_read_exact(fh, _HEADER.size))
+
+
+def _inflate_insert(packed: bytes, length: int) -> bytes:
+    inflater = zlib.decompressobj()
+    try:
+        block = inflater.decompress(packed, length + 1)
+    except zlib.error as exc:
+        raise DeltaError(f"Patch insert is corrupt: {exc}") from exc
+    if len(block) != length or not inflater.eof or inflater.unconsumed_tail or inflater.unused_data:
+        raise DeltaError("Patch insert has the wrong length")
+    return block
+
+
+def apply_patch(
+    source_path: Path,
+    patch_path: Path,
+    output_path: Path,
+    check_cancelled: Callable[[], None] | None = None,
+) -> bytes:
+    source_size = Path(source_path).stat().st_size
+    digest = hashlib.sha256()
+
+    with open(patch_path, "rb") as patch:
+        expected_source_size, source_hash, target_size, target_hash = _read_header(patch)
+        if source_size != expected_source_size:
+            raise DeltaError(f"Patch expects a {expected_source_size} byte source, got {source_size}")
+        if file_sha256(source_path) != source_hash:
+            raise DeltaError("Patch was built against a different source file")
+
+        with open(source_path, "rb") as source, open(output_path, "wb") as out:
+            written = _apply_ops(patch, source, out, source_size, target_size, digest, check_cancelled)
+
+    result = digest.digest()
+    if written != target_size or result != target_hash:
+        raise DeltaError("Patched file does not match the expected checksum")
+    return result
+
+
+def _apply_ops(
+    patch: BinaryIO,
+    source: BinaryIO,
+    out: BinaryIO,
+    source_size: int,
+    target_size: int,
+    digest,
+    check_cancelled: Callable[[], None] | None,
+) -> int:
+    written = 0
+    while True:
+        if check_cancelled is not None:
+            check_cancelled()
+
+        op = _read_exact(patch, 1)
+        if op == OP_END:
+            break
+
+        if op == OP_COPY:
+            offset, length = _COPY.unpack(_read_exact(patch, _COPY.size))
+            if offset + length > source_size:
+                raise DeltaError("Patch copies past the end of the source")
+            source.seek(offset)
+            remaining = length
+            while remaining > 0:
+                block = source.read(min(COPY_BUFFER_SIZE, remaining))
+                if not block:
+                    raise DeltaError("Source ended unexpectedly")
+                out.write(block)
+                digest.update(block)
+                remaining -= len(block)
+            written += length
+        elif op == OP_INSERT:
+            length, packed_size = _INSERT.unpack(_read_exact(patch, _INSERT.size))
+            if length > INSERT_MAX_SIZE or packed_size > INSERT_MAX_PACKED_SIZE:
+                raise DeltaError("Patch insert is too large")
+            block = _inflate_insert(_read_exact(patch, packed_size), length)
+            out.write(block)
+            digest.update(block)
+            written += length
+        else:
+            raise DeltaError(f"Unknown patch operation {op!r}")
+
+        if written > target_size:
+            raise DeltaError("Patch output exceeds the target size")
+    return written
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import socket
+import tempfile
+import threading
+
+IPC_TIMEOUT_SEC = 2.0
+IPC_MAX_MESSAGE_BYTES = 64 * 1024
+
+IPC_COMMANDS = ("open", "empty", "status", "show-about")
+
+
+def server_name() -> str:
+    user = os.environ.get("USERNAME") or os.environ.get("USER") or "user"
+    return f"Binity-{re.sub(r'[^0-9A-Za-z_.-]', '_', user)}"
+
+
+def server_path(name: str) -> str:
+    # Matches where QLocalServer listens: a named pipe on Windows, a socket in the temp dir elsewhere.
+    if os.name == "nt":
+        return rf"\\.\pipe\{name}"
+    return os.path.join(tempfile.gettempdir(), name)
+
+
+def encode_message(payload: dict) -> bytes:
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def decode_message(data: bytes) -> dict:
+    line = bytes(data).split(b"\n", 1)[0]
+    payload = json.loads(line.decode("utf-8"))
+    if not isinstance(payload, dict):
+        raise ValueError("IPC message must be an object")
+    return payload
+
+
+def _pipe_roundtrip(path: str, request: bytes) -> bytes:
+    fd = os.open(path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+    try:
+        os.write(fd, request)
+        reply = bytearray()
+        while b"\n" not in reply and len(reply) < IPC_MAX_MESSAGE_BYTES:
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                break
+            reply += chunk
+        return bytes(reply)
+    finally:
+        os.close(fd)
+
+
+def _exchange_pipe(path: str, request: bytes, timeout: float) -> bytes:
+    # Pipe handles opened through os.open have no timeout, so a hung server is waited out on a daemon thread.
+    outcome: dict[str, object] = {}
+
+    def _run() -> None:
+        try:
+            outcome["reply"] = _pipe_roundtrip(path, request)
+        except OSError as exc:
+            outcome["error"] = exc
+
+    worker = threading.Thread(target=_run, name="binity-ipc-pipe", daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise TimeoutError(f"No reply from {path} within {timeout:.1f} s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["reply"]
+
+
+def _exchange_socket(path: str, request: bytes, timeout: float) -> bytes:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(request)
+        reply = bytearray()
+        while b"\n" not in reply and len(reply) < IPC_MAX_MESSAGE_BYTES:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            reply += chunk
+        return bytes(reply)
+
+
+def send_command(argv: list[str], timeout: float = IPC_TIMEOUT_SEC) -> dict | None:
+    """Sends argv to the running instance; None when nothing is listening."""
+    path = server_path(server_name())
+    request = encode_message({"argv": [str(arg) for arg in argv]})
+    try:
+        if os.name == "nt":
+            reply = _exchange_pipe(path, request, timeout)
+        else:
+            reply = _exchange_socket(path, request, timeout)
+    except OSError:
+        return None
+
+    try:
+        return decode_message(reply)
+    except ValueError:
+        return {"ok": False, "error": "Malformed reply"}
+
+
+def forward_to_running_instance(argv: list[str]) -> int | None:
+    reply = send_command(argv)
+    if reply is None:
+        return None
+    if argv and argv[0] == "status":
+        print(json.dumps(reply, ensure_ascii=False))
+    elif not reply.get("ok") and reply.get("error"):
+        print(reply["error"])
+    return 0 if reply.get("ok") else 1
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from PyQt6.QtCore import QObject
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+from src.core.ipc import IPC_MAX_MESSAGE_BYTES, decode_message, encode_message, server_name
+
+CommandHandler = Callable[[list[str]], dict]
+
+
+class CommandServer(QObject):
+    """Accepts argv forwarded by later launches and answers with one JSON line."""
+
+    def __init__(self, handler: CommandHandler, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._handler = handler
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+
+    def start(self) -> bool:
+        name = server_name()
+        if self._server.listen(name):
+            return True
+        # A crashed instance can leave a stale socket file behind on Unix.
+        QLocalServer.removeServer(name)
+        return self._server.listen(name)
+
+    def stop(self) -> None:
+        self._server.close()
+
+    def _on_new_connection(self) -> None:
+        while self._server.hasPendingConnections():
+            client = self._server.nextPendingConnection()
+            if client is None:
+                return
+            buffer = bytearray()
+            client.readyRead.connect(lambda client=client, buffer=buffer: self._on_ready_read(client, buffer))
+            client.disconnected.connect(client.deleteLater)
+
+    def _on_ready_read(self, client: QLocalSocket, buffer: bytearray) -> None:
+        buffer += bytes(client.readAll())
+        if len(buffer) > IPC_MAX_MESSAGE_BYTES:
+            client.abort()
+            return
+        if b"\n" not in buffer:
+            return
+
+        try:
+            argv = decode_message(bytes(buffer)).get("argv", [])
+            if not isinstance(argv, list):
+                raise ValueError("argv must be a list")
+            reply = self._handler([str(arg) for arg in argv])
+        except ValueError as exc:
+            reply = {"ok": False, "error": str(exc)}
+
+        client.write(encode_message(reply))
+        client.flush()
+        client.disconnectFromServer()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import ctypes
+import gc
+import os
+import sys
+
+
+class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+    _fields_ = [
+        ("cb", ctypes.c_uint32),
+        ("PageFaultCount", ctypes.c_uint32),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+        ("PagefileUsage", ctypes.c_size_t),
+        ("PeakPagefileUsage", ctypes.c_size_t),
+    ]
+
+
+def _current_process():
+    get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+    get_current_process.restype = ctypes.c_void_p
+    return ctypes.c_void_p(get_current_process())
+
+
+def current_rss() -> int:
+    """Resident set size (working set on Windows) in bytes; 0 when unknown."""
+    if os.name == "nt":
+        try:
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            if ctypes.windll.psapi.GetProcessMemoryInfo(_current_process(), ctypes.byref(counters), counters.cb):
+                return int(counters.WorkingSetSize)
+        except Exception:
+            pass
+        return 0
+
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return int(peak if sys.platform == "darwin" else peak * 1024)
+    except Exception:
+        return 0
+
+
+def freeze_startup_objects() -> None:
+    # Everything alive after start-up lives for the whole session; keep the collector off it.
+    gc.collect()
+    gc.freeze()
+
+
+def trim_working_set() -> bool:
+    """Hands freed pages back to the OS: EmptyWorkingSet on Windows, malloc_trim with glibc."""
+    gc.collect()
+    if os.name == "nt":
+        try:
+            return bool(ctypes.windll.psapi.EmptyWorkingSet(_current_process()))
+        except Exception:
+            return False
+
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        libc = ctypes.CDLL("libc.so.6")
+        return bool(libc.malloc_trim(0))
+    except (OSError, AttributeError):
+        return False
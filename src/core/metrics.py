@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_HOST = "127.0.0.1"
+METRICS_PATH = "/metrics"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS_SEC = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+DURATION_BUCKETS_SEC = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms kept in memory; rendering never touches the shell or disk."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._help: dict[str, tuple[str, str]] = {}
+        self._values: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, _Histogram]] = {}
+        self._buckets: dict[str, tuple[float, ...]] = {}
+
+    def _declare(self, name: str, kind: str, help_text: str) -> None:
+        if name not in self._help:
+            self._help[name] = (kind, help_text)
+
+    @staticmethod
+    def _labels(labels: dict[str, str] | None) -> Labels:
+        return tuple(sorted((labels or {}).items()))
+
+    def set_gauge(self, name: str, value: float, help_text: str = "", labels: dict[str, str] | None = None) -> None:
+        with self._lock:
+            self._declare(name, "gauge", help_text)
+            self._values.setdefault(name, {})[self._labels(labels)] = float(value)
+
+    def replace_gauge(self, name: str, values: dict[str, float], label: str, help_text: str = "") -> None:
+        """Swaps a whole labelled series at once so vanished labels (e.g. removed drives) disappear."""
+        with self._lock:
+            self._declare(name, "gauge", help_text)
+            self._values[name] = {((label, key),): float(value) for key, value in values.items()}
+
+    def inc(self, name: str, amount: float = 1.0, help_text: str = "", labels: dict[str, str] | None = None) -> None:
+        with self._lock:
+            self._declare(name, "counter", help_text)
+            series = self._values.setdefault(name, {})
+            key = self._labels(labels)
+            series[key] = series.get(key, 0.0) + float(amount)
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        help_text: str = "",
+        buckets: tuple[float, ...] = LATENCY_BUCKETS_SEC,
+        labels: dict[str, str] | None = None,
+    ) -> None:
+        with self._lock:
+            self._declare(name, "histogram", help_text)
+            bounds = self._buckets.setdefault(name, tuple(sorted(buckets)))
+            series = self._histograms.setdefault(name, {})
+            key = self._labels(labels)
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(bounds)
+            histogram.observe(max(0.0, float(value)))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._help):
+                kind, help_text = self._help[name]
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+                if kind != "histogram":
+                    for labels, value in sorted(self._values.get(name, {}).items()):
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+
+                for labels, histogram in sorted(self._histograms.get(name, {}).items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.bounds, histogram.counts):
+                        cumulative += count
+                        lines.append(
+                            f"{name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {cumulative}"
+                        )
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.total)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] not in (METRICS_PATH, "/"):
+            self.send_error(404)
+            return
+
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class MetricsServer:
+    """Serves a registry on the loopback interface from a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.registry = registry
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    @property
+    def port(self) -> int:
+        return int(self._server.server_address[1]) if self._server is not None else 0
+
+    def start(self, port: int) -> bool:
+        self.stop()
+        handler = type("MetricsRequestHandler", (_MetricsRequestHandler,), {"registry": self.registry})
+        try:
+            server = ThreadingHTTPServer((METRICS_HOST, int(port)), handler)
+        except OSError:
+            return False
+        server.daemon_threads = True
+
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name="binity-metrics", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        server = self._server
+        self._server = None
+        if server is None:
+            return
+        try:
+            server.shutdown()
+            server.server_close()
+        except Exception:
+            pass
+        self._thread = None
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_DEFAULT_SEC = 60
+PROFILE_MAX_SEC = 3600
+PROFILE_TOP_FUNCTIONS = 60
+PROFILE_TOP_ALLOCATIONS = 40
+TRACEMALLOC_FRAMES = 5
+
+
+def parse_profile_seconds(value: str) -> int:
+    try:
+        seconds = int(str(value).strip())
+    except ValueError:
+        return 0
+    return min(max(seconds, 0), PROFILE_MAX_SEC)
+
+
+class ProfileSession:
+    """cProfile + tracemalloc over a fixed window; reports land next to crash.log."""
+
+    def __init__(self, output_dir: Path) -> None:
+        self.output_dir = Path(output_dir)
+        self.duration_sec = 0
+        self._profile: cProfile.Profile | None = None
+        self._started = 0.0
+        self._owns_tracemalloc = False
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+
+    def remaining_sec(self) -> float:
+        if not self.active:
+            return 0.0
+        return max(0.0, self.duration_sec - (time.monotonic() - self._started))
+
+    def start(self, seconds: int = PROFILE_DEFAULT_SEC) -> bool:
+        if self.active:
+            return False
+        self.duration_sec = min(max(int(seconds), 1), PROFILE_MAX_SEC)
+        self._owns_tracemalloc = not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        # cProfile hooks only the thread that enables it, which is the GUI thread here.
+        self._profile = cProfile.Profile()
+        self._started = time.monotonic()
+        self._profile.enable()
+        return True
+
+    def stop(self) -> list[Path]:
+        profile = self._profile
+        if profile is None:
+            return []
+        profile.disable()
+        self._profile = None
+        elapsed = time.monotonic() - self._started
+
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        current, peak = tracemalloc.get_traced_memory() if snapshot is not None else (0, 0)
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        stats_path = self.output_dir / f"profile-{stamp}.pstats"
+        cpu_path = self.output_dir / f"profile-{stamp}-cpu.txt"
+        memory_path = self.output_dir / f"profile-{stamp}-memory.txt"
+        written: list[Path] = []
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(str(stats_path))
+            written.append(stats_path)
+
+            buffer = io.StringIO()
+            buffer.write(f"Profiled {elapsed:.1f} s of the GUI thread\n\n")
+            stats = pstats.Stats(profile, stream=buffer)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_FUNCTIONS)
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(PROFILE_TOP_FUNCTIONS)
+            cpu_path.write_text(buffer.getvalue(), encoding="utf-8")
+            written.append(cpu_path)
+
+            if snapshot is not None:
+                memory_path.write_text(self._format_allocations(snapshot, current, peak), encoding="utf-8")
+                written.append(memory_path)
+        except OSError:
+            pass
+        return written
+
+    @staticmethod
+    def _format_allocations(snapshot: tracemalloc.Snapshot, current: int, peak: int) -> str:
+        snapshot = snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            )
+        )
+        lines = [f"Traced memory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB", ""]
+        lines.append(f"Top {PROFILE_TOP_ALLOCATIONS} allocation sites by size:")
+        for stat in snapshot.statistics("lineno")[:PROFILE_TOP_ALLOCATIONS]:
+            lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {stat.traceback[0]}")
+
+        lines += ["", "Largest allocation tracebacks:"]
+        for stat in snapshot.statistics("traceback")[:5]:
+            lines.append(f"{stat.size / 1024:.1f} KiB in {stat.count} blocks")
+            lines.extend(f"    {line}" for line in stat.traceback.format())
+        return "\n".join(lines) + "\n"
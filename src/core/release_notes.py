@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+RELEASE_NOTES_CACHE_SIZE = 32
+
+_LINE_PREFIX_RE = re.compile(r"(?:\s{0,3}#{1,6}\s*)?(?:\s*(?P<bullet>[-*+])\s+)?")
+_INLINE_RE = re.compile(
+    r"!\[(?P<alt>[^\]]*)\]\([^)]+\)"
+    r"|\[(?P<label>[^\]]+)\]\((?P<url>https?://[^)]+)\)"
+    r"|`(?P<code>[^`]*)`"
+    r"|~~(?P<strike>[^~]+)~~"
+    r"|\*\*|__"
+    r"|\*(?P<star>[^*]+?)\*"
+    r"|(?<![0-9A-Za-z])_(?P<under>[^_]+?)_(?![0-9A-Za-z])"
+)
+
+
+def _render_inline(text: str) -> str:
+    def _replace(match: re.Match) -> str:
+        kind = match.lastgroup
+        if kind == "alt":
+            return match.group("alt")
+        if kind == "url":
+            return f"{_render_inline(match.group('label'))} ({match.group('url')})"
+        if kind == "code":
+            return match.group("code")
+        if kind in ("strike", "star", "under"):
+            return _render_inline(match.group(kind))
+        return ""
+
+    return _INLINE_RE.sub(_replace, text)
+
+
+@lru_cache(maxsize=RELEASE_NOTES_CACHE_SIZE)
+def format_release_notes(raw: str) -> str:
+    """Markdown release body -> plain text for the update dialog, in one pass per line."""
+    text = str(raw or "").strip()
+    if not text:
+        return "-"
+
+    lines: list[str] = []
+    blank = False
+    for line in text.splitlines():
+        prefix = _LINE_PREFIX_RE.match(line)
+        current = _render_inline(line[prefix.end():]).strip()
+        if not current:
+            if lines and not blank:
+                lines.append("")
+            blank = True
+            continue
+        blank = False
+        lines.append(f"- {current}" if prefix.group("bullet") else current)
+
+    return "\n".join(lines).strip() or "-"
@@ -21,6 +21,13 @@ def app_data_dir() -> Path:
     return path
 
 
+def log_dir() -> Path:
+    """Machine-local folder for crash.log and other diagnostics users can send us."""
+    path = Path(os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))) / APP_DIR_NAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 def resource_path(relative_path: str) -> str:
     if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
         base = Path(getattr(sys, "_MEIPASS"))
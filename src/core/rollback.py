@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import shutil
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from src.core.delta import file_sha256
+
+ROLLBACK_DIR = "rollback"
+ROLLBACK_INDEX = "index.json"
+ROLLBACK_KEEP = 3
+ROLLBACK_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass(slots=True)
+class RollbackEntry:
+    version: str
+    sha256: str
+    size: int
+    stored_at: float
+
+    @property
+    def file_name(self) -> str:
+        return f"{self.sha256}.exe"
+
+
+class RollbackCache:
+    """Keeps previously running executables, stored by SHA-256, newest first."""
+
+    def __init__(self, root: Path, keep: int = ROLLBACK_KEEP, max_bytes: int = ROLLBACK_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.keep = max(1, int(keep))
+        self.max_bytes = max(0, int(max_bytes))
+
+    def path_for(self, entry: RollbackEntry) -> Path:
+        return self.root / entry.file_name
+
+    def entries(self) -> list[RollbackEntry]:
+        try:
+            raw = json.loads((self.root / ROLLBACK_INDEX).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+        if not isinstance(raw, list):
+            return []
+
+        entries = []
+        for item in raw:
+            try:
+                entry = RollbackEntry(
+                    version=str(item["version"]),
+                    sha256=str(item["sha256"]).lower(),
+                    size=int(item["size"]),
+                    stored_at=float(item["stored_at"]),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+            if len(entry.sha256) == 64 and self.path_for(entry).exists():
+                entries.append(entry)
+        return entries
+
+    def _write_index(self, entries: list[RollbackEntry]) -> None:
+        index_path = self.root / ROLLBACK_INDEX
+        temp_file = index_path.with_suffix(".tmp")
+        temp_file.write_text(json.dumps([asdict(entry) for entry in entries]), encoding="utf-8")
+        temp_file.replace(index_path)
+
+    def store(self, path: Path, version: str) -> RollbackEntry:
+        self.root.mkdir(parents=True, exist_ok=True)
+        digest = file_sha256(path).hex()
+        entry = RollbackEntry(version=str(version), sha256=digest, size=path.stat().st_size, stored_at=time.time())
+
+        target = self.path_for(entry)
+        if not target.exists() or target.stat().st_size != entry.size:
+            temp_file = target.with_suffix(".tmp")
+            shutil.copyfile(path, temp_file)
+            temp_file.replace(target)
+
+        entries = [entry] + [item for item in self.entries() if item.sha256 != digest]
+        self._evict(entries)
+        return entry
+
+    def _evict(self, entries: list[RollbackEntry]) -> None:
+        kept: list[RollbackEntry] = []
+        total = 0
+        for entry in entries:
+            if len(kept) < self.keep and (not kept or total + entry.size <= self.max_bytes):
+                kept.append(entry)
+                total += entry.size
+                continue
+            try:
+                self.path_for(entry).unlink()
+            except OSError:
+                pass
+
+        self._write_index(kept)
+        known = {entry.file_name for entry in kept}
+        for path in self.root.glob("*.exe"):
+            if path.name not in known:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def verify(self, entry: RollbackEntry) -> bool:
+        path = self.path_for(entry)
+        try:
+            return path.stat().st_size == entry.size and file_sha256(path).hex() == entry.sha256
+        except OSError:
+            return False
+
+    def discard(self, entry: RollbackEntry) -> None:
+        self._evict([item for item in self.entries() if item.sha256 != entry.sha256])
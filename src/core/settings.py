@@ -1,30 +1,97 @@
 ﻿from __future__ import annotations
 
+import atexit
 import json
 import os
+import threading
 from copy import deepcopy
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable
 
 from src.core.resources import app_data_dir
-
-DEFAULT_SETTINGS: dict[str, Any] = {
-    "language": "RU",
-    "confirm_clear": True,
-    "double_click_action": "open",
-    "update_interval_sec": 10,
-    "clear_sound": "paper",
-    "overflow_notify_enabled": True,
-    "overflow_notify_threshold_gb": 15,
-    "theme_sync": True,
-    "secure_delete_mode": "off",
-    "secure_delete_info_ack": False,
-    "auto_check_updates": True,
-    "last_update_check": "",
-    "skipped_update_version": "",
+from src.core.timing import timed
+
+SETTING_BOOL = "bool"
+SETTING_INT = "int"
+SETTING_CHOICE = "choice"
+SETTING_STR = "str"
+SETTING_ISO_DATETIME = "iso_datetime"
+
+
+@dataclass(frozen=True, slots=True)
+class SettingSpec:
+    kind: str
+    default: Any
+    minimum: int | None = None
+    maximum: int | None = None
+    choices: tuple[str, ...] = ()
+    fallback: Any = None
+    upper: bool = False
+
+    def validate(self, value: Any) -> Any:
+        if self.kind == SETTING_BOOL:
+            return bool(value)
+
+        if self.kind == SETTING_INT:
+            try:
+                number = int(value)
+            except Exception:
+                number = int(self.default)
+            if self.minimum is not None:
+                number = max(self.minimum, number)
+            if self.maximum is not None:
+                number = min(number, self.maximum)
+            return number
+
+        if self.kind == SETTING_CHOICE:
+            text = str(value).upper() if self.upper else str(value).lower()
+            if text in self.choices:
+                return text
+            return self.default if self.fallback is None else self.fallback
+
+        text = str(value or "").strip()
+        if self.kind == SETTING_ISO_DATETIME and text:
+            try:
+                datetime.fromisoformat(text)
+            except Exception:
+                text = ""
+        return text
+
+
+SETTINGS_SCHEMA: dict[str, SettingSpec] = {
+    "language": SettingSpec(SETTING_CHOICE, "RU", choices=("RU", "EN"), upper=True),
+    "confirm_clear": SettingSpec(SETTING_BOOL, True),
+    "double_click_action": SettingSpec(SETTING_CHOICE, "open", choices=("open", "clear")),
+    "update_interval_sec": SettingSpec(SETTING_INT, 10, minimum=3, maximum=120),
+    "clear_sound": SettingSpec(SETTING_CHOICE, "paper", choices=("off", "windows", "paper", "trash"), fallback="off"),
+    "overflow_notify_enabled": SettingSpec(SETTING_BOOL, True),
+    "overflow_notify_threshold_gb": SettingSpec(SETTING_INT, 15, minimum=1, maximum=1024),
+    "theme_sync": SettingSpec(SETTING_BOOL, True),
+    "secure_delete_mode": SettingSpec(SETTING_CHOICE, "off", choices=("off", "zero", "random")),
+    "secure_delete_info_ack": SettingSpec(SETTING_BOOL, False),
+    "auto_check_updates": SettingSpec(SETTING_BOOL, True),
+    "background_update_download": SettingSpec(SETTING_BOOL, False),
+    "download_rate_limit_kib": SettingSpec(SETTING_INT, 0, minimum=0, maximum=1_048_576),
+    "background_download_rate_limit_kib": SettingSpec(SETTING_INT, 512, minimum=0, maximum=1_048_576),
+    "last_update_check": SettingSpec(SETTING_ISO_DATETIME, ""),
+    "skipped_update_version": SettingSpec(SETTING_STR, ""),
+    "rollback_pin_version": SettingSpec(SETTING_STR, ""),
+    "update_source": SettingSpec(SETTING_CHOICE, "github", choices=("github", "http", "directory")),
+    "update_source_location": SettingSpec(SETTING_STR, ""),
+    "metrics_enabled": SettingSpec(SETTING_BOOL, False),
+    "metrics_port": SettingSpec(SETTING_INT, 9184, minimum=1024, maximum=65535),
+    "timing_enabled": SettingSpec(SETTING_BOOL, False),
+    "stall_threshold_ms": SettingSpec(SETTING_INT, 2000, minimum=0, maximum=60000),
 }
 
+DEFAULT_SETTINGS: dict[str, Any] = {key: spec.default for key, spec in SETTINGS_SCHEMA.items()}
+
+SettingsListener = Callable[[str, Any], None]
+
 LEGACY_REG_KEY = r"Software\Binity"
+SAVE_DEBOUNCE_SEC = 0.75
 
 
 class Settings:
@@ -32,9 +99,17 @@ class Settings:
         self.config_dir: Path = app_data_dir()
         self.config_file: Path = self.config_dir / "settings.json"
         self.values: dict[str, Any] = deepcopy(DEFAULT_SETTINGS)
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._dirty_keys: set[str] = set()
+        self._flush_timer: threading.Timer | None = None
+        self._file_fingerprint: tuple[int, int] | None = None
+        self._listeners: dict[str, list[SettingsListener]] = {}
         self._load()
+        atexit.register(self.flush)
 
     def _load(self) -> None:
+        needs_save = False
         if self.config_file.exists():
             try:
                 with open(self.config_file, "r", encoding="utf-8") as fh:
@@ -47,67 +122,23 @@ class Settings:
                     self.config_file.replace(broken_file)
                 except OSError:
                     pass
-                self._save()
+                needs_save = True
         else:
             self._import_legacy_registry_values()
-            self._save()
+            needs_save = True
 
         self._normalize()
+        if needs_save:
+            self._save()
+        else:
+            self._file_fingerprint = self._read_fingerprint()
 
-    def _normalize(self) -> None:
-        language = str(self.values.get("language", "RU")).upper()
-        if language not in ("RU", "EN"):
-            language = "RU"
-        self.values["language"] = language
-
-        self.values["confirm_clear"] = bool(self.values.get("confirm_clear", True))
-
-        action = str(self.values.get("double_click_action", "open")).lower()
-        if action not in ("open", "clear"):
-            action = "open"
-        self.values["double_click_action"] = action
-
-        try:
-            interval = int(self.values.get("update_interval_sec", 10))
-        except Exception:
-            interval = 10
-        self.values["update_interval_sec"] = max(3, min(interval, 120))
-
-        sound_mode = str(self.values.get("clear_sound", "paper")).lower()
-        if sound_mode not in ("off", "windows", "paper", "trash"):
-            sound_mode = "off"
-        self.values["clear_sound"] = sound_mode
-
-        self.values["overflow_notify_enabled"] = bool(self.values.get("overflow_notify_enabled", True))
-
-        try:
-            overflow_threshold = int(self.values.get("overflow_notify_threshold_gb", 15))
-        except Exception:
-            overflow_threshold = 15
-        self.values["overflow_notify_threshold_gb"] = max(1, min(overflow_threshold, 1024))
-
-        self.values["theme_sync"] = bool(self.values.get("theme_sync", True))
-
-        secure_mode = str(self.values.get("secure_delete_mode", "off")).lower()
-        if secure_mode not in ("off", "zero", "random"):
-            secure_mode = "off"
-        self.values["secure_delete_mode"] = secure_mode
-        self.values["secure_delete_info_ack"] = bool(self.values.get("secure_delete_info_ack", False))
-
-        self.values["auto_check_updates"] = bool(self.values.get("auto_check_updates", True))
-
-        last_update_check = str(self.values.get("last_update_check", "") or "").strip()
-        if last_update_check:
-            try:
-                from datetime import datetime
-
-                datetime.fromisoformat(last_update_check)
-            except Exception:
-                last_update_check = ""
-        self.values["last_update_check"] = last_update_check
-
-        skipped_update_version = str(self.values.get("skipped_update_version", "") or "").strip()
-        self.values["skipped_update_version"] = skipped_update_version
+    def _normalize(self, keys: Iterable[str] | None = None) -> None:
+        for key in SETTINGS_SCHEMA if keys is None else keys:
+            spec = SETTINGS_SCHEMA.get(key)
+            if spec is None:
+                continue
+            self.values[key] = spec.validate(self.values.get(key, spec.default))
 
     def _import_legacy_registry_values(self) -> None:
         if os.name != "nt":
@@ -141,26 +172,114 @@ class Settings:
         except Exception:
             return
 
+    @timed("Settings._save")
     def _save(self) -> None:
-        self._normalize()
-        self.config_dir.mkdir(parents=True, exist_ok=True)
-        temp_file = self.config_file.with_suffix(".tmp")
-        with open(temp_file, "w", encoding="utf-8") as fh:
-            json.dump(self.values, fh, indent=2, ensure_ascii=False)
-        temp_file.replace(self.config_file)
+        with self._write_lock:
+            with self._lock:
+                payload = dict(self.values)
+                saved_keys = set(self._dirty_keys)
+                self._dirty_keys.clear()
+
+            try:
+                self.config_dir.mkdir(parents=True, exist_ok=True)
+                temp_file = self.config_file.with_suffix(".tmp")
+                with open(temp_file, "w", encoding="utf-8") as fh:
+                    json.dump(payload, fh, indent=2, ensure_ascii=False)
+                temp_file.replace(self.config_file)
+                fingerprint = self._read_fingerprint()
+                with self._lock:
+                    self._file_fingerprint = fingerprint
+            except OSError:
+                with self._lock:
+                    self._dirty_keys.update(saved_keys)
+
+    def _schedule_flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        timer = threading.Timer(SAVE_DEBOUNCE_SEC, self.flush)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty_keys:
+                return
+        self._save()
+
+    def _read_fingerprint(self) -> tuple[int, int] | None:
+        try:
+            stat = self.config_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_if_changed(self) -> list[str]:
+        fingerprint = self._read_fingerprint()
+        if fingerprint is None or fingerprint == self._file_fingerprint:
+            return []
+
+        try:
+            with open(self.config_file, "r", encoding="utf-8") as fh:
+                raw = json.load(fh)
+        except (OSError, ValueError):
+            return []
+        if not isinstance(raw, dict):
+            return []
+
+        with self._lock:
+            self._file_fingerprint = fingerprint
+            incoming: dict[str, Any] = {}
+            for key, value in raw.items():
+                if key in self._dirty_keys:
+                    continue
+                spec = SETTINGS_SCHEMA.get(key)
+                candidate = spec.validate(value) if spec is not None else value
+                if self.values.get(key) != candidate:
+                    incoming[key] = candidate
+            if not incoming:
+                return []
+            self.values.update(incoming)
+            updates = list(incoming.items())
+
+        self._notify(updates)
+        return [key for key, _ in updates]
 
     def get(self, key: str, default: Any = None) -> Any:
         return self.values.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
-        self.values[key] = value
-        self._save()
+        self.set_many({key: value})
 
     def set_many(self, payload: dict[str, Any]) -> None:
         if not payload:
             return
-        self.values.update(payload)
-        self._save()
+        with self._lock:
+            previous = {key: self.values.get(key) for key in payload}
+            self.values.update(payload)
+            self._normalize(payload.keys())
+            changed = [key for key, value in previous.items() if self.values.get(key) != value]
+            if not changed:
+                return
+            self._dirty_keys.update(changed)
+            self._schedule_flush()
+            updates = [(key, self.values.get(key)) for key in changed]
+
+        self._notify(updates)
+
+    def subscribe(self, key: str, listener: SettingsListener) -> None:
+        with self._lock:
+            self._listeners.setdefault(key, []).append(listener)
+
+    def _notify(self, updates: list[tuple[str, Any]]) -> None:
+        for key, value in updates:
+            with self._lock:
+                listeners = list(self._listeners.get(key, ()))
+            for listener in listeners:
+                listener(key, value)
 
     @property
     def language(self) -> str:
@@ -198,6 +317,26 @@ class Settings:
     def auto_check_updates(self) -> bool:
         return self.values["auto_check_updates"]
 
+    @property
+    def background_update_download(self) -> bool:
+        return self.values["background_update_download"]
+
+    @property
+    def metrics_enabled(self) -> bool:
+        return self.values["metrics_enabled"]
+
+    @property
+    def metrics_port(self) -> int:
+        return self.values["metrics_port"]
+
+    @property
+    def timing_enabled(self) -> bool:
+        return self.values["timing_enabled"]
+
+    @property
+    def stall_threshold_ms(self) -> int:
+        return self.values["stall_threshold_ms"]
+
     @property
     def secure_delete_mode(self) -> str:
         return self.values["secure_delete_mode"]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer
+
+from src.core.settings import Settings
+
+RELOAD_DEBOUNCE_MS = 300
+POLL_INTERVAL_MS = 5000
+
+
+class SettingsWatcher(QObject):
+    """Reloads settings.json when it is edited outside of Binity."""
+
+    def __init__(self, settings: Settings, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.settings = settings
+
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(RELOAD_DEBOUNCE_MS)
+        self._reload_timer.timeout.connect(self._reload)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self._reload)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_path_changed)
+        if not self._watcher.addPath(str(self.settings.config_dir)):
+            self._poll_timer.start()
+
+    def _on_path_changed(self, _path: str) -> None:
+        self._reload_timer.start()
+
+    def _reload(self) -> None:
+        self.settings.reload_if_changed()
+
+    def stop(self) -> None:
+        self._reload_timer.stop()
+        self._poll_timer.stop()
+        paths = self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+STALL_LOG_FILE = "stall.log"
+STALL_LOG_MAX_BYTES = 512 * 1024
+STALL_LOG_BACKUPS = 3
+STALL_MAX_SAMPLES = 3
+HEARTBEAT_INTERVAL_MS = 250
+
+
+class StallWatchdog:
+    """Watches a heartbeat fed by the GUI event loop and logs all thread stacks when it stops."""
+
+    def __init__(self, log_path: Path, threshold_sec: float) -> None:
+        self.log_path = Path(log_path)
+        self.threshold_sec = max(0.1, float(threshold_sec))
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stall_started = 0.0
+        self._samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._last_beat = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="binity-stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def heartbeat(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            stalled_for = now - self._last_beat
+            self._last_beat = now
+            reported = self._samples > 0
+            self._samples = 0
+        if reported:
+            self._append(f"--- {datetime.now().isoformat(timespec='milliseconds')} recovered after {stalled_for:.2f} s ---\n\n")
+
+    def _run(self) -> None:
+        poll = min(self.threshold_sec / 4, 0.5)
+        while not self._stop.wait(poll):
+            now = time.monotonic()
+            with self._lock:
+                stalled_for = now - self._last_beat
+                # Later samples of the same stall are spaced out so a hang shows how the stack moves.
+                due = self.threshold_sec * (2 ** self._samples)
+                if stalled_for < due or self._samples >= STALL_MAX_SAMPLES:
+                    continue
+                self._samples += 1
+                sample = self._samples
+            self._append(self._format_stacks(stalled_for, sample))
+
+    def _format_stacks(self, stalled_for: float, sample: int) -> str:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        lines = [
+            f"--- {datetime.now().isoformat(timespec='milliseconds')} "
+            f"event loop stalled {stalled_for:.2f} s (threshold {self.threshold_sec:.2f} s, "
+            f"sample {sample}/{STALL_MAX_SAMPLES}, pid {os.getpid()}) ---"
+        ]
+        frames = sys._current_frames()
+        ordered = sorted(frames.items(), key=lambda item: item[0] != self._gui_thread_id)
+        for thread_id, frame in ordered:
+            if thread_id == threading.get_ident():
+                continue
+            marker = " [GUI]" if thread_id == self._gui_thread_id else ""
+            lines.append(f"Thread {names.get(thread_id, '?')} ({thread_id}){marker}:")
+            lines.extend(line.rstrip("\n") for line in traceback.format_stack(frame))
+        return "\n".join(lines) + "\n\n"
+
+    def _rotate(self) -> None:
+        for index in range(STALL_LOG_BACKUPS - 1, 0, -1):
+            older = self.log_path.with_name(f"{self.log_path.name}.{index}")
+            if older.exists():
+                older.replace(self.log_path.with_name(f"{self.log_path.name}.{index + 1}"))
+        self.log_path.replace(self.log_path.with_name(f"{self.log_path.name}.1"))
+
+    def _append(self, text: str) -> None:
+        try:
+            if self.log_path.exists() and self.log_path.stat().st_size + len(text) > STALL_LOG_MAX_BYTES:
+                self._rotate()
+            with open(self.log_path, "a", encoding="utf-8") as fh:
+                fh.write(text)
+        except OSError:
+            pass
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable, TypeVar
+
+TIMING_WINDOW = 512
+# Upper bounds in microseconds; the last bucket is open-ended.
+TIMING_BUCKETS_US = (10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000, 500_000, 1_000_000)
+
+F = TypeVar("F", bound=Callable)
+
+
+class RollingHistogram:
+    """Last `size` samples in a ring of doubles plus per-bucket counts for that same window."""
+
+    __slots__ = ("size", "samples", "buckets", "position", "filled", "total_count", "max_us")
+
+    def __init__(self, size: int = TIMING_WINDOW) -> None:
+        self.size = max(1, int(size))
+        self.samples = array("d", bytes(8 * self.size))
+        self.buckets = array("L", bytes(array("L").itemsize * (len(TIMING_BUCKETS_US) + 1)))
+        self.position = 0
+        self.filled = 0
+        self.total_count = 0
+        self.max_us = 0.0
+
+    def add(self, micros: float) -> None:
+        if self.filled == self.size:
+            self.buckets[bisect_left(TIMING_BUCKETS_US, self.samples[self.position])] -= 1
+        else:
+            self.filled += 1
+        self.samples[self.position] = micros
+        self.buckets[bisect_left(TIMING_BUCKETS_US, micros)] += 1
+        self.position = (self.position + 1) % self.size
+        self.total_count += 1
+        if micros > self.max_us:
+            self.max_us = micros
+
+    def summary(self) -> dict:
+        window = sorted(self.samples[: self.filled])
+        if not window:
+            return {"count": 0, "total_count": self.total_count}
+
+        def percentile(fraction: float) -> float:
+            return round(window[min(len(window) - 1, int(fraction * len(window)))], 1)
+
+        labels = [f"<={bound}" for bound in TIMING_BUCKETS_US] + [f">{TIMING_BUCKETS_US[-1]}"]
+        return {
+            "count": len(window),
+            "total_count": self.total_count,
+            "mean_us": round(sum(window) / len(window), 1),
+            "p50_us": percentile(0.50),
+            "p90_us": percentile(0.90),
+            "p99_us": percentile(0.99),
+            "window_max_us": round(window[-1], 1),
+            "max_us": round(self.max_us, 1),
+            "buckets_us": {label: count for label, count in zip(labels, self.buckets) if count},
+        }
+
+
+class TimingRegistry:
+    def __init__(self, window: int = TIMING_WINDOW) -> None:
+        self.enabled = False
+        self.window = window
+        self._lock = threading.Lock()
+        self._histograms: dict[str, RollingHistogram] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = RollingHistogram(self.window)
+            histogram.add(seconds * 1_000_000)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self._histograms.items())}
+
+    def dump_json(self, path: Path) -> Path:
+        payload = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "enabled": self.enabled,
+            "window": self.window,
+            "operations": self.snapshot(),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        return path
+
+
+TIMINGS = TimingRegistry()
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Records wall time of every call while TIMINGS.enabled; otherwise costs one attribute check."""
+
+    def decorate(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TIMINGS.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                TIMINGS.record(name, time.perf_counter() - started)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import os
+import urllib.parse
+import urllib.request
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable
+
+GITHUB_API_LATEST = "https://api.github.com/repos/Volfheim/Binity/releases/latest"
+GITHUB_LATEST_DOWNLOAD = "https://github.com/Volfheim/Binity/releases/latest/download/"
+MIRROR_INDEX_NAME = "latest.json"
+
+UPDATE_SOURCE_GITHUB = "github"
+UPDATE_SOURCE_HTTP = "http"
+UPDATE_SOURCE_DIRECTORY = "directory"
+
+
+def local_path_from_url(url: str) -> Path:
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path
+    if parts.netloc and parts.netloc.lower() != "localhost":
+        path = f"//{parts.netloc}{path}"
+    return Path(urllib.request.url2pathname(path))
+
+
+class UpdateSource(ABC):
+    def __init__(self, location: str = "") -> None:
+        self.location = str(location or "").strip()
+
+    @property
+    @abstractmethod
+    def index_url(self) -> str: ...
+
+    @abstractmethod
+    def asset_url(self, name: str) -> str: ...
+
+    def fetch_latest_release(self, fetch_json: Callable[[str], dict]) -> dict:
+        release = dict(fetch_json(self.index_url))
+        assets = []
+        for raw_asset in release.get("assets", []) or []:
+            if not isinstance(raw_asset, dict):
+                continue
+            asset = dict(raw_asset)
+            name = os.path.basename(str(asset.get("name", "") or ""))
+            if not name:
+                continue
+            download_url = str(asset.get("browser_download_url", "") or "")
+            # Mirrors may list assets relative to the index, e.g. "/dl/Binity.exe".
+            asset["browser_download_url"] = (
+                urllib.parse.urljoin(self.index_url, download_url) if download_url else self.asset_url(name)
+            )
+            assets.append(asset)
+        release["assets"] = assets
+        return release
+
+
+class GitHubUpdateSource(UpdateSource):
+    @property
+    def index_url(self) -> str:
+        return GITHUB_API_LATEST
+
+    def asset_url(self, name: str) -> str:
+        return urllib.parse.urljoin(GITHUB_LATEST_DOWNLOAD, urllib.parse.quote(name))
+
+
+class HttpMirrorUpdateSource(UpdateSource):
+    def _base_url(self) -> str:
+        return self.location if self.location.endswith("/") else f"{self.location}/"
+
+    @property
+    def index_url(self) -> str:
+        return urllib.parse.urljoin(self._base_url(), MIRROR_INDEX_NAME)
+
+    def asset_url(self, name: str) -> str:
+        return urllib.parse.urljoin(self._base_url(), urllib.parse.quote(name))
+
+
+class DirectoryUpdateSource(UpdateSource):
+    def _root(self) -> Path:
+        return Path(os.path.expandvars(self.location)).absolute()
+
+    @property
+    def index_url(self) -> str:
+        return (self._root() / MIRROR_INDEX_NAME).as_uri()
+
+    def asset_url(self, name: str) -> str:
+        return (self._root() / name).as_uri()
+
+    def fetch_latest_release(self, fetch_json: Callable[[str], dict]) -> dict:
+        release = super().fetch_latest_release(fetch_json)
+        for asset in release["assets"]:
+            if int(asset.get("size", 0) or 0) > 0:
+                continue
+            try:
+                asset["size"] = local_path_from_url(asset["browser_download_url"]).stat().st_size
+            except OSError:
+                asset["size"] = 0
+        return release
+
+
+def create_update_source(kind: str, location: str = "") -> UpdateSource:
+    candidate = str(kind or UPDATE_SOURCE_GITHUB).lower()
+    if not str(location or "").strip():
+        return GitHubUpdateSource()
+    if candidate == UPDATE_SOURCE_HTTP:
+        return HttpMirrorUpdateSource(location)
+    if candidate == UPDATE_SOURCE_DIRECTORY:
+        return DirectoryUpdateSource(location)
+    return GitHubUpdateSource()
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import ctypes
+import json
+import os
+import select
+import shutil
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, TypeVar
+
+APPLY_UPDATE_SWITCH = "--apply-update"
+SWAP_HELPER_PREFIX = "swap-helper-"
+SWAP_PLAN_PREFIX = "swap-plan-"
+
+PROCESS_EXIT_TIMEOUT_SEC = 25.0
+REPLACE_ATTEMPTS = 8
+BACKOFF_INITIAL_SEC = 0.05
+BACKOFF_MAX_SEC = 2.0
+READY_TIMEOUT_SEC = 20.0
+
+SYNCHRONIZE = 0x00100000
+PROCESS_TERMINATE = 0x0001
+WAIT_OBJECT_0 = 0
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class SwapPlan:
+    pid: int
+    source: str
+    final: str
+    flag_file: str
+    log_file: str
+    ready_file: str
+    launch_info_file: str
+    relaunch: bool = True
+    keep_source: bool = False
+
+    def save(self, path: Path) -> None:
+        path.write_text(json.dumps(asdict(self)), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "SwapPlan":
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        return cls(**{key: raw[key] for key in cls.__dataclass_fields__ if key in raw})
+
+
+class SwapLog:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._started = time.perf_counter()
+        self._step = self._started
+
+    def write(self, message: str) -> None:
+        try:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(f"[{datetime.now().isoformat(timespec='milliseconds')}] {message}\n")
+        except OSError:
+            pass
+
+    def step(self, message: str) -> None:
+        now = time.perf_counter()
+        self.write(f"{message} ({(now - self._step) * 1000:.0f} ms)")
+        self._step = now
+
+    def finish(self, message: str) -> None:
+        self.write(f"{message} (total {(time.perf_counter() - self._started) * 1000:.0f} ms)")
+
+
+def sanitized_child_env() -> dict[str, str]:
+    env = {str(key): str(value) for key, value in os.environ.items()}
+    for key in list(env.keys()):
+        upper = key.upper()
+        if upper == "_MEIPASS2" or upper.startswith("_PYI_"):
+            env.pop(key, None)
+    env["PYINSTALLER_RESET_ENVIRONMENT"] = "1"
+    return env
+
+
+def retry_with_backoff(
+    action: Callable[[], T],
+    attempts: int = REPLACE_ATTEMPTS,
+    initial_delay: float = BACKOFF_INITIAL_SEC,
+    max_delay: float = BACKOFF_MAX_SEC,
+) -> T:
+    delay = initial_delay
+    for attempt in range(1, attempts + 1):
+        try:
+            return action()
+        except OSError:
+            if attempt >= attempts:
+                raise
+            time.sleep(delay)
+            delay = min(max_delay, delay * 2)
+    raise OSError("Retry attempts exhausted")
+
+
+def _wait_windows(pid: int, timeout: float) -> bool:
+    kernel32 = ctypes.windll.kernel32
+    kernel32.OpenProcess.restype = ctypes.c_void_p
+    handle = kernel32.OpenProcess(SYNCHRONIZE, False, int(pid))
+    if not handle:
+        return True
+    try:
+        return kernel32.WaitForSingleObject(ctypes.c_void_p(handle), int(timeout * 1000)) == WAIT_OBJECT_0
+    finally:
+        kernel32.CloseHandle(ctypes.c_void_p(handle))
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _wait_posix(pid: int, timeout: float) -> bool:
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is not None:
+        try:
+            fd = pidfd_open(pid)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            fd = -1
+        if fd >= 0:
+            try:
+                poller = select.poll()
+                poller.register(fd, select.POLLIN)
+                return bool(poller.poll(int(timeout * 1000)))
+            finally:
+                os.close(fd)
+
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while _process_alive(pid):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(BACKOFF_MAX_SEC / 4, delay * 2)
+    return True
+
+
+def wait_for_process_exit(pid: int, timeout: float = PROCESS_EXIT_TIMEOUT_SEC) -> bool:
+    if pid <= 0 or pid == os.getpid():
+        return True
+    if os.name == "nt":
+        return _wait_windows(pid, timeout)
+    return _wait_posix(pid, timeout)
+
+
+def terminate_process(pid: int) -> None:
+    try:
+        if os.name == "nt":
+            kernel32 = ctypes.windll.kernel32
+            kernel32.OpenProcess.restype = ctypes.c_void_p
+            handle = kernel32.OpenProcess(PROCESS_TERMINATE | SYNCHRONIZE, False, int(pid))
+            if handle:
+                kernel32.TerminateProcess(ctypes.c_void_p(handle), 1)
+                kernel32.WaitForSingleObject(ctypes.c_void_p(handle), 5000)
+                kernel32.CloseHandle(ctypes.c_void_p(handle))
+        else:
+            import signal
+
+            os.kill(pid, signal.SIGKILL)
+            wait_for_process_exit(pid, 5.0)
+    except Exception:
+        pass
+
+
+def replace_file(source: Path, final: Path) -> None:
+    temp_file = final.with_name(f"{final.name}.new")
+
+    def _copy() -> None:
+        shutil.copy2(source, temp_file)
+
+    def _swap() -> None:
+        os.replace(temp_file, final)
+
+    try:
+        retry_with_backoff(_copy)
+        retry_with_backoff(_swap)
+    except OSError:
+        try:
+            temp_file.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def launch_and_wait_ready(target: Path, ready_file: Path, timeout: float = READY_TIMEOUT_SEC) -> bool:
+    try:
+        ready_file.unlink()
+    except OSError:
+        pass
+
+    try:
+        process = subprocess.Popen(
+            [str(target), "--show-after-update", "--update-ready-flag", str(ready_file)],
+            env=sanitized_child_env(),
+            cwd=str(target.parent),
+            close_fds=True,
+            creationflags=getattr(subprocess, "DETACHED_PROCESS", 0),
+        )
+    except OSError:
+        return False
+
+    deadline = time.monotonic() + timeout
+    delay = 0.02
+    while not ready_file.exists():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        try:
+            process.wait(min(delay, remaining))
+            return ready_file.exists()
+        except subprocess.TimeoutExpired:
+            pass
+        delay = min(0.5, delay * 2)
+    return True
+
+
+def _mark_applied(plan: SwapPlan) -> None:
+    if plan.flag_file:
+        Path(plan.flag_file).write_text("1", encoding="utf-8")
+
+
+def _discard_source(plan: SwapPlan, source: Path, final: Path) -> None:
+    if plan.keep_source or source == final:
+        return
+    try:
+        source.unlink()
+    except OSError:
+        pass
+
+
+def run_swap(plan: SwapPlan) -> int:
+    log = SwapLog(plan.log_file)
+    log.write(f"Updater started for PID {plan.pid}")
+
+    if not wait_for_process_exit(plan.pid):
+        log.step("Process did not exit in time, terminating")
+        terminate_process(plan.pid)
+    log.step("Previous process exited")
+
+    source = Path(plan.source)
+    final = Path(plan.final)
+    if not source.exists():
+        log.finish("Downloaded file not found")
+        return 1
+
+    run_target = source
+    if os.path.normcase(str(source)) == os.path.normcase(str(final)):
+        run_target = final
+    else:
+        try:
+            replace_file(source, final)
+            run_target = final
+            log.step(f"Replaced {final}")
+        except OSError as exc:
+            log.step(f"Replace failed ({exc}), fallback to staged executable")
+
+    if not plan.relaunch:
+        if run_target == final:
+            _mark_applied(plan)
+            _discard_source(plan, source, final)
+            log.finish("Staged update installed for next launch")
+        else:
+            log.finish("Staged update kept for next launch")
+        return 0
+
+    ready_file = Path(plan.ready_file)
+    started = launch_and_wait_ready(run_target, ready_file)
+    log.step(f"Started {run_target}" if started else f"Launch failed: {run_target}")
+    if not started and run_target != source and source.exists():
+        run_target = source
+        started = launch_and_wait_ready(run_target, ready_file)
+        log.step(f"Started fallback {run_target}" if started else "Fallback launch failed")
+
+    if started:
+        Path(plan.launch_info_file).write_text(f"RUN_TARGET={run_target}\nFINAL={final}\n", encoding="utf-8")
+        _mark_applied(plan)
+    else:
+        log.write("Ready flag was not received")
+
+    if run_target == final:
+        _discard_source(plan, source, final)
+
+    log.finish("Updater finished")
+    return 0 if started else 1
+
+
+def main(argv: list[str]) -> int:
+    try:
+        plan_path = Path(argv[argv.index(APPLY_UPDATE_SWITCH) + 1])
+        plan = SwapPlan.load(plan_path)
+    except (IndexError, ValueError, OSError, KeyError, TypeError):
+        return 2
+
+    try:
+        plan_path.unlink()
+    except OSError:
+        pass
+    return run_swap(plan)
@@ -1,26 +1,67 @@
 from __future__ import annotations
 
+import base64
+import hashlib
+import http.client
 import json
 import os
+import shutil
 import subprocess
 import sys
+import threading
+import time
 import urllib.error
+import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Callable
 
+from src.core.delta import apply_patch, file_sha256
+from src.core.rollback import ROLLBACK_DIR, RollbackCache, RollbackEntry
+from src.core.update_sources import (
+    UPDATE_SOURCE_GITHUB,
+    UpdateSource,
+    create_update_source,
+    local_path_from_url,
+)
+from src.core.update_swap import (
+    APPLY_UPDATE_SWITCH,
+    SWAP_HELPER_PREFIX,
+    SWAP_PLAN_PREFIX,
+    SwapPlan,
+    sanitized_child_env,
+)
 from src.version import __version__
 
-GITHUB_API_LATEST = "https://api.github.com/repos/Volfheim/Binity/releases/latest"
 GITHUB_HEADERS = {
     "Accept": "application/vnd.github+json",
     "User-Agent": "Binity-Updater",
 }
 CHECK_INTERVAL_HOURS = 24
+RELEASE_CACHE_FILE = "release-cache.json"
 DOWNLOAD_SOCKET_TIMEOUT_SEC = 180
-DOWNLOAD_RETRY_COUNT = 2
+DOWNLOAD_RETRY_COUNT = 5
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+PARTIAL_SUFFIX = ".part"
+PARTIAL_META_SUFFIX = ".part.json"
+DOWNLOAD_SEGMENTS = 4
+SEGMENTED_MIN_SIZE = 4 * 1024 * 1024
+HTTP_MAX_IDLE_PER_HOST = 4
+HTTP_MAX_REDIRECTS = 5
+CHECKSUM_MANIFEST_NAMES = ("sha256sums.txt", "sha256sums", "checksums.txt")
+CHECKSUM_MANIFEST_MAX_BYTES = 64 * 1024
+DOWNLOAD_PROFILE_INTERACTIVE = "interactive"
+DOWNLOAD_PROFILE_BACKGROUND = "background"
+THROTTLE_MIN_CHUNK_SIZE = 16 * 1024
+PROGRESS_MIN_INTERVAL_SEC = 0.1
+PROGRESS_IDLE_INTERVAL_SEC = 1.0
+DOWNLOAD_STATS_FILE = "download-stats.jsonl"
+DOWNLOAD_STATS_KEEP = 50
+STAGED_UPDATE_FILE = "staged-update.json"
+STAGED_PREFIX = "staged-"
 
 
 @dataclass(slots=True)
@@ -30,18 +71,385 @@ class UpdateInfo:
     body: str
     asset_name: str
     asset_size: int
+    delta_url: str = ""
+    delta_name: str = ""
+    delta_size: int = 0
+    manifest_url: str = ""
+    sha256: str = ""
+
+
+@dataclass(slots=True)
+class DownloadProgress:
+    percent: int
+    downloaded: int
+    total: int
+    bytes_per_sec: float
+    eta_sec: float
+    retries: int
+
+
+class DownloadCancelled(RuntimeError):
+    pass
+
+
+class HttpResponse:
+    def __init__(self, client: "HttpClient", pool_key: tuple, connection, response, url: str) -> None:
+        self._client = client
+        self._pool_key = pool_key
+        self._connection = connection
+        self._response = response
+        self.url = url
+        self.status = response.status
+        self.headers = response.headers
+
+    def read(self, amt: int | None = None) -> bytes:
+        try:
+            return self._response.read(amt)
+        except http.client.HTTPException as exc:
+            self._discard()
+            raise ConnectionError(str(exc) or exc.__class__.__name__) from exc
+
+    def close(self) -> None:
+        if self._connection is None:
+            return
+        if self._response.isclosed() and not self._response.will_close:
+            self._client._release(self._pool_key, self._connection)
+            self._connection = None
+        else:
+            self._discard()
+
+    def _discard(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> "HttpResponse":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class HttpClient:
+    """Keep-alive HTTP/HTTPS client with per-host connection reuse."""
+
+    def __init__(self, max_idle_per_host: int = HTTP_MAX_IDLE_PER_HOST) -> None:
+        self._max_idle = max_idle_per_host
+        self._idle: dict[tuple, list] = {}
+        self._redirects: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _proxy_for(scheme: str, host: str) -> urllib.parse.SplitResult | None:
+        proxy = urllib.request.getproxies().get(scheme, "")
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        if "://" not in proxy:
+            proxy = f"http://{proxy}"
+        return urllib.parse.urlsplit(proxy)
+
+    @staticmethod
+    def _proxy_auth_header(proxy: urllib.parse.SplitResult) -> dict[str, str]:
+        if not proxy.username:
+            return {}
+        user = urllib.parse.unquote(proxy.username)
+        password = urllib.parse.unquote(proxy.password or "")
+        token = base64.b64encode(f"{user}:{password}".encode("utf-8")).decode("ascii")
+        return {"Proxy-Authorization": f"Basic {token}"}
+
+    def _connect(self, parts: urllib.parse.SplitResult, timeout: float) -> tuple[tuple, object, bool]:
+        scheme = parts.scheme.lower()
+        host = parts.hostname or ""
+        port = parts.port or (443 if scheme == "https" else 80)
+        proxy = self._proxy_for(scheme, host)
+        pool_key = (scheme, host, port, proxy.geturl() if proxy else "")
+
+        with self._lock:
+            idle = self._idle.get(pool_key)
+            connection = idle.pop() if idle else None
+        if connection is not None:
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            return pool_key, connection, True
+
+        if proxy is None:
+            if scheme == "https":
+                connection = http.client.HTTPSConnection(host, port, timeout=timeout)
+            else:
+                connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        elif scheme == "https":
+            connection = http.client.HTTPSConnection(proxy.hostname, proxy.port or 8080, timeout=timeout)
+            connection.set_tunnel(host, port, headers=self._proxy_auth_header(proxy))
+        else:
+            connection = http.client.HTTPConnection(proxy.hostname, proxy.port or 8080, timeout=timeout)
+        return pool_key, connection, False
+
+    def _release(self, pool_key: tuple, connection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(pool_key, [])
+            if len(idle) < self._max_idle:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _send(self, url: str, method: str, headers: dict[str, str], timeout: float) -> HttpResponse:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme.lower() not in ("http", "https"):
+            raise urllib.error.URLError(f"Unsupported URL scheme: {parts.scheme}")
+
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+
+        while True:
+            pool_key, connection, reused = self._connect(parts, timeout)
+            request_headers = dict(headers)
+            request_target = target
+            if pool_key[3] and parts.scheme.lower() == "http":
+                request_target = urllib.parse.urlunsplit((parts.scheme, parts.netloc, target, "", ""))
+                request_headers.update(self._proxy_auth_header(urllib.parse.urlsplit(pool_key[3])))
+            try:
+                connection.request(method, request_target, headers=request_headers)
+                response = connection.getresponse()
+            except (http.client.HTTPException, ConnectionError) as exc:
+                connection.close()
+                if reused:
+                    continue
+                raise urllib.error.URLError(str(exc) or exc.__class__.__name__) from exc
+            except OSError:
+                connection.close()
+                raise
+            return HttpResponse(self, pool_key, connection, response, url)
+
+    def open(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        method: str = "GET",
+        timeout: float = 15,
+    ) -> HttpResponse:
+        headers = dict(headers or {})
+        with self._lock:
+            cached_target = self._redirects.get(url) if method in ("GET", "HEAD") else None
+
+        if cached_target:
+            response = self._send(cached_target, method, headers, timeout)
+            if response.status < 300:
+                return response
+            response.close()
+            with self._lock:
+                self._redirects.pop(url, None)
+
+        current = url
+        for _ in range(HTTP_MAX_REDIRECTS + 1):
+            response = self._send(current, method, headers, timeout)
+            location = response.headers.get("Location", "")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                response.read()
+                response.close()
+                current = urllib.parse.urljoin(current, location)
+                continue
+
+            if response.status >= 300:
+                payload = response.read()
+                response.close()
+                message = payload.decode("utf-8", errors="replace")[:200] or f"HTTP {response.status}"
+                raise urllib.error.HTTPError(current, response.status, message, response.headers, None)
+
+            if current != url and method in ("GET", "HEAD"):
+                with self._lock:
+                    self._redirects[url] = current
+            return response
+
+        raise urllib.error.URLError(f"Too many redirects for {url}")
+
+    def close(self) -> None:
+        with self._lock:
+            idle = [connection for connections in self._idle.values() for connection in connections]
+            self._idle.clear()
+        for connection in idle:
+            connection.close()
+
+
+class _RangeNotSupported(RuntimeError):
+    pass
+
+
+class _OrderedDigest:
+    """SHA-256 of a file filled out of order by range workers, built while the ranges are being written.
+
+    Chunks that extend the hashed prefix are hashed from memory; bytes a later range wrote ahead of the prefix
+    are read back once, as soon as the prefix reaches them.
+    """
+
+    def __init__(self, path: Path, segments: list[list[int]]) -> None:
+        self._path = path
+        self._segments = segments
+        self._digest = hashlib.sha256()
+        self._position = 0
+        self._lock = threading.Lock()
+        with self._lock:
+            self._catch_up()
+
+    def update(self, offset: int, chunk: bytes) -> None:
+        with self._lock:
+            if offset == self._position:
+                self._digest.update(chunk)
+                self._position += len(chunk)
+            self._catch_up()
+
+    def hexdigest(self, total_size: int) -> str:
+        with self._lock:
+            self._catch_up()
+            if self._position != total_size:
+                raise RuntimeError(f"Hashed {self._position} of {total_size} bytes")
+            return self._digest.hexdigest()
+
+    def _catch_up(self) -> None:
+        while True:
+            written_end = next(
+                (start + done for start, end, done in self._segments if start <= self._position <= end),
+                self._position,
+            )
+            if written_end <= self._position:
+                return
+            with open(self._path, "rb") as fh:
+                fh.seek(self._position)
+                remaining = written_end - self._position
+                while remaining > 0:
+                    block = fh.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+                    if not block:
+                        raise RuntimeError(f"Partial download ends before byte {written_end}")
+                    self._digest.update(block)
+                    remaining -= len(block)
+            self._position = written_end
+
+
+class CancelToken:
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise DownloadCancelled("Download cancelled")
+
+    def wait(self, timeout: float) -> bool:
+        return self._event.wait(timeout)
+
+
+class TokenBucket:
+    """Caps throughput at `rate` bytes/sec; 0 means unlimited. Shared by all download threads."""
+
+    def __init__(self, rate: int) -> None:
+        self.rate = max(0, int(rate or 0))
+        self._capacity = float(self.rate)
+        self._tokens = 0.0
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def limited(self) -> bool:
+        return self.rate > 0
+
+    def chunk_size(self, default: int) -> int:
+        if not self.rate:
+            return default
+        return max(THROTTLE_MIN_CHUNK_SIZE, min(default, self.rate // 4))
+
+    def consume(self, amount: int, cancel_token: CancelToken | None = None) -> None:
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= amount
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay <= 0:
+            return
+        if cancel_token is None:
+            time.sleep(delay)
+        elif cancel_token.wait(delay):
+            raise DownloadCancelled("Download cancelled")
+
+
+class DownloadStats:
+    """Turns per-chunk byte counts into progress events of at most 10 Hz (or one per second while idle)."""
+
+    def __init__(self, on_progress: Callable[[DownloadProgress], None] | None = None) -> None:
+        self._on_progress = on_progress
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.source = ""
+        self.retries = 0
+        self.downloaded = 0
+        self.total = 0
+        self.transferred = 0
+        self._last_emit = 0.0
+        self._last_percent = -1
+
+    def update(self, downloaded: int, total: int, received: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.downloaded = downloaded
+            self.total = total
+            self.transferred += received
+
+            percent = max(0, min(100, int(downloaded / total * 100))) if total > 0 else 0
+            if total <= 0 or downloaded < total:
+                if now - self._last_emit < PROGRESS_MIN_INTERVAL_SEC:
+                    return
+                if percent == self._last_percent and now - self._last_emit < PROGRESS_IDLE_INTERVAL_SEC:
+                    return
+            self._last_emit = now
+            self._last_percent = percent
+
+            elapsed = now - self.started
+            rate = self.transferred / elapsed if elapsed > 0 else 0.0
+            eta = (total - downloaded) / rate if rate > 0 and total > downloaded else 0.0
+            if self._on_progress:
+                self._on_progress(DownloadProgress(percent, downloaded, total, rate, eta, self.retries))
+
+    def as_record(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            duration = now - self.started
+            return {
+                "source": self.source,
+                "bytes": self.transferred,
+                "total": self.total,
+                "duration_sec": round(duration, 3),
+                "bytes_per_sec": round(self.transferred / duration) if duration > 0 else 0,
+                "retries": self.retries,
+            }
 
 
 class Updater:
     def __init__(self, settings) -> None:
         self.settings = settings
+        self.http = HttpClient()
         self._info: UpdateInfo | None = None
         self._checking = False
         self._downloading = False
+        self._segments_disabled_url = ""
+        self._throttle = TokenBucket(0)
+        self._stats = DownloadStats()
+        self.rollback_cache = RollbackCache(self._update_dir() / ROLLBACK_DIR)
         self._just_updated = self._check_and_clear_flag()
         self.launch_target_path = ""
         self.launch_final_path = ""
         self.last_error = ""
+        self.last_download_cancelled = False
+        self.last_download_stats: dict = {}
+        self.release_from_stale_cache = False
         self._consume_launch_info()
         self._cleanup_runtime_leftovers()
 
@@ -116,6 +524,14 @@ class Updater:
                 parts.append(0)
         return tuple(parts) or (0,)
 
+    def _at_or_below_rollback_pin(self, version: str) -> bool:
+        pin = str(self.settings.get("rollback_pin_version", "") or "")
+        return bool(pin) and self._parse_version(version) <= self._parse_version(pin)
+
+    def _withheld_from_auto_update(self, version: str) -> bool:
+        skipped = str(self.settings.get("skipped_update_version", "") or "")
+        return (bool(skipped) and skipped == version) or self._at_or_below_rollback_pin(version)
+
     @staticmethod
     def _powershell_exe() -> str:
         system_root = os.environ.get("SystemRoot", r"C:\Windows")
@@ -124,16 +540,6 @@ class Updater:
             return str(candidate)
         return "powershell"
 
-    @staticmethod
-    def _sanitized_child_env() -> dict[str, str]:
-        env = {str(key): str(value) for key, value in os.environ.items()}
-        for key in list(env.keys()):
-            upper = key.upper()
-            if upper == "_MEIPASS2" or upper.startswith("_PYI_"):
-                env.pop(key, None)
-        env["PYINSTALLER_RESET_ENVIRONMENT"] = "1"
-        return env
-
     @staticmethod
     def _reset_windows_dll_directory() -> None:
         if os.name != "nt":
@@ -145,16 +551,90 @@ class Updater:
         except Exception:
             pass
 
-    def _fetch_latest_release(self) -> dict:
-        request = urllib.request.Request(GITHUB_API_LATEST, headers=GITHUB_HEADERS, method="GET")
-        with urllib.request.urlopen(request, timeout=15) as response:
-            if response.status != 200:
-                raise RuntimeError(f"HTTP {response.status}")
-            payload = response.read().decode("utf-8", errors="replace")
-            raw = json.loads(payload)
-            if isinstance(raw, dict):
-                return raw
+    def _release_cache_path(self) -> Path:
+        return self._update_dir() / RELEASE_CACHE_FILE
+
+    def _load_release_cache(self, url: str) -> dict:
+        try:
+            raw = json.loads(self._release_cache_path().read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(raw, dict) or raw.get("url") != url:
             return {}
+        if not isinstance(raw.get("release"), dict):
+            return {}
+        return raw
+
+    def _save_release_cache(self, url: str, release: dict, etag: str, last_modified: str) -> None:
+        cache_path = self._release_cache_path()
+        payload = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "release": release,
+        }
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = cache_path.with_suffix(".tmp")
+            temp_file.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            temp_file.replace(cache_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _is_local_url(url: str) -> bool:
+        return urllib.parse.urlsplit(str(url or "")).scheme.lower() == "file"
+
+    def _read_url(self, url: str, limit: int = -1) -> bytes:
+        if self._is_local_url(url):
+            with open(local_path_from_url(url), "rb") as fh:
+                return fh.read(limit)
+        with self.http.open(url, headers=GITHUB_HEADERS, timeout=15) as response:
+            return response.read(None if limit < 0 else limit)
+
+    def _fetch_release_json(self, url: str) -> dict:
+        cache = self._load_release_cache(url)
+        try:
+            if self._is_local_url(url):
+                raw = json.loads(self._read_url(url).decode("utf-8", errors="replace"))
+                etag = last_modified = ""
+            else:
+                headers = dict(GITHUB_HEADERS)
+                if cache.get("etag"):
+                    headers["If-None-Match"] = str(cache["etag"])
+                elif cache.get("last_modified"):
+                    headers["If-Modified-Since"] = str(cache["last_modified"])
+
+                with self.http.open(url, headers=headers, timeout=15) as response:
+                    if response.status != 200:
+                        raise RuntimeError(f"HTTP {response.status}")
+                    raw = json.loads(response.read().decode("utf-8", errors="replace"))
+                    etag = str(response.headers.get("ETag", "") or "")
+                    last_modified = str(response.headers.get("Last-Modified", "") or "")
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304 and cache:
+                return dict(cache["release"])
+            raise
+        except (urllib.error.URLError, TimeoutError, OSError):
+            if not cache:
+                raise
+            self.release_from_stale_cache = True
+            return dict(cache["release"])
+
+        if not isinstance(raw, dict):
+            return {}
+        self._save_release_cache(url, raw, etag, last_modified)
+        return raw
+
+    def update_source(self) -> UpdateSource:
+        return create_update_source(
+            str(self.settings.get("update_source", UPDATE_SOURCE_GITHUB) or UPDATE_SOURCE_GITHUB),
+            str(self.settings.get("update_source_location", "") or ""),
+        )
+
+    def _fetch_latest_release(self) -> dict:
+        self.release_from_stale_cache = False
+        return self.update_source().fetch_latest_release(self._fetch_release_json)
 
     def _select_asset(self, assets: list[dict], tag_name: str) -> dict | None:
         version_hint = str(tag_name or "").lstrip("vV").strip().lower()
@@ -187,10 +667,31 @@ class Updater:
         candidates.sort(key=lambda item: (-item[0], str(item[1].get("name", "")).lower()))
         return candidates[0][1]
 
-    def check_for_update(self, force: bool = False) -> UpdateInfo | None:
-        if self._checking:
-            return self._info
-        if not force and not self._should_check():
+    @staticmethod
+    def delta_asset_name(from_version: str, to_version: str) -> str:
+        source = str(from_version or "").lstrip("vV").strip()
+        target = str(to_version or "").lstrip("vV").strip()
+        return f"Binity-{source}-to-{target}.patch"
+
+    def _select_delta_asset(self, assets: list[dict], tag_name: str) -> dict | None:
+        expected = self.delta_asset_name(__version__, tag_name).lower()
+        for asset in assets:
+            if str(asset.get("name", "") or "").lower() == expected:
+                return asset
+        return None
+
+    @staticmethod
+    def _select_checksum_manifest(assets: list[dict]) -> dict | None:
+        for asset in assets:
+            if str(asset.get("name", "") or "").lower() in CHECKSUM_MANIFEST_NAMES:
+                return asset
+        return None
+
+    def check_for_update(self, force: bool = False, manual: bool = False) -> UpdateInfo | None:
+        """`force` only bypasses the check interval; skipped and rolled-back versions are offered on manual checks only."""
+        if self._checking or (not force and not self._should_check()):
+            if self._info is not None and not manual and self._withheld_from_auto_update(self._info.version):
+                return None
             return self._info
 
         self._checking = True
@@ -199,10 +700,13 @@ class Updater:
         try:
             release = self._fetch_latest_release()
             local_ver = self._parse_version(__version__)
-            skipped = str(self.settings.get("skipped_update_version", "") or "")
+
+            def _mark_checked() -> None:
+                if not self.release_from_stale_cache:
+                    self.settings.set("last_update_check", datetime.now().isoformat())
 
             def _no_update() -> None:
-                self.settings.set("last_update_check", datetime.now().isoformat())
+                _mark_checked()
                 self._info = None
 
             if bool(release.get("draft")) or bool(release.get("prerelease")):
@@ -219,7 +723,7 @@ class Updater:
                 _no_update()
                 return None
 
-            if not force and skipped and skipped == tag_name:
+            if not manual and self._withheld_from_auto_update(tag_name):
                 _no_update()
                 return None
 
@@ -235,14 +739,21 @@ class Updater:
                 _no_update()
                 return None
 
+            delta_asset = self._select_delta_asset(list(release.get("assets", [])), tag_name) or {}
+            manifest_asset = self._select_checksum_manifest(list(release.get("assets", []))) or {}
+
             self._info = UpdateInfo(
                 version=tag_name,
                 download_url=download_url,
                 body=str(release.get("body", "") or ""),
                 asset_name=asset_name,
                 asset_size=asset_size,
+                delta_url=str(delta_asset.get("browser_download_url", "") or ""),
+                delta_name=str(delta_asset.get("name", "") or ""),
+                delta_size=int(delta_asset.get("size", 0) or 0),
+                manifest_url=str(manifest_asset.get("browser_download_url", "") or ""),
             )
-            self.settings.set("last_update_check", datetime.now().isoformat())
+            _mark_checked()
             return self._info
 
         except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError, OSError, ValueError, RuntimeError) as exc:
@@ -251,12 +762,14 @@ class Updater:
         finally:
             self._checking = False
 
-    def _download_target_path(self) -> Path:
+    def _download_target_path(self, stage: bool = False) -> Path:
         update_dir = self._update_dir()
         desired_name = os.path.basename(str(self._info.asset_name or "").strip()) or "Binity.exe"
         if not desired_name.lower().endswith(".exe"):
             desired_name += ".exe"
 
+        if stage:
+            return update_dir / f"{STAGED_PREFIX}{desired_name}"
         if not self.is_frozen():
             return update_dir / desired_name
 
@@ -272,68 +785,545 @@ class Updater:
                 return update_dir / f"next-{desired_name}"
         return preferred
 
-    def download_update(self, on_progress: Callable[[int], None] | None = None) -> Path | None:
+    def _partial_paths(self, asset_name: str) -> tuple[Path, Path]:
+        name = os.path.basename(str(asset_name or "").strip()) or "Binity.exe"
+        update_dir = self._update_dir()
+        return update_dir / f"{name}{PARTIAL_SUFFIX}", update_dir / f"{name}{PARTIAL_META_SUFFIX}"
+
+    @staticmethod
+    def _discard_partial(partial: Path, meta_path: Path) -> None:
+        for path in (partial, meta_path):
+            try:
+                if path.exists():
+                    path.unlink()
+            except OSError:
+                pass
+
+    def _load_partial_meta(self, url: str, expected_size: int, partial: Path, meta_path: Path) -> dict:
+        if not partial.exists():
+            self._discard_partial(partial, meta_path)
+            return {}
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            meta = None
+        if not isinstance(meta, dict) or meta.get("url") != url:
+            self._discard_partial(partial, meta_path)
+            return {}
+        if expected_size and int(meta.get("size", 0) or 0) not in (0, expected_size):
+            self._discard_partial(partial, meta_path)
+            return {}
+        return meta
+
+    @staticmethod
+    def _save_partial_meta(meta_path: Path, meta: dict) -> None:
+        try:
+            meta_path.write_text(json.dumps(meta), encoding="utf-8")
+        except OSError:
+            pass
+
+    def _download_to_partial(
+        self,
+        url: str,
+        expected_size: int,
+        partial: Path,
+        meta_path: Path,
+        on_progress: Callable[[int, int, int], None] | None,
+        cancel_token: CancelToken | None,
+    ) -> str:
+        expected_size = int(expected_size or 0)
+        if self._is_local_url(url):
+            return self._copy_local_asset(url, partial, meta_path, on_progress, cancel_token)
+
+        meta = self._load_partial_meta(url, expected_size, partial, meta_path)
+
+        if self._segments_disabled_url != url:
+            if not meta:
+                meta = self._probe_segmented_meta(url, expected_size)
+            if meta.get("segments"):
+                try:
+                    return self._download_segmented(url, partial, meta_path, meta, on_progress, cancel_token)
+                except _RangeNotSupported:
+                    self._segments_disabled_url = url
+                    self._discard_partial(partial, meta_path)
+                    meta = {}
+
+        offset = partial.stat().st_size if meta else 0
+        if meta.get("segments") or (offset and offset == expected_size and not meta.get("sha256")):
+            # Ranges that can no longer be resumed, or a full-size file whose digest was never recorded.
+            self._discard_partial(partial, meta_path)
+            meta, offset = {}, 0
+        if expected_size and offset == expected_size:
+            return str(meta["sha256"])
+        if expected_size and offset > expected_size:
+            self._discard_partial(partial, meta_path)
+            meta, offset = {}, 0
+
+        headers = dict(GITHUB_HEADERS)
+        if offset > 0:
+            headers["Range"] = f"bytes={offset}-"
+            validator = str(meta.get("etag") or meta.get("last_modified") or "")
+            if validator:
+                headers["If-Range"] = validator
+
+        try:
+            response = self.http.open(url, headers=headers, timeout=DOWNLOAD_SOCKET_TIMEOUT_SEC)
+        except urllib.error.HTTPError as exc:
+            if exc.code == 416 and offset > 0:
+                self._discard_partial(partial, meta_path)
+            raise
+
+        with response:
+            status = getattr(response, "status", 200)
+            if status == 206 and offset > 0:
+                mode = "ab"
+            elif status == 200:
+                mode = "wb"
+                offset = 0
+            else:
+                raise RuntimeError(f"HTTP {status}")
+
+            content_length = int(response.headers.get("Content-Length", "0") or 0)
+            total_size = expected_size or (offset + content_length if content_length else 0)
+            meta = {
+                "url": url,
+                "etag": str(response.headers.get("ETag", "") or ""),
+                "last_modified": str(response.headers.get("Last-Modified", "") or ""),
+                "size": total_size,
+            }
+            self._save_partial_meta(meta_path, meta)
+
+            digest = hashlib.sha256()
+            if offset > 0:
+                with open(partial, "rb") as existing:
+                    for block in iter(lambda: existing.read(DOWNLOAD_CHUNK_SIZE), b""):
+                        digest.update(block)
+
+            downloaded = offset
+            chunk_size = self._throttle.chunk_size(DOWNLOAD_CHUNK_SIZE)
+            with open(partial, mode) as output:
+                while True:
+                    if cancel_token is not None:
+                        cancel_token.raise_if_cancelled()
+                    chunk = response.read(chunk_size)
+                    if not chunk:
+                        break
+                    self._throttle.consume(len(chunk), cancel_token)
+                    output.write(chunk)
+                    digest.update(chunk)
+                    downloaded += len(chunk)
+                    if on_progress:
+                        on_progress(downloaded, total_size, len(chunk))
+
+        if total_size and downloaded < total_size:
+            raise RuntimeError(f"Connection closed at {downloaded} of {total_size} bytes")
+        # Recorded so a finished partial found by a later attempt is not read again just to hash it.
+        self._save_partial_meta(meta_path, {**meta, "sha256": digest.hexdigest()})
+        return digest.hexdigest()
+
+    def _copy_local_asset(
+        self,
+        url: str,
+        partial: Path,
+        meta_path: Path,
+        on_progress: Callable[[int, int, int], None] | None,
+        cancel_token: CancelToken | None,
+    ) -> str:
+        self._discard_partial(partial, meta_path)
+        source = local_path_from_url(url)
+        total_size = source.stat().st_size
+        digest = hashlib.sha256()
+        copied = 0
+        chunk_size = self._throttle.chunk_size(DOWNLOAD_CHUNK_SIZE)
+        with open(source, "rb") as src, open(partial, "wb") as output:
+            while True:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                chunk = src.read(chunk_size)
+                if not chunk:
+                    break
+                self._throttle.consume(len(chunk), cancel_token)
+                output.write(chunk)
+                digest.update(chunk)
+                copied += len(chunk)
+                if on_progress:
+                    on_progress(copied, total_size, len(chunk))
+        return digest.hexdigest()
+
+    def _probe_segmented_meta(self, url: str, expected_size: int) -> dict:
+        if DOWNLOAD_SEGMENTS < 2 or expected_size < SEGMENTED_MIN_SIZE or self._throttle.limited:
+            return {}
+
+        try:
+            with self.http.open(url, headers=GITHUB_HEADERS, method="HEAD", timeout=15) as response:
+                accept_ranges = str(response.headers.get("Accept-Ranges", "") or "").lower()
+                length = int(response.headers.get("Content-Length", "0") or 0)
+                etag = str(response.headers.get("ETag", "") or "")
+                last_modified = str(response.headers.get("Last-Modified", "") or "")
+        except (urllib.error.URLError, TimeoutError, OSError, ValueError):
+            return {}
+
+        if accept_ranges != "bytes" or length != expected_size:
+            return {}
+
+        segment_size = -(-expected_size // DOWNLOAD_SEGMENTS)
+        segments = []
+        for start in range(0, expected_size, segment_size):
+            end = min(start + segment_size, expected_size) - 1
+            segments.append([start, end, 0])
+        return {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": expected_size,
+            "segments": segments,
+        }
+
+    def _download_segmented(
+        self,
+        url: str,
+        partial: Path,
+        meta_path: Path,
+        meta: dict,
+        on_progress: Callable[[int, int, int], None] | None,
+        cancel_token: CancelToken | None,
+    ) -> str:
+        total_size = int(meta["size"])
+        segments = [[int(start), int(end), int(done)] for start, end, done in meta["segments"]]
+        validator = str(meta.get("etag") or meta.get("last_modified") or "")
+
+        mode = "r+b" if partial.exists() else "wb"
+        with open(partial, mode) as fh:
+            if os.fstat(fh.fileno()).st_size != total_size:
+                fh.truncate(total_size)
+        self._save_partial_meta(meta_path, {**meta, "segments": segments})
+        digest = _OrderedDigest(partial, segments)
+
+        progress_lock = threading.Lock()
+        stop = threading.Event()
+        chunk_size = self._throttle.chunk_size(DOWNLOAD_CHUNK_SIZE)
+        downloaded = [sum(done for _, _, done in segments)]
+
+        def _report(count: int) -> None:
+            with progress_lock:
+                downloaded[0] += count
+                if on_progress:
+                    on_progress(downloaded[0], total_size, count)
+
+        def _fetch(segment: list[int]) -> None:
+            start, end, _ = segment
+            if start + segment[2] > end:
+                return
+
+            headers = dict(GITHUB_HEADERS)
+            headers["Range"] = f"bytes={start + segment[2]}-{end}"
+            if validator:
+                headers["If-Range"] = validator
+            with self.http.open(url, headers=headers, timeout=DOWNLOAD_SOCKET_TIMEOUT_SEC) as response:
+                if getattr(response, "status", 200) != 206:
+                    raise _RangeNotSupported(f"HTTP {getattr(response, 'status', 200)} for ranged request")
+                with open(partial, "r+b") as output:
+                    output.seek(start + segment[2])
+                    while not stop.is_set():
+                        if cancel_token is not None:
+                            cancel_token.raise_if_cancelled()
+                        chunk = response.read(min(chunk_size, end + 1 - start - segment[2]))
+                        if not chunk:
+                            break
+                        self._throttle.consume(len(chunk), cancel_token)
+                        offset = start + segment[2]
+                        output.write(chunk)
+                        output.flush()
+                        segment[2] += len(chunk)
+                        digest.update(offset, chunk)
+                        _report(len(chunk))
+
+            if not stop.is_set() and start + segment[2] <= end:
+                raise RuntimeError(f"Segment {start}-{end} closed early at {start + segment[2]}")
+
+        error: BaseException | None = None
+        with ThreadPoolExecutor(max_workers=len(segments), thread_name_prefix="binity-download") as pool:
+            futures = [pool.submit(_fetch, segment) for segment in segments]
+            for future in as_completed(futures):
+                exc = future.exception()
+                if exc is not None and error is None:
+                    error = exc
+                    stop.set()
+
+        if error is not None:
+            self._save_partial_meta(meta_path, {**meta, "segments": segments})
+            raise error
+        hexdigest = digest.hexdigest(total_size)
+        finished = {key: value for key, value in meta.items() if key != "segments"}
+        self._save_partial_meta(meta_path, {**finished, "sha256": hexdigest})
+        return hexdigest
+
+    def _fetch_with_retries(
+        self,
+        url: str,
+        expected_size: int,
+        partial: Path,
+        meta_path: Path,
+        on_progress: Callable[[int, int, int], None] | None,
+        cancel_token: CancelToken | None,
+    ) -> str:
+        for attempt in range(1, DOWNLOAD_RETRY_COUNT + 1):
+            try:
+                return self._download_to_partial(url, expected_size, partial, meta_path, on_progress, cancel_token)
+            except DownloadCancelled:
+                raise
+            except (urllib.error.URLError, TimeoutError, OSError, RuntimeError) as exc:
+                if attempt >= DOWNLOAD_RETRY_COUNT:
+                    raise RuntimeError(str(exc)) from exc
+                self._stats.retries += 1
+        raise RuntimeError("Download failed")
+
+    def _build_from_delta(
+        self,
+        partial: Path,
+        meta_path: Path,
+        expected_sha256: str,
+        on_progress: Callable[[int, int, int], None] | None,
+        cancel_token: CancelToken | None,
+    ) -> str:
+        """Patches the running executable; any failure, including a bad result, leaves the full download to run."""
+        if not self._info.delta_url or not self.is_frozen():
+            return ""
+        if meta_path.exists():
+            return ""
+
+        patch_partial, patch_meta = self._partial_paths(self._info.delta_name)
+        try:
+            self._fetch_with_retries(
+                self._info.delta_url,
+                self._info.delta_size,
+                patch_partial,
+                patch_meta,
+                on_progress,
+                cancel_token,
+            )
+            digest = apply_patch(
+                Path(sys.executable),
+                patch_partial,
+                partial,
+                check_cancelled=cancel_token.raise_if_cancelled if cancel_token else None,
+            ).hex()
+            self._validate_download(partial, meta_path, digest, expected_sha256)
+            return digest
+        except DownloadCancelled:
+            self._discard_partial(partial, meta_path)
+            raise
+        except (urllib.error.URLError, TimeoutError, OSError, ValueError, RuntimeError):
+            self._discard_partial(partial, meta_path)
+            return ""
+        finally:
+            self._discard_partial(patch_partial, patch_meta)
+
+    def _validate_download(self, partial: Path, meta_path: Path, digest: str, expected_sha256: str) -> None:
+        if not partial.exists():
+            raise RuntimeError("Downloaded file not found")
+
+        actual_size = partial.stat().st_size
+        if self._info.asset_size and actual_size != self._info.asset_size:
+            self._discard_partial(partial, meta_path)
+            raise RuntimeError(f"Size mismatch: expected {self._info.asset_size}, got {actual_size}")
+        if actual_size < 1_000_000:
+            self._discard_partial(partial, meta_path)
+            raise RuntimeError("Downloaded file too small (<1MB)")
+
+        with open(partial, "rb") as fh:
+            header = fh.read(2)
+        if header != b"MZ":
+            self._discard_partial(partial, meta_path)
+            raise RuntimeError("Downloaded file is not a valid EXE")
+
+        if expected_sha256 and digest != expected_sha256:
+            self._discard_partial(partial, meta_path)
+            raise RuntimeError(f"Checksum mismatch: expected {expected_sha256}, got {digest}")
+
+    @staticmethod
+    def _parse_checksum_manifest(text: str) -> dict[str, str]:
+        checksums: dict[str, str] = {}
+        for raw_line in text.splitlines():
+            parts = raw_line.strip().split(None, 1)
+            if len(parts) != 2:
+                continue
+            digest, name = parts[0].lower(), parts[1].strip().lstrip("*")
+            if len(digest) == 64 and all(ch in "0123456789abcdef" for ch in digest):
+                checksums[os.path.basename(name).lower()] = digest
+        return checksums
+
+    def _expected_sha256(self) -> str:
+        """Releases without a manifest are not verified; a published manifest that cannot be used fails closed."""
+        if not self._info.manifest_url:
+            return ""
+        try:
+            payload = self._read_url(self._info.manifest_url, CHECKSUM_MANIFEST_MAX_BYTES)
+        except (urllib.error.URLError, TimeoutError, OSError, ValueError) as exc:
+            raise RuntimeError(f"Checksum manifest unavailable: {exc}") from exc
+        checksums = self._parse_checksum_manifest(payload.decode("utf-8", errors="replace"))
+        name = os.path.basename(str(self._info.asset_name or "").strip()).lower()
+        if name not in checksums:
+            raise RuntimeError(f"Checksum manifest has no entry for {name}")
+        return checksums[name]
+
+    def _is_verified_file(self, path: Path, expected_sha256: str) -> bool:
+        try:
+            if not path.exists():
+                return False
+            if self._info.asset_size and path.stat().st_size != self._info.asset_size:
+                return False
+            if file_sha256(path).hex() != expected_sha256:
+                return False
+        except OSError:
+            return False
+        self._info.sha256 = expected_sha256
+        return True
+
+    def _staged_record_path(self) -> Path:
+        return self._update_dir() / STAGED_UPDATE_FILE
+
+    def _write_staged_record(self, path: Path) -> None:
+        record_path = self._staged_record_path()
+        payload = {
+            "version": self._info.version,
+            "path": str(path),
+            "size": path.stat().st_size,
+            "sha256": self._info.sha256,
+        }
+        temp_file = record_path.with_suffix(".tmp")
+        temp_file.write_text(json.dumps(payload), encoding="utf-8")
+        temp_file.replace(record_path)
+
+    def discard_staged_update(self, keep_file: bool = False) -> None:
+        record_path = self._staged_record_path()
+        try:
+            record = json.loads(record_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            record = {}
+        paths = [record_path]
+        if not keep_file and isinstance(record, dict) and record.get("path"):
+            paths.append(Path(str(record["path"])))
+        for path in paths:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def staged_update(self) -> Path | None:
+        try:
+            record = json.loads(self._staged_record_path().read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        valid = isinstance(record, dict)
+        if valid:
+            version = str(record.get("version", "") or "")
+            path = Path(str(record.get("path", "") or ""))
+            valid = (
+                self._parse_version(version) > self._parse_version(__version__)
+                and not self._at_or_below_rollback_pin(version)
+                and (self._info is None or self._info.version == version)
+                and path.parent == self._update_dir()
+                and path.name.startswith(STAGED_PREFIX)
+            )
+        if valid:
+            try:
+                valid = (
+                    path.stat().st_size == int(record.get("size", 0) or 0)
+                    and file_sha256(path).hex() == str(record.get("sha256", "") or "")
+                )
+            except (OSError, ValueError):
+                valid = False
+
+        if not valid:
+            self.discard_staged_update()
+            return None
+        return path
+
+    def apply_staged_update(self, relaunch: bool = True) -> bool:
+        if self._just_updated or not self.is_frozen():
+            return False
+        staged = self.staged_update()
+        if staged is None:
+            return False
+        return self.apply_update(staged, relaunch=relaunch)
+
+    def download_rate_limit(self, profile: str = DOWNLOAD_PROFILE_INTERACTIVE) -> int:
+        limit_kib = int(self.settings.get("download_rate_limit_kib", 0) or 0)
+        if profile == DOWNLOAD_PROFILE_BACKGROUND:
+            background_kib = int(self.settings.get("background_download_rate_limit_kib", 0) or 0)
+            if background_kib > 0 and (limit_kib <= 0 or background_kib < limit_kib):
+                limit_kib = background_kib
+        return max(0, limit_kib) * 1024
+
+    def download_update(
+        self,
+        on_progress: Callable[[DownloadProgress], None] | None = None,
+        cancel_token: CancelToken | None = None,
+        stage: bool = False,
+        profile: str = "",
+    ) -> Path | None:
         if self._downloading:
             return None
+        self.last_download_stats = {}
         if not self._info:
             self.last_error = "No update metadata available"
             return None
 
         self._downloading = True
         self.last_error = ""
+        self.last_download_cancelled = False
+        if not profile:
+            profile = DOWNLOAD_PROFILE_BACKGROUND if stage else DOWNLOAD_PROFILE_INTERACTIVE
+        self._throttle = TokenBucket(self.download_rate_limit(profile))
+        self._stats = DownloadStats(on_progress)
+        on_progress = self._stats.update
         target: Path | None = None
+        partial: Path | None = None
+        meta_path: Path | None = None
 
         try:
             update_dir = self._update_dir()
             update_dir.mkdir(parents=True, exist_ok=True)
 
-            target = self._download_target_path()
+            staged = self.staged_update()
+            if staged is not None:
+                self._stats.source = "staged"
+                return staged
+            if stage and self._at_or_below_rollback_pin(self._info.version):
+                raise RuntimeError(f"{self._info.version} was rolled back and is not staged automatically")
+
+            target = self._download_target_path(stage)
             target.parent.mkdir(parents=True, exist_ok=True)
+
+            expected_sha256 = self._expected_sha256()
+            if expected_sha256 and self._is_verified_file(target, expected_sha256):
+                if stage:
+                    self._write_staged_record(target)
+                self._stats.source = "cached"
+                return target
             if target.exists():
                 target.unlink()
-            request = urllib.request.Request(self._info.download_url, headers=GITHUB_HEADERS, method="GET")
-            for attempt in range(1, DOWNLOAD_RETRY_COUNT + 1):
-                try:
-                    with urllib.request.urlopen(request, timeout=DOWNLOAD_SOCKET_TIMEOUT_SEC) as response:
-                        status = getattr(response, "status", 200)
-                        if status != 200:
-                            raise RuntimeError(f"HTTP {status}")
-
-                        total_size = int(response.headers.get("Content-Length", "0") or 0)
-                        downloaded = 0
-                        with open(target, "wb") as output:
-                            while True:
-                                chunk = response.read(256 * 1024)
-                                if not chunk:
-                                    break
-                                output.write(chunk)
-                                downloaded += len(chunk)
-                                if total_size > 0 and on_progress:
-                                    pct = int(downloaded / total_size * 100)
-                                    on_progress(max(0, min(100, pct)))
-                    break
-                except (urllib.error.URLError, TimeoutError, OSError, RuntimeError) as exc:
-                    try:
-                        if target.exists():
-                            target.unlink()
-                    except OSError:
-                        pass
-                    if attempt >= DOWNLOAD_RETRY_COUNT:
-                        raise RuntimeError(str(exc)) from exc
-
-            if not target.exists():
-                raise RuntimeError("Downloaded file not found")
-
-            actual_size = target.stat().st_size
-            if self._info.asset_size and actual_size != self._info.asset_size:
-                raise RuntimeError(f"Size mismatch: expected {self._info.asset_size}, got {actual_size}")
-            if actual_size < 1_000_000:
-                raise RuntimeError("Downloaded file too small (<1MB)")
-
-            with open(target, "rb") as fh:
-                header = fh.read(2)
-            if header != b"MZ":
-                raise RuntimeError("Downloaded file is not a valid EXE")
+
+            partial, meta_path = self._partial_paths(self._info.asset_name)
+            self._stats.source = "delta"
+            digest = self._build_from_delta(partial, meta_path, expected_sha256, on_progress, cancel_token)
+            if not digest:
+                self._stats.source = "full"
+                digest = self._fetch_with_retries(
+                    self._info.download_url,
+                    self._info.asset_size,
+                    partial,
+                    meta_path,
+                    on_progress,
+                    cancel_token,
+                )
+                self._validate_download(partial, meta_path, digest, expected_sha256)
+            self._info.sha256 = digest
+
+            shutil.move(str(partial), str(target))
+            self._discard_partial(partial, meta_path)
 
             try:
                 quoted_target = str(target).replace("'", "''")
@@ -350,8 +1340,13 @@ class Updater:
             except Exception:
                 pass
 
+            if stage:
+                self._write_staged_record(target)
             return target
 
+        except DownloadCancelled:
+            self.last_download_cancelled = True
+            return None
         except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError, OSError, ValueError, RuntimeError) as exc:
             self.last_error = str(exc)
             try:
@@ -362,6 +1357,38 @@ class Updater:
             return None
         finally:
             self._downloading = False
+            self._record_download_stats(profile)
+
+    def _record_download_stats(self, profile: str) -> None:
+        if self.last_download_cancelled:
+            outcome = "cancelled"
+        elif self.last_error:
+            outcome = "error"
+        else:
+            outcome = "ok"
+        record = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "version": self._info.version if self._info else "",
+            "profile": profile,
+            "rate_limit": self._throttle.rate,
+            "outcome": outcome,
+            "error": self.last_error,
+            **self._stats.as_record(),
+        }
+        self.last_download_stats = record
+
+        stats_path = self._update_dir() / DOWNLOAD_STATS_FILE
+        try:
+            lines = stats_path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            lines = []
+        lines = lines[-(DOWNLOAD_STATS_KEEP - 1):] + [json.dumps(record, ensure_ascii=False)]
+        try:
+            temp_file = stats_path.with_suffix(".tmp")
+            temp_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            temp_file.replace(stats_path)
+        except OSError:
+            pass
 
     def _check_and_clear_flag(self) -> bool:
         try:
@@ -400,7 +1427,7 @@ class Updater:
         try:
             update_dir = self._update_dir()
             if update_dir.exists():
-                for pattern in ("next-*.exe", "ready-*.flag", "*.tmp", "*.old"):
+                for pattern in ("next-*.exe", "ready-*.flag", "*.tmp", "*.old", f"{SWAP_HELPER_PREFIX}*.exe"):
                     for path in update_dir.glob(pattern):
                         try:
                             path.unlink()
@@ -409,7 +1436,47 @@ class Updater:
         except OSError:
             pass
 
-    def apply_update(self, downloaded_exe: Path) -> bool:
+    def _start_swap(self, source: Path, final_exe: Path, relaunch: bool, keep_source: bool, mark_applied: bool) -> None:
+        current_exe = Path(sys.executable).resolve()
+        current_pid = os.getpid()
+        update_dir = self._update_dir()
+        update_dir.mkdir(parents=True, exist_ok=True)
+
+        plan = SwapPlan(
+            pid=current_pid,
+            source=str(source),
+            final=str(final_exe),
+            flag_file=str(update_dir / "applied.flag") if mark_applied else "",
+            log_file=str(update_dir / "update.log"),
+            ready_file=str(update_dir / f"ready-{int(current_pid)}.flag"),
+            launch_info_file=str(update_dir / "launch-info.txt"),
+            relaunch=relaunch,
+            keep_source=keep_source,
+        )
+        plan_path = update_dir / f"{SWAP_PLAN_PREFIX}{int(current_pid)}.json"
+        plan.save(plan_path)
+
+        # The helper runs from a copy so the running image never locks the file being replaced.
+        helper_exe = update_dir / f"{SWAP_HELPER_PREFIX}{int(current_pid)}.exe"
+        shutil.copyfile(current_exe, helper_exe)
+
+        self._reset_windows_dll_directory()
+
+        subprocess.Popen(
+            [str(helper_exe), APPLY_UPDATE_SWITCH, str(plan_path)],
+            env=sanitized_child_env(),
+            cwd=str(update_dir),
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0x08000000),
+            close_fds=True,
+        )
+
+    def _retain_current_exe(self) -> None:
+        try:
+            self.rollback_cache.store(Path(sys.executable).resolve(), __version__)
+        except OSError:
+            pass
+
+    def apply_update(self, downloaded_exe: Path, relaunch: bool = True) -> bool:
         if not self.is_frozen():
             self.last_error = "Auto-update is available only in packaged EXE build."
             return False
@@ -420,169 +1487,53 @@ class Updater:
                 return False
 
             current_exe = Path(sys.executable).resolve()
-            current_pid = os.getpid()
             update_dir = self._update_dir()
-            update_dir.mkdir(parents=True, exist_ok=True)
             downloaded_exe = downloaded_exe.resolve()
 
-            if downloaded_exe.parent == update_dir and downloaded_exe.name.lower().startswith("next-"):
+            if downloaded_exe.parent == update_dir and downloaded_exe.name.lower().startswith(("next-", STAGED_PREFIX)):
                 final_exe = current_exe
             else:
                 final_exe = current_exe.parent / downloaded_exe.name
 
-            script_path = update_dir / "_binity-update.cmd"
-            flag_file = update_dir / "applied.flag"
-            log_file = update_dir / "update.log"
-            ready_file = update_dir / f"ready-{int(current_pid)}.flag"
-            launch_info_file = update_dir / "launch-info.txt"
-
-            script_template = """@echo off
-setlocal enableextensions
-set "PID=@@PID@@"
-set "CURRENT=@@CURRENT_EXE@@"
-set "DOWNLOADED=@@DOWNLOADED_EXE@@"
-set "FINAL=@@FINAL_EXE@@"
-set "FLAG=@@FLAG_FILE@@"
-set "LOG=@@LOG_FILE@@"
-set "READY=@@READY_FILE@@"
-set "LAUNCH_INFO=@@LAUNCH_INFO_FILE@@"
-set "RUN_TARGET="
-
-set "PYINSTALLER_RESET_ENVIRONMENT=1"
-set "_MEIPASS2="
-set "_PYI_APPLICATION_HOME_DIR="
-set "_PYI_ARCHIVE_FILE="
-set "_PYI_PARENT_PROCESS_LEVEL="
-set "_PYI_SPLASH_IPC="
-
-call :log Updater started
-
-for /L %%A in (1,1,25) do (
-  tasklist /FI "PID eq %PID%" 2>NUL | find "%PID%" >NUL
-  if errorlevel 1 goto wait_done
-  timeout /t 1 /nobreak >NUL
-)
-taskkill /PID %PID% /F >NUL 2>&1
-timeout /t 1 /nobreak >NUL
-
-:wait_done
-if not exist "%DOWNLOADED%" (
-  call :log Downloaded file not found
-  goto cleanup
-)
-
-set "RUN_TARGET=%DOWNLOADED%"
-
-if /I not "%DOWNLOADED%"=="%FINAL%" (
-  call :copy_with_retry "%DOWNLOADED%" "%FINAL%"
-  if errorlevel 1 (
-    call :log Copy to final location failed, fallback to staged executable
-  ) else (
-    set "RUN_TARGET=%FINAL%"
-  )
-) else (
-  set "RUN_TARGET=%FINAL%"
-)
-
-if "%RUN_TARGET%"=="" (
-  call :log Empty run target
-  goto cleanup
-)
-
-if not exist "%RUN_TARGET%" (
-  call :log Run target does not exist: %RUN_TARGET%
-  goto cleanup
-)
-
-call :start_target "%RUN_TARGET%"
-if errorlevel 1 (
-  call :log First launch attempt failed
-  if /I not "%RUN_TARGET%"=="%DOWNLOADED%" if exist "%DOWNLOADED%" (
-    call :log Trying fallback launch from staged executable
-    set "RUN_TARGET=%DOWNLOADED%"
-    call :start_target "%DOWNLOADED%"
-  )
-)
-
-if exist "%READY%" (
-  >"%LAUNCH_INFO%" (
-    echo RUN_TARGET=%RUN_TARGET%
-    echo FINAL=%FINAL%
-  )
-  echo 1>"%FLAG%"
-) else (
-  call :log Ready flag was not received
-)
-
-if /I "%RUN_TARGET%"=="%FINAL%" if /I not "%DOWNLOADED%"=="%FINAL%" (
-  del /F /Q "%DOWNLOADED%" >NUL 2>&1
-)
+            self._retain_current_exe()
+            self._start_swap(downloaded_exe, final_exe, relaunch=relaunch, keep_source=False, mark_applied=True)
+            if relaunch:
+                self.discard_staged_update(keep_file=True)
+            return True
+        except Exception as exc:
+            self.last_error = str(exc)
+            return False
 
-call :log Updater finished
-
-:cleanup
-(goto) 2>NUL & del "%~f0"
-endlocal
-exit /b 0
-
-:log
-set "MSG=%*"
->>"%LOG%" echo [%date% %time%] %MSG%
-exit /b 0
-
-:start_target
-set "TARGET=%~1"
-if "%TARGET%"=="" exit /b 1
-if not exist "%TARGET%" exit /b 1
-if exist "%READY%" del /F /Q "%READY%" >NUL 2>&1
-
-call :log Starting: %TARGET%
-start "" "%TARGET%" --show-after-update --update-ready-flag "%READY%"
-for /L %%R in (1,1,20) do (
-  if exist "%READY%" exit /b 0
-  timeout /t 1 /nobreak >NUL
-)
-exit /b 1
-
-:copy_with_retry
-set "SRC=%~1"
-set "DST=%~2"
-if "%SRC%"=="" exit /b 1
-if "%DST%"=="" exit /b 1
-for /L %%C in (1,1,8) do (
-  copy /Y /B "%SRC%" "%DST%" >NUL
-  if not errorlevel 1 exit /b 0
-  timeout /t 1 /nobreak >NUL
-)
-exit /b 1
-"""
-
-            script = (
-                script_template
-                .replace("@@PID@@", str(int(current_pid)))
-                .replace("@@CURRENT_EXE@@", str(current_exe))
-                .replace("@@DOWNLOADED_EXE@@", str(downloaded_exe))
-                .replace("@@FINAL_EXE@@", str(final_exe))
-                .replace("@@FLAG_FILE@@", str(flag_file))
-                .replace("@@LOG_FILE@@", str(log_file))
-                .replace("@@READY_FILE@@", str(ready_file))
-                .replace("@@LAUNCH_INFO_FILE@@", str(launch_info_file))
-            )
-            script_path.write_text(script, encoding="cp866", errors="ignore")
+    def rollback_target(self) -> RollbackEntry | None:
+        if not self.is_frozen():
+            return None
+        current = self._parse_version(__version__)
+        for entry in self.rollback_cache.entries():
+            if self._parse_version(entry.version) < current:
+                return entry
+        return None
 
-            self._reset_windows_dll_directory()
+    def rollback(self, entry: RollbackEntry) -> bool:
+        if not self.is_frozen():
+            self.last_error = "Rollback is available only in packaged EXE build."
+            return False
 
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = 0
+        try:
+            if not self.rollback_cache.verify(entry):
+                self.rollback_cache.discard(entry)
+                self.last_error = "Cached executable is damaged"
+                return False
 
-            subprocess.Popen(
-                ["cmd", "/c", str(script_path)],
-                env=self._sanitized_child_env(),
-                startupinfo=startupinfo,
-                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0x08000000),
-                close_fds=True,
+            self._retain_current_exe()
+            self.discard_staged_update()
+            self._start_swap(
+                self.rollback_cache.path_for(entry),
+                Path(sys.executable).resolve(),
+                relaunch=True,
+                keep_source=True,
+                mark_applied=False,
             )
+            self.settings.set("rollback_pin_version", f"v{__version__.lstrip('vV')}")
             return True
         except Exception as exc:
             self.last_error = str(exc)
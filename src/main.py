@@ -5,21 +5,26 @@ import os
 import sys
 import traceback
 
+from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QIcon
 from PyQt6.QtWidgets import QApplication, QMessageBox
 
 from src.core.i18n import I18n
-from src.core.resources import resource_path
+from src.core.ipc import IPC_COMMANDS
+from src.core.ipc_server import CommandServer
+from src.core.memory import freeze_startup_objects
+from src.core.profiler import ProfileSession, parse_profile_seconds
+from src.core.resources import log_dir, resource_path
 from src.core.settings import Settings
 from src.core.single_instance import acquire_single_instance_lock
+from src.core.stall_watchdog import HEARTBEAT_INTERVAL_MS, STALL_LOG_FILE, StallWatchdog
+from src.core.updater import Updater
 from src.ui.tray.tray_app import TrayApp
 from src.version import __app_name__
 
 
 def _install_crash_handler() -> None:
-    log_dir = os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "Binity")
-    os.makedirs(log_dir, exist_ok=True)
-    crash_log = os.path.join(log_dir, "crash.log")
+    crash_log = str(log_dir() / "crash.log")
 
     def _handle_exception(exc_type, exc_value, exc_tb):
         if exc_type is KeyboardInterrupt:
@@ -36,6 +41,18 @@ def _install_crash_handler() -> None:
     sys.excepthook = _handle_exception
 
 
+def _install_stall_watchdog(app: QApplication, settings: Settings) -> None:
+    if settings.stall_threshold_ms <= 0:
+        return
+    watchdog = StallWatchdog(log_dir() / STALL_LOG_FILE, settings.stall_threshold_ms / 1000)
+    heartbeat = QTimer(app)
+    heartbeat.timeout.connect(watchdog.heartbeat)
+    heartbeat.start(HEARTBEAT_INTERVAL_MS)
+    watchdog.start()
+    app.aboutToQuit.connect(watchdog.stop)
+    app._stall_watchdog = watchdog  # type: ignore[attr-defined]
+
+
 def _set_windows_app_id() -> None:
     if os.name != "nt":
         return
@@ -98,6 +115,11 @@ def main() -> int:
     _set_windows_app_id()
     show_after_update = _consume_switch("--show-after-update")
     update_ready_flag = _consume_arg("--update-ready-flag")
+    profile_seconds = parse_profile_seconds(_consume_arg("--profile"))
+
+    profiler = ProfileSession(log_dir())
+    if profile_seconds:
+        profiler.start(profile_seconds)
 
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
@@ -123,10 +145,31 @@ def main() -> int:
 
     app._instance_lock = lock  # type: ignore[attr-defined]
 
-    tray_app = TrayApp(settings=settings, i18n=i18n, show_after_update=show_after_update)
+    updater = Updater(settings)
+    if settings.background_update_download and updater.apply_staged_update():
+        return 0
+
+    tray_app = TrayApp(
+        settings=settings,
+        i18n=i18n,
+        show_after_update=show_after_update,
+        updater=updater,
+        profiler=profiler,
+    )
     app._tray_app = tray_app  # type: ignore[attr-defined]
     _write_ready_flag(update_ready_flag)
 
+    command_server = CommandServer(tray_app.handle_command, app)
+    command_server.start()
+    app._command_server = command_server  # type: ignore[attr-defined]
+
+    commands = [arg for arg in sys.argv[1:] if arg in IPC_COMMANDS]
+    if commands:
+        QTimer.singleShot(0, lambda: tray_app.handle_command(commands))
+    QTimer.singleShot(0, freeze_startup_objects)
+    # Armed from the event loop so building the tray and updater is not reported as a stall.
+    QTimer.singleShot(0, lambda: _install_stall_watchdog(app, settings))
+
     return int(app.exec())
 
 
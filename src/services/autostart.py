@@ -1,16 +1,28 @@
 from __future__ import annotations
 
+import ctypes
 import os
 import shlex
 import sys
 from pathlib import Path
 
+from src.core.timing import timed
+
 
 RUN_KEY = r"Software\Microsoft\Windows\CurrentVersion\Run"
 APP_NAME = "Binity"
 
+REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+WAIT_OBJECT_0 = 0
+
 
 class AutostartService:
+    def __init__(self) -> None:
+        self._cached_state: bool | None = None
+        self._legacy_cleanup_done = False
+        self._watch_key = None
+        self._watch_event = None
+
     def _build_command(self) -> str:
         if getattr(sys, "frozen", False):
             return f'"{Path(sys.executable).resolve()}"'
@@ -37,6 +49,10 @@ class AutostartService:
         ]
 
     def _cleanup_legacy_startup_files(self) -> None:
+        if self._legacy_cleanup_done:
+            return
+        self._legacy_cleanup_done = True
+
         for path in self._legacy_startup_paths():
             try:
                 if path.exists():
@@ -44,6 +60,68 @@ class AutostartService:
             except Exception:
                 pass
 
+    def _arm_change_watch(self) -> bool:
+        # A notification fires once per registration; start from fresh handles so none are leaked on re-arm.
+        self._close_watch()
+        try:
+            import winreg
+
+            self._watch_key = winreg.CreateKeyEx(
+                winreg.HKEY_CURRENT_USER,
+                RUN_KEY,
+                0,
+                winreg.KEY_NOTIFY | winreg.KEY_QUERY_VALUE,
+            )
+            create_event = ctypes.windll.kernel32.CreateEventW
+            create_event.restype = ctypes.c_void_p
+            event = create_event(None, False, False, None)
+            if event:
+                self._watch_event = event
+                result = ctypes.windll.advapi32.RegNotifyChangeKeyValue(
+                    ctypes.c_void_p(int(self._watch_key)),
+                    False,
+                    REG_NOTIFY_CHANGE_LAST_SET,
+                    ctypes.c_void_p(self._watch_event),
+                    True,
+                )
+                if result == 0:
+                    return True
+        except Exception:
+            pass
+        self._close_watch()
+        return False
+
+    def _close_watch(self) -> None:
+        key, event = self._watch_key, self._watch_event
+        self._watch_key = None
+        self._watch_event = None
+        if key is not None:
+            try:
+                key.Close()
+            except Exception:
+                pass
+        if event is not None:
+            try:
+                ctypes.windll.kernel32.CloseHandle(ctypes.c_void_p(event))
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        self._close_watch()
+        self._cached_state = None
+
+    def _run_key_changed(self) -> bool:
+        if self._watch_event is None:
+            return True
+        try:
+            signaled = ctypes.windll.kernel32.WaitForSingleObject(ctypes.c_void_p(self._watch_event), 0)
+        except Exception:
+            return True
+        return signaled == WAIT_OBJECT_0
+
+    def invalidate(self) -> None:
+        self._cached_state = None
+
     @staticmethod
     def _extract_executable_path(command: str) -> str:
         tokens = AutostartService._split_command_tokens(command)
@@ -85,14 +163,27 @@ class AutostartService:
                 return False
         return True
 
+    @timed("AutostartService.is_enabled")
     def is_enabled(self) -> bool:
         if os.name != "nt":
             return False
 
-        import winreg
-
         self._cleanup_legacy_startup_files()
 
+        if self._cached_state is not None and not self._run_key_changed():
+            return self._cached_state
+
+        # Re-arm before reading so a write racing with the read still signals the next call.
+        if not self._arm_change_watch():
+            self._cached_state = None
+            return self._read_state()
+
+        self._cached_state = self._read_state()
+        return self._cached_state
+
+    def _read_state(self) -> bool:
+        import winreg
+
         try:
             with winreg.OpenKey(winreg.HKEY_CURRENT_USER, RUN_KEY, 0, winreg.KEY_READ) as key:
                 value, _ = winreg.QueryValueEx(key, APP_NAME)
@@ -127,6 +218,7 @@ class AutostartService:
                         winreg.DeleteValue(key, APP_NAME)
                     except FileNotFoundError:
                         pass
+            self.invalidate()
             if enabled:
                 return self.is_enabled()
             return not self.is_enabled()
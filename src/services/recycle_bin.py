@@ -3,9 +3,13 @@ from __future__ import annotations
 import ctypes
 import os
 import subprocess
+import time
 from dataclasses import dataclass
 from pathlib import Path
 
+from src.core.formatting import format_size
+from src.core.timing import timed
+
 
 SHERB_NOCONFIRMATION = 0x00000001
 SHERB_NOPROGRESSUI = 0x00000002
@@ -40,6 +44,7 @@ class BinClearResult:
     wiped_files: int = 0
     wiped_bytes: int = 0
     wipe_failures: int = 0
+    duration_sec: float = 0.0
 
 
 class RecycleBinService:
@@ -57,16 +62,46 @@ class RecycleBinService:
     )
 
     @staticmethod
-    def get_info() -> RecycleBinInfo:
+    def _query(root_path: str | None) -> RecycleBinInfo | None:
         try:
             info = SHQUERYRBINFO()
             info.cbSize = ctypes.sizeof(info)
-            result = ctypes.windll.shell32.SHQueryRecycleBinW(None, ctypes.byref(info))
+            result = ctypes.windll.shell32.SHQueryRecycleBinW(root_path, ctypes.byref(info))
             if result != 0:
-                return RecycleBinInfo(size_bytes=0, items=0)
+                return None
             return RecycleBinInfo(size_bytes=int(info.i64Size), items=int(info.i64NumItems))
         except Exception:
-            return RecycleBinInfo(size_bytes=0, items=0)
+            return None
+
+    @classmethod
+    @timed("RecycleBinService.get_info")
+    def get_info(cls) -> RecycleBinInfo:
+        return cls._query(None) or RecycleBinInfo(size_bytes=0, items=0)
+
+    @classmethod
+    def get_drive_info(cls) -> dict[str, RecycleBinInfo]:
+        drives: dict[str, RecycleBinInfo] = {}
+        for letter in cls._iter_drive_letters() or []:
+            info = cls._query(f"{letter}:\\")
+            if info is not None:
+                drives[letter] = info
+        return drives
+
+    @classmethod
+    def status(cls, per_drive: bool = False) -> dict:
+        info = cls.get_info()
+        payload = {
+            "items": info.items,
+            "size_bytes": info.size_bytes,
+            "size": format_size(info.size_bytes),
+            "level": cls.level_from_metrics(info.size_bytes, info.items),
+        }
+        if per_drive:
+            payload["drives"] = {
+                letter: {"items": drive.items, "size_bytes": drive.size_bytes}
+                for letter, drive in cls.get_drive_info().items()
+            }
+        return payload
 
     @classmethod
     def get_size_bytes(cls) -> int:
@@ -182,6 +217,7 @@ class RecycleBinService:
                             yield nested
 
     @staticmethod
+    @timed("RecycleBinService._wipe_file")
     def _wipe_file(path: Path, mode: str) -> int:
         try:
             size = int(path.stat().st_size)
@@ -235,6 +271,7 @@ class RecycleBinService:
     @classmethod
     def empty_bin(cls, secure_mode: str = SECURE_DELETE_OFF) -> BinClearResult:
         mode = cls._normalize_secure_mode(secure_mode)
+        started = time.monotonic()
 
         wiped_files = 0
         wiped_bytes = 0
@@ -249,6 +286,7 @@ class RecycleBinService:
             wiped_files=wiped_files,
             wiped_bytes=wiped_bytes,
             wipe_failures=wipe_failures,
+            duration_sec=round(time.monotonic() - started, 3),
         )
 
     @staticmethod
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import os
 
+from src.core.timing import timed
+
 THEME_DARK = "dark"
 THEME_LIGHT = "light"
 
 
 class SystemThemeService:
     @staticmethod
+    @timed("SystemThemeService.get_theme")
     def get_theme() -> str:
         if os.name != "nt":
             return THEME_DARK
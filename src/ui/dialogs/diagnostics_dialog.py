@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QCheckBox,
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from src.core.i18n import I18n
+from src.core.resources import log_dir, resource_path
+from src.core.settings import Settings
+from src.core.timing import TIMINGS
+
+REFRESH_INTERVAL_MS = 1000
+
+
+def _ms(micros: float | None) -> str:
+    return "-" if micros is None else f"{micros / 1000:.3f}"
+
+
+class DiagnosticsDialog(QDialog):
+    """Hidden dialog with the rolling timing histograms; opened with Shift + tray menu."""
+
+    def __init__(self, i18n: I18n, settings: Settings, parent=None) -> None:
+        super().__init__(parent)
+        self.i18n = i18n
+        self.settings = settings
+
+        self.setWindowFlag(Qt.WindowType.WindowContextHelpButtonHint, False)
+        self.setModal(False)
+        self.resize(640, 360)
+
+        app = QApplication.instance()
+        app_icon = app.windowIcon() if app else QIcon()
+        if app_icon.isNull():
+            app_icon = QIcon(resource_path("icons/bin_full.ico"))
+        if not app_icon.isNull():
+            self.setWindowIcon(app_icon)
+
+        root = QVBoxLayout(self)
+        root.setContentsMargins(14, 12, 14, 12)
+        root.setSpacing(10)
+
+        self.collect_check = QCheckBox()
+        self.collect_check.toggled.connect(lambda enabled: self.settings.set("timing_enabled", bool(enabled)))
+        root.addWidget(self.collect_check)
+
+        self.hint_label = QLabel()
+        root.addWidget(self.hint_label)
+
+        self.table = QTableWidget(0, 6)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        root.addWidget(self.table, 1)
+
+        self.status_label = QLabel()
+        self.status_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        root.addWidget(self.status_label)
+
+        buttons = QHBoxLayout()
+        self.reset_btn = QPushButton()
+        self.reset_btn.clicked.connect(self._reset)
+        buttons.addWidget(self.reset_btn)
+
+        self.save_btn = QPushButton()
+        self.save_btn.clicked.connect(self._save_json)
+        buttons.addWidget(self.save_btn)
+
+        buttons.addStretch()
+        self.close_btn = QPushButton()
+        self.close_btn.clicked.connect(self.close)
+        buttons.addWidget(self.close_btn)
+        root.addLayout(buttons)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        self.refresh_texts()
+
+    def refresh_texts(self) -> None:
+        self.setWindowTitle(self.i18n.tr("diagnostics_title"))
+        self.collect_check.setText(self.i18n.tr("timing_collect"))
+        self.hint_label.setText(self.i18n.formatter("timing_hint")(window=TIMINGS.window))
+        self.table.setHorizontalHeaderLabels(
+            [
+                self.i18n.tr("timing_operation"),
+                self.i18n.tr("timing_calls"),
+                "p50",
+                "p90",
+                "p99",
+                self.i18n.tr("timing_max"),
+            ]
+        )
+        self.reset_btn.setText(self.i18n.tr("timing_reset"))
+        self.save_btn.setText(self.i18n.tr("timing_save_json"))
+        self.close_btn.setText(self.i18n.tr("close"))
+
+    def refresh(self) -> None:
+        self.collect_check.blockSignals(True)
+        self.collect_check.setChecked(TIMINGS.enabled)
+        self.collect_check.blockSignals(False)
+
+        snapshot = TIMINGS.snapshot()
+        self.table.setRowCount(len(snapshot))
+        for row, (name, stats) in enumerate(snapshot.items()):
+            values = [
+                name,
+                str(stats.get("total_count", 0)),
+                _ms(stats.get("p50_us")),
+                _ms(stats.get("p90_us")),
+                _ms(stats.get("p99_us")),
+                _ms(stats.get("max_us")),
+            ]
+            for column, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                if column:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+    def _reset(self) -> None:
+        TIMINGS.reset()
+        self.refresh()
+
+    def _save_json(self) -> None:
+        path = log_dir() / f"timings-{datetime.now():%Y%m%d-%H%M%S}.json"
+        try:
+            TIMINGS.dump_json(path)
+        except OSError as exc:
+            self.status_label.setText(str(exc))
+            return
+        self.status_label.setText(self.i18n.formatter("timing_saved")(path=path))
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start(REFRESH_INTERVAL_MS)
+
+    def hideEvent(self, event) -> None:
+        self.refresh_timer.stop()
+        super().hideEvent(event)
@@ -1,18 +1,24 @@
 from __future__ import annotations
 
-import re
+import time
 from pathlib import Path
 from typing import Dict
 
-from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, pyqtSignal
+from PyQt6.QtCore import QObject, QRunnable, QThread, QThreadPool, QTimer, Qt, pyqtSignal
 from PyQt6.QtGui import QAction, QActionGroup, QIcon
 from PyQt6.QtWidgets import QApplication, QDialog, QMenu, QMessageBox, QProgressDialog, QSystemTrayIcon
 
 from src.core.formatting import format_size
 from src.core.i18n import I18n
-from src.core.resources import resource_path
+from src.core.memory import trim_working_set
+from src.core.metrics import DURATION_BUCKETS_SEC, MetricsRegistry, MetricsServer
+from src.core.profiler import PROFILE_DEFAULT_SEC, ProfileSession, parse_profile_seconds
+from src.core.release_notes import format_release_notes
+from src.core.resources import log_dir, resource_path
 from src.core.settings import Settings
-from src.core.updater import UpdateInfo, Updater
+from src.core.settings_watcher import SettingsWatcher
+from src.core.timing import TIMINGS
+from src.core.updater import CancelToken, DownloadProgress, UpdateInfo, Updater
 from src.services.autostart import AutostartService
 from src.services.recycle_bin import (
     BinClearResult,
@@ -26,10 +32,12 @@ from src.services.sound import SOUND_OFF, SOUND_PAPER, SOUND_TRASH, SOUND_WINDOW
 from src.services.system_theme import SystemThemeService
 from src.ui.dialogs.about_dialog import AboutDialog
 from src.ui.dialogs.confirm_dialog import ConfirmDialog
+from src.ui.dialogs.diagnostics_dialog import DiagnosticsDialog
 
 OPEN_ACTION = "open"
 CLEAR_ACTION = "clear"
 UPDATE_TIMER_INTERVAL_MS = 30 * 60 * 1000
+IDLE_RELEASE_MS = 5 * 60 * 1000
 
 ICON_MAP = {
     0: "icons/bin_0.ico",
@@ -58,6 +66,22 @@ class _ClearBinTask(QRunnable):
         self.signals.finished.emit(result)
 
 
+class _DriveMetricsTaskSignals(QObject):
+    finished = pyqtSignal(object)
+
+
+class _DriveMetricsTask(QRunnable):
+    """Queries the per-drive bins off the GUI thread for the metrics endpoint."""
+
+    def __init__(self, recycle_bin: RecycleBinService) -> None:
+        super().__init__()
+        self.service = recycle_bin
+        self.signals = _DriveMetricsTaskSignals()
+
+    def run(self) -> None:
+        self.signals.finished.emit(self.service.get_drive_info())
+
+
 class _UpdateCheckTaskSignals(QObject):
     finished = pyqtSignal(object, str, bool)
 
@@ -71,55 +95,82 @@ class _UpdateCheckTask(QRunnable):
         self.signals = _UpdateCheckTaskSignals()
 
     def run(self) -> None:
-        info = self.updater.check_for_update(force=self.force)
+        info = self.updater.check_for_update(force=self.force, manual=self.manual)
         error = str(self.updater.last_error or "")
         self.signals.finished.emit(info, error, self.manual)
 
 
 class _UpdateDownloadTaskSignals(QObject):
-    progress = pyqtSignal(int)
+    progress = pyqtSignal(object)
     finished = pyqtSignal(str, str)
 
 
 class _UpdateDownloadTask(QRunnable):
-    def __init__(self, updater: Updater) -> None:
+    def __init__(self, updater: Updater, background: bool = False) -> None:
         super().__init__()
         self.updater = updater
+        self.background = bool(background)
+        self.cancel_token = CancelToken()
         self.signals = _UpdateDownloadTaskSignals()
 
     def run(self) -> None:
-        downloaded = self.updater.download_update(on_progress=self.signals.progress.emit)
+        thread = QThread.currentThread()
+        previous_priority = thread.priority()
+        if self.background:
+            thread.setPriority(QThread.Priority.LowestPriority)
+        try:
+            downloaded = self.updater.download_update(
+                on_progress=self.signals.progress.emit,
+                cancel_token=self.cancel_token,
+                stage=self.background,
+            )
+        finally:
+            if self.background:
+                thread.setPriority(previous_priority)
         downloaded_path = str(downloaded) if downloaded else ""
         error = str(self.updater.last_error or "")
         self.signals.finished.emit(downloaded_path, error)
 
 
 class TrayApp(QObject):
-    def __init__(self, settings: Settings, i18n: I18n, show_after_update: bool = False) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        i18n: I18n,
+        show_after_update: bool = False,
+        updater: Updater | None = None,
+        profiler: ProfileSession | None = None,
+    ) -> None:
         super().__init__()
         self.settings = settings
         self.i18n = i18n
+        TIMINGS.enabled = self.settings.timing_enabled
 
         self.recycle_bin = RecycleBinService()
         self.autostart = AutostartService()
         self.sound_service = SoundService()
         self.theme_service = SystemThemeService()
-        self.updater = Updater(settings)
+        self.updater = updater or Updater(settings)
+        self.profiler = profiler or ProfileSession(log_dir())
 
         self.current_theme = self.theme_service.get_theme()
         self.icons = self._load_icons(self.current_theme)
         self.current_level = -1
+        self._last_tooltip = ""
 
         self.tray = QSystemTrayIcon(self)
         self.tray.activated.connect(self._on_tray_activated)
 
         self._about_dialog: AboutDialog | None = None
         self._confirm_dialog: ConfirmDialog | None = None
+        self._diagnostics_dialog: DiagnosticsDialog | None = None
         self._clear_in_progress = False
         self._clear_task: _ClearBinTask | None = None
+        self._drive_metrics_task: _DriveMetricsTask | None = None
 
         self._update_check_in_progress = False
         self._update_download_in_progress = False
+        self._update_download_background = False
         self._update_check_task: _UpdateCheckTask | None = None
         self._update_download_task: _UpdateDownloadTask | None = None
         self._update_progress_dialog: QProgressDialog | None = None
@@ -128,8 +179,13 @@ class TrayApp(QObject):
         self._overflow_notified = False
         self._thread_pool = QThreadPool.globalInstance()
 
+        self.metrics = MetricsRegistry()
+        self.metrics_server = MetricsServer(self.metrics)
+        self._sync_metrics_server()
+
         self._build_menu()
         self._apply_menu_state()
+        self._subscribe_settings()
         self._update_texts()
 
         self._refresh_state()
@@ -144,6 +200,21 @@ class TrayApp(QObject):
         self.update_timer.start(UPDATE_TIMER_INTERVAL_MS)
         QTimer.singleShot(5000, lambda: self._check_for_updates(force=True, manual=False))
 
+        self.profile_timer = QTimer(self)
+        self.profile_timer.setSingleShot(True)
+        self.profile_timer.timeout.connect(self.stop_profiling)
+        if self.profiler.active:
+            self.profile_timer.start(int(self.profiler.remaining_sec() * 1000))
+            self._sync_profiling_action()
+
+        self.settings_watcher = SettingsWatcher(self.settings, self)
+
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self.release_idle_resources)
+        self.menu.aboutToShow.connect(self._mark_activity)
+        self._mark_activity()
+
         if show_after_update or self.updater.just_updated:
             QTimer.singleShot(
                 1800,
@@ -323,6 +394,11 @@ class TrayApp(QObject):
         self.auto_updates_action.toggled.connect(self._on_auto_updates_toggled)
         self.settings_menu.addAction(self.auto_updates_action)
 
+        self.background_updates_action = QAction(self.settings_menu)
+        self.background_updates_action.setCheckable(True)
+        self.background_updates_action.toggled.connect(self._on_background_updates_toggled)
+        self.settings_menu.addAction(self.background_updates_action)
+
         self.menu.addMenu(self.settings_menu)
 
         self.check_updates_action = QAction(self.menu)
@@ -334,8 +410,24 @@ class TrayApp(QObject):
         self.update_now_action.setVisible(False)
         self.menu.addAction(self.update_now_action)
 
+        self.rollback_action = QAction(self.menu)
+        self.rollback_action.triggered.connect(self._confirm_rollback)
+        self.rollback_action.setVisible(False)
+        self.menu.addAction(self.rollback_action)
+
         self.menu.addSeparator()
 
+        self.diagnostics_action = QAction(self.menu)
+        self.diagnostics_action.triggered.connect(self.show_diagnostics)
+        self.diagnostics_action.setVisible(False)
+        self.menu.addAction(self.diagnostics_action)
+        self.profiling_action = QAction(self.menu)
+        self.profiling_action.setCheckable(True)
+        self.profiling_action.toggled.connect(self._on_profiling_toggled)
+        self.profiling_action.setVisible(False)
+        self.menu.addAction(self.profiling_action)
+        self.menu.aboutToShow.connect(self._reveal_hidden_actions)
+
         self.about_action = QAction(self.menu)
         self.about_action.triggered.connect(self.show_about)
         self.menu.addAction(self.about_action)
@@ -346,45 +438,84 @@ class TrayApp(QObject):
 
         self.tray.setContextMenu(self.menu)
 
+    def _subscribe_settings(self) -> None:
+        self.settings.subscribe("confirm_clear", lambda _key, _value: self._sync_confirm_action())
+        self.settings.subscribe("double_click_action", lambda _key, _value: self._sync_double_click_actions())
+        self.settings.subscribe("language", lambda _key, _value: self._on_language_changed())
+        self.settings.subscribe("clear_sound", lambda _key, _value: self._sync_sound_actions())
+        self.settings.subscribe("secure_delete_mode", lambda _key, _value: self._sync_secure_delete_actions())
+        self.settings.subscribe("overflow_notify_enabled", lambda _key, _value: self._on_overflow_notify_changed())
+        self.settings.subscribe("theme_sync", lambda _key, _value: self._on_theme_sync_changed())
+        self.settings.subscribe("auto_check_updates", lambda _key, _value: self._on_auto_updates_changed())
+        self.settings.subscribe("update_interval_sec", lambda _key, _value: self._on_update_interval_changed())
+        self.settings.subscribe(
+            "background_update_download",
+            lambda _key, _value: self._sync_background_updates_action(),
+        )
+        self.settings.subscribe("metrics_enabled", lambda _key, _value: self._sync_metrics_server())
+        self.settings.subscribe("timing_enabled", lambda _key, value: setattr(TIMINGS, "enabled", bool(value)))
+        self.settings.subscribe("metrics_port", lambda _key, _value: self._sync_metrics_server())
+
     def _apply_menu_state(self) -> None:
-        self.confirm_action.blockSignals(True)
-        self.confirm_action.setChecked(self.settings.confirm_clear)
-        self.confirm_action.blockSignals(False)
+        self._sync_confirm_action()
+        self._sync_double_click_actions()
+        self._sync_language_actions()
+        self._sync_autostart_action()
+        self._sync_sound_actions()
+        self._sync_secure_delete_actions()
+        self._sync_overflow_notify_action()
+        self._sync_theme_sync_action()
+        self._sync_auto_updates_action()
+        self._sync_background_updates_action()
+
+    @staticmethod
+    def _set_checked_silently(action: QAction, checked: bool) -> None:
+        if action.isChecked() == checked:
+            return
+        action.blockSignals(True)
+        action.setChecked(checked)
+        action.blockSignals(False)
+
+    def _sync_confirm_action(self) -> None:
+        self._set_checked_silently(self.confirm_action, self.settings.confirm_clear)
 
+    def _sync_double_click_actions(self) -> None:
         current_action = self.settings.double_click_action
         self.double_click_open_action.setChecked(current_action == OPEN_ACTION)
         self.double_click_clear_action.setChecked(current_action == CLEAR_ACTION)
 
+    def _sync_language_actions(self) -> None:
         current_language = self.settings.language
         self.language_ru_action.setChecked(current_language == "RU")
         self.language_en_action.setChecked(current_language == "EN")
 
-        self.autostart_action.blockSignals(True)
-        self.autostart_action.setChecked(self.autostart.is_enabled())
-        self.autostart_action.blockSignals(False)
+    def _sync_autostart_action(self) -> None:
+        self._set_checked_silently(self.autostart_action, self.autostart.is_enabled())
 
+    def _sync_sound_actions(self) -> None:
         sound_mode = self.settings.clear_sound
         self.sound_off_action.setChecked(sound_mode == SOUND_OFF)
         self.sound_windows_action.setChecked(sound_mode == SOUND_WINDOWS)
         self.sound_paper_action.setChecked(sound_mode == SOUND_PAPER)
         self.sound_trash_action.setChecked(sound_mode == SOUND_TRASH)
 
+    def _sync_secure_delete_actions(self) -> None:
         secure_mode = self.settings.secure_delete_mode
         self.secure_delete_off_action.setChecked(secure_mode == SECURE_DELETE_OFF)
         self.secure_delete_zero_action.setChecked(secure_mode == SECURE_DELETE_ZERO)
         self.secure_delete_random_action.setChecked(secure_mode == SECURE_DELETE_RANDOM)
 
-        self.overflow_notify_action.blockSignals(True)
-        self.overflow_notify_action.setChecked(self.settings.overflow_notify_enabled)
-        self.overflow_notify_action.blockSignals(False)
+    def _sync_overflow_notify_action(self) -> None:
+        self._set_checked_silently(self.overflow_notify_action, self.settings.overflow_notify_enabled)
 
-        self.theme_sync_action.blockSignals(True)
-        self.theme_sync_action.setChecked(self.settings.theme_sync)
-        self.theme_sync_action.blockSignals(False)
+    def _sync_theme_sync_action(self) -> None:
+        self._set_checked_silently(self.theme_sync_action, self.settings.theme_sync)
 
-        self.auto_updates_action.blockSignals(True)
-        self.auto_updates_action.setChecked(self.settings.auto_check_updates)
-        self.auto_updates_action.blockSignals(False)
+    def _sync_auto_updates_action(self) -> None:
+        self._set_checked_silently(self.auto_updates_action, self.settings.auto_check_updates)
+
+    def _sync_background_updates_action(self) -> None:
+        self._set_checked_silently(self.background_updates_action, self.settings.background_update_download)
 
     def _update_texts(self) -> None:
         self.open_action.setText(self.i18n.tr("open_bin"))
@@ -419,17 +550,23 @@ class TrayApp(QObject):
         self.theme_sync_action.setText(self.i18n.tr("theme_sync"))
 
         self.auto_updates_action.setText(self.i18n.tr("auto_check_updates"))
+        self.background_updates_action.setText(self.i18n.tr("background_update_download"))
         self.check_updates_action.setText(self.i18n.tr("check_updates"))
 
+        self.diagnostics_action.setText(self.i18n.tr("diagnostics"))
+        self._sync_profiling_action()
         self.about_action.setText(self.i18n.tr("about"))
         self.exit_action.setText(self.i18n.tr("exit"))
 
         self._refresh_update_action_text()
+        self._refresh_rollback_action()
 
         if self._about_dialog and self._about_dialog.isVisible():
             self._about_dialog.refresh_texts()
         if self._confirm_dialog and self._confirm_dialog.isVisible():
             self._confirm_dialog.refresh_texts()
+        if self._diagnostics_dialog and self._diagnostics_dialog.isVisible():
+            self._diagnostics_dialog.refresh_texts()
 
     def _refresh_update_action_text(self) -> None:
         if self._update_download_in_progress:
@@ -495,14 +632,15 @@ class TrayApp(QObject):
             dialog.setWindowModality(Qt.WindowModality.NonModal)
             dialog.setAutoClose(False)
             dialog.setAutoReset(False)
-            dialog.setCancelButton(None)
             dialog.setMinimumDuration(0)
+            dialog.canceled.connect(self._cancel_update_download)
             window_icon = self._window_icon()
             if not window_icon.isNull():
                 dialog.setWindowIcon(window_icon)
             self._update_progress_dialog = dialog
 
         self._update_progress_dialog.setWindowTitle(self.i18n.tr("update_dialog_title"))
+        self._update_progress_dialog.setCancelButtonText(self.i18n.tr("cancel"))
         self._update_progress_dialog.setLabelText(self.i18n.tr("update_downloading_progress").format(percent=0))
         self._update_progress_dialog.setValue(0)
         self._update_progress_dialog.setMinimumWidth(350)
@@ -515,44 +653,6 @@ class TrayApp(QObject):
         self._update_progress_dialog.deleteLater()
         self._update_progress_dialog = None
 
-    @staticmethod
-    def _format_release_notes(raw: str) -> str:
-        text = str(raw or "").strip()
-        if not text:
-            return "-"
-
-        lines = []
-        for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
-            current = line.rstrip()
-            if not current.strip():
-                lines.append("")
-                continue
-
-            current = re.sub(r"^\s{0,3}#{1,6}\s*", "", current)
-            bullet = bool(re.match(r"^\s*[-*+]\s+", current))
-            if bullet:
-                current = re.sub(r"^\s*[-*+]\s+", "", current)
-
-            current = re.sub(r"!\[([^\]]*)\]\(([^)]+)\)", r"\1", current)
-            current = re.sub(r"\[([^\]]+)\]\((https?://[^)]+)\)", r"\1 (\2)", current)
-            current = re.sub(r"`([^`]*)`", r"\1", current)
-            current = current.replace("**", "").replace("__", "")
-            current = re.sub(r"~~([^~]+)~~", r"\1", current)
-            current = current.strip()
-
-            if bullet and current:
-                current = f"- {current}"
-            lines.append(current)
-
-        normalized = "\n".join(lines)
-        normalized = re.sub(r"\n{3,}", "\n\n", normalized).strip()
-
-        normalized = re.sub(r"\*\*(.*?)\*\*", r"\1", normalized)  # Bold
-        normalized = re.sub(r"__(.*?)__", r"\1", normalized)      # Bold
-        normalized = re.sub(r"\*(.*?)\*", r"\1", normalized)      # Italic
-        normalized = re.sub(r"_(.*?)_", r"\1", normalized)        # Italic
-        return normalized or "-"
-
     def _show_post_update_notification(self) -> None:
         if self.updater.launched_from_fallback_path:
             self.tray.showMessage(
@@ -606,7 +706,45 @@ class TrayApp(QObject):
         else:
             self._overflow_notified = False
 
+    def _sync_metrics_server(self) -> None:
+        if not self.settings.metrics_enabled:
+            self.metrics_server.stop()
+            return
+        if self.metrics_server.running and self.metrics_server.port == self.settings.metrics_port:
+            return
+        self.metrics_server.start(self.settings.metrics_port)
+
+    def _record_bin_metrics(self, items: int, size_bytes: int) -> None:
+        self.metrics.set_gauge("binity_bin_items", items, "Items in the Recycle Bin across all drives")
+        self.metrics.set_gauge("binity_bin_size_bytes", size_bytes, "Recycle Bin size across all drives")
+
+    def _start_drive_metrics_task(self) -> None:
+        # One shell query per drive: refreshed on a worker at the tick cadence so scrapes stay in memory.
+        if self._drive_metrics_task is not None:
+            return
+        task = _DriveMetricsTask(self.recycle_bin)
+        task.signals.finished.connect(self._on_drive_metrics_finished)
+        self._drive_metrics_task = task
+        self._thread_pool.start(task)
+
+    def _on_drive_metrics_finished(self, drives_obj: object) -> None:
+        self._drive_metrics_task = None
+        drives = drives_obj if isinstance(drives_obj, dict) else {}
+        self.metrics.replace_gauge(
+            "binity_drive_bin_items",
+            {letter: info.items for letter, info in drives.items()},
+            "drive",
+            "Items in the Recycle Bin per drive",
+        )
+        self.metrics.replace_gauge(
+            "binity_drive_bin_size_bytes",
+            {letter: info.size_bytes for letter, info in drives.items()},
+            "drive",
+            "Recycle Bin size per drive",
+        )
+
     def _refresh_state(self) -> None:
+        started = time.perf_counter()
         self._sync_system_theme()
 
         info = self.recycle_bin.get_info()
@@ -615,15 +753,24 @@ class TrayApp(QObject):
             self.current_level = level
             self.tray.setIcon(self.icons.get(level, self.icons[0]))
 
-        tooltip = self.i18n.tr("tooltip_template").format(size=format_size(info.size_bytes))
-        self.tray.setToolTip(tooltip)
+        tooltip = self.i18n.formatter("tooltip_template")(size=format_size(info.size_bytes))
+        if tooltip != self._last_tooltip:
+            self._last_tooltip = tooltip
+            self.tray.setToolTip(tooltip)
 
-        self.autostart_action.blockSignals(True)
-        self.autostart_action.setChecked(self.autostart.is_enabled())
-        self.autostart_action.blockSignals(False)
+        self._sync_autostart_action()
 
         self._handle_overflow_notification(info.size_bytes)
 
+        if self.metrics_server.running:
+            self.metrics.observe(
+                "binity_refresh_duration_seconds",
+                time.perf_counter() - started,
+                "Time spent in one tray refresh tick",
+            )
+            self._record_bin_metrics(info.items, info.size_bytes)
+            self._start_drive_metrics_task()
+
     def _on_confirm_toggled(self, enabled: bool) -> None:
         self.settings.set("confirm_clear", bool(enabled))
 
@@ -631,13 +778,11 @@ class TrayApp(QObject):
         if action not in (OPEN_ACTION, CLEAR_ACTION):
             return
         self.settings.set("double_click_action", action)
-        self._apply_menu_state()
 
     def _set_clear_sound(self, mode: str) -> None:
         if mode not in (SOUND_OFF, SOUND_WINDOWS, SOUND_PAPER, SOUND_TRASH):
             return
         self.settings.set("clear_sound", mode)
-        self._apply_menu_state()
 
     def _set_secure_delete_mode(self, mode: str) -> None:
         if mode not in SECURE_DELETE_MODES:
@@ -645,11 +790,10 @@ class TrayApp(QObject):
 
         current_mode = self.settings.secure_delete_mode
         if current_mode == mode:
-            self._apply_menu_state()
+            self._sync_secure_delete_actions()
             return
 
         self.settings.set("secure_delete_mode", mode)
-        self._apply_menu_state()
 
         if mode != SECURE_DELETE_OFF and not self.settings.secure_delete_info_ack:
             info_box = self._build_message_box(
@@ -670,23 +814,40 @@ class TrayApp(QObject):
 
     def _on_overflow_notify_toggled(self, enabled: bool) -> None:
         self.settings.set("overflow_notify_enabled", bool(enabled))
-        if not enabled:
+
+    def _on_overflow_notify_changed(self) -> None:
+        self._sync_overflow_notify_action()
+        if not self.settings.overflow_notify_enabled:
             self._overflow_notified = False
 
     def _on_theme_sync_toggled(self, enabled: bool) -> None:
         self.settings.set("theme_sync", bool(enabled))
-        if enabled:
+
+    def _on_theme_sync_changed(self) -> None:
+        self._sync_theme_sync_action()
+        if self.settings.theme_sync:
             self._sync_system_theme()
 
     def _on_auto_updates_toggled(self, enabled: bool) -> None:
         self.settings.set("auto_check_updates", bool(enabled))
-        if enabled:
+
+    def _on_auto_updates_changed(self) -> None:
+        self._sync_auto_updates_action()
+        if self.settings.auto_check_updates:
             self._schedule_auto_update_check()
 
+    def _on_background_updates_toggled(self, enabled: bool) -> None:
+        self.settings.set("background_update_download", bool(enabled))
+
+    def _on_update_interval_changed(self) -> None:
+        self.timer.setInterval(self.settings.update_interval_sec * 1000)
+
     def _set_language(self, language: str) -> None:
         self.settings.set("language", language)
-        self.i18n.set_language(language)
-        self._apply_menu_state()
+
+    def _on_language_changed(self) -> None:
+        self.i18n.set_language(self.settings.language)
+        self._sync_language_actions()
         self._update_texts()
         self._refresh_state()
 
@@ -694,7 +855,7 @@ class TrayApp(QObject):
         success = self.autostart.set_enabled(bool(enabled))
         if not success:
             self._show_error(self.i18n.tr("autostart_disabled"))
-            self._apply_menu_state()
+            self._sync_autostart_action()
             return
 
         message = self.i18n.tr("autostart_enabled") if enabled else self.i18n.tr("autostart_disabled")
@@ -755,6 +916,7 @@ class TrayApp(QObject):
         self._clear_task = None
 
         result = result_obj if isinstance(result_obj, BinClearResult) else BinClearResult(False, SECURE_DELETE_OFF)
+        self._record_clear_metrics(result)
         if not result.success:
             self._show_error(self.i18n.tr("error_empty_failed"))
             return
@@ -772,6 +934,29 @@ class TrayApp(QObject):
 
         self.tray.showMessage(self.i18n.tr("app_name"), message, QSystemTrayIcon.MessageIcon.Information, 3500)
         self._refresh_state()
+        self._mark_activity()
+
+    def _record_clear_metrics(self, result: BinClearResult) -> None:
+        labels = {"mode": result.secure_mode, "outcome": "ok" if result.success else "error"}
+        self.metrics.inc("binity_empty_total", 1, "Recycle Bin empty operations", labels)
+        self.metrics.observe(
+            "binity_empty_duration_seconds",
+            result.duration_sec,
+            "Duration of emptying the Recycle Bin, including any secure wipe",
+            DURATION_BUCKETS_SEC,
+            {"mode": result.secure_mode},
+        )
+        if result.secure_mode == SECURE_DELETE_OFF:
+            return
+        self.metrics.inc("binity_wipe_bytes_total", result.wiped_bytes, "Bytes overwritten by secure wipes")
+        self.metrics.inc("binity_wipe_files_total", result.wiped_files, "Files overwritten by secure wipes")
+        self.metrics.inc("binity_wipe_failures_total", result.wipe_failures, "Files that could not be wiped")
+        if result.duration_sec > 0:
+            self.metrics.set_gauge(
+                "binity_wipe_last_bytes_per_second",
+                result.wiped_bytes / result.duration_sec,
+                "Throughput of the last secure wipe",
+            )
 
     def _schedule_auto_update_check(self) -> None:
         if not self.settings.auto_check_updates:
@@ -805,9 +990,16 @@ class TrayApp(QObject):
             self.check_updates_action.setEnabled(True)
 
         info = info_obj if isinstance(info_obj, UpdateInfo) else None
+        outcome = "available" if info else "error" if error else "none"
+        self.metrics.inc("binity_update_checks_total", 1, "Update checks by outcome", {"outcome": outcome})
         self._refresh_update_action_text()
 
         if info:
+            if not manual and self.settings.background_update_download:
+                if info.version != self._update_notified_version and not self._update_download_in_progress:
+                    self._update_notified_version = info.version
+                    self._start_update_download(background=True)
+                return
             if info.version != self._update_notified_version:
                 self._update_notified_version = info.version
                 self.tray.showMessage(
@@ -839,7 +1031,7 @@ class TrayApp(QObject):
             self._check_for_updates(force=True, manual=True)
             return
 
-        release_notes = self._format_release_notes(self.updater.update_body)
+        release_notes = format_release_notes(self.updater.update_body)
         msg = self._build_message_box(
             QMessageBox.Icon.Information,
             self.i18n.tr("update_dialog_title"),
@@ -873,43 +1065,125 @@ class TrayApp(QObject):
             self._update_notified_version = ""
             self._refresh_update_action_text()
 
-    def _start_update_download(self) -> None:
+    def _refresh_rollback_action(self) -> None:
+        entry = self.updater.rollback_target()
+        self.rollback_action.setVisible(entry is not None)
+        if entry is not None:
+            self.rollback_action.setText(self.i18n.formatter("rollback_to")(version=entry.version.lstrip("vV")))
+
+    def _confirm_rollback(self) -> None:
+        if self._update_download_in_progress:
+            return
+        entry = self.updater.rollback_target()
+        if entry is None:
+            self._refresh_rollback_action()
+            return
+
+        msg = self._build_message_box(
+            QMessageBox.Icon.Question,
+            self.i18n.tr("update_dialog_title"),
+            self.i18n.tr("rollback_confirm").format(version=entry.version.lstrip("vV")),
+        )
+        btn_rollback = msg.addButton(self.i18n.tr("rollback_button"), QMessageBox.ButtonRole.AcceptRole)
+        msg.addButton(self.i18n.tr("cancel"), QMessageBox.ButtonRole.RejectRole)
+        msg.exec()
+        if msg.clickedButton() != btn_rollback:
+            return
+
+        if not self.updater.rollback(entry):
+            message = self.i18n.tr("error_rollback")
+            if self.updater.last_error:
+                message = f"{message}\n{self.updater.last_error}"
+            self._refresh_rollback_action()
+            self._show_error(message)
+            return
+
+        self.quit_app()
+
+    def _start_update_download(self, background: bool = False) -> None:
         if self._update_download_in_progress:
             return
         if not self.updater.has_update:
             return
 
         self._update_download_in_progress = True
+        self._update_download_background = bool(background)
         self.check_updates_action.setEnabled(False)
         self.update_now_action.setVisible(True)
         self.update_now_action.setEnabled(False)
         self.update_now_action.setText(self.i18n.tr("update_downloading_progress").format(percent=0))
-        self._show_update_progress_dialog()
 
-        self.tray.showMessage(
-            self.i18n.tr("app_name"),
-            self.i18n.tr("update_downloading"),
-            QSystemTrayIcon.MessageIcon.Information,
-            2000,
-        )
+        if not background:
+            self._show_update_progress_dialog()
+            self.tray.showMessage(
+                self.i18n.tr("app_name"),
+                self.i18n.tr("update_downloading"),
+                QSystemTrayIcon.MessageIcon.Information,
+                2000,
+            )
 
-        task = _UpdateDownloadTask(self.updater)
+        task = _UpdateDownloadTask(self.updater, background=background)
         task.signals.progress.connect(self._on_update_download_progress)
         task.signals.finished.connect(self._on_update_download_finished)
         self._update_download_task = task
         self._thread_pool.start(task)
 
-    def _on_update_download_progress(self, percent: int) -> None:
-        self.update_now_action.setText(self.i18n.tr("update_downloading_progress").format(percent=percent))
-        if self._update_progress_dialog is not None:
-            self._update_progress_dialog.setLabelText(self.i18n.tr("update_downloading_progress").format(percent=percent))
-            self._update_progress_dialog.setValue(max(0, min(100, int(percent))))
+    def _on_update_download_progress(self, progress: DownloadProgress) -> None:
+        label = self.i18n.formatter("update_downloading_progress")(percent=progress.percent)
+        self.update_now_action.setText(label)
+        if self._update_progress_dialog is None:
+            return
+
+        details = []
+        if progress.bytes_per_sec > 0:
+            eta_min, eta_sec = divmod(int(progress.eta_sec), 60)
+            details.append(
+                self.i18n.formatter("update_download_speed")(
+                    speed=format_size(int(progress.bytes_per_sec)),
+                    eta=f"{eta_min}:{eta_sec:02d}",
+                )
+            )
+        if progress.retries:
+            details.append(self.i18n.formatter("update_download_retries")(count=progress.retries))
+        if details:
+            label = "\n".join([label, *details])
+        self._update_progress_dialog.setLabelText(label)
+        self._update_progress_dialog.setValue(progress.percent)
+
+    def _cancel_update_download(self) -> None:
+        if self._update_download_task is not None:
+            self._update_download_task.cancel_token.cancel()
 
     def _on_update_download_finished(self, downloaded_path: str, error: str) -> None:
+        background = self._update_download_background
         self._update_download_in_progress = False
+        self._update_download_background = False
         self._update_download_task = None
         self.check_updates_action.setEnabled(True)
         self._close_update_progress_dialog()
+        self._record_download_metrics()
+        self._mark_activity()
+
+        if background:
+            self._refresh_update_action_text()
+            if downloaded_path:
+                self.tray.showMessage(
+                    self.i18n.tr("app_name"),
+                    self.i18n.tr("update_staged").format(version=self.updater.update_version),
+                    QSystemTrayIcon.MessageIcon.Information,
+                    4200,
+                )
+            return
+
+        if self.updater.last_download_cancelled:
+            self._refresh_update_action_text()
+            self.tray.showMessage(
+                self.i18n.tr("app_name"),
+                self.i18n.tr("update_download_cancelled"),
+                QSystemTrayIcon.MessageIcon.Information,
+                2500,
+            )
+            return
 
         if not downloaded_path:
             message = self.i18n.tr("error_update_download")
@@ -936,7 +1210,54 @@ class TrayApp(QObject):
 
         self.quit_app()
 
+    def _record_download_metrics(self) -> None:
+        stats = self.updater.last_download_stats
+        if not stats:
+            return
+        labels = {"profile": str(stats.get("profile", "")), "outcome": str(stats.get("outcome", ""))}
+        self.metrics.inc("binity_update_downloads_total", 1, "Update downloads by profile and outcome", labels)
+        self.metrics.inc("binity_update_download_bytes_total", stats.get("bytes", 0), "Bytes received for updates")
+        self.metrics.observe(
+            "binity_update_download_duration_seconds",
+            float(stats.get("duration_sec", 0.0)),
+            "Duration of update downloads",
+            DURATION_BUCKETS_SEC,
+        )
+
+    def handle_command(self, argv: list[str]) -> dict:
+        command = argv[0].lower() if argv else ""
+        if command == "status":
+            return {"ok": True, **self.recycle_bin.status(per_drive="--drives" in argv)}
+        if command == "--profile":
+            seconds = parse_profile_seconds(argv[1] if len(argv) > 1 else "")
+            if not seconds:
+                return {"ok": False, "error": "--profile expects a number of seconds"}
+            QTimer.singleShot(0, lambda: self.start_profiling(seconds))
+            return {"ok": True}
+
+        actions = {
+            "": self._notify_already_running,
+            "open": self.open_bin,
+            "empty": self.clear_bin,
+            "show-about": self.show_about,
+        }
+        action = actions.get(command)
+        if action is None:
+            return {"ok": False, "error": f"Unknown command: {command}"}
+        # Replying first keeps the caller from waiting on modal dialogs.
+        QTimer.singleShot(0, action)
+        return {"ok": True}
+
+    def _notify_already_running(self) -> None:
+        self.tray.showMessage(
+            self.i18n.tr("app_name"),
+            self.i18n.tr("already_running"),
+            QSystemTrayIcon.MessageIcon.Information,
+            2500,
+        )
+
     def show_about(self) -> None:
+        self._mark_activity()
         if self._about_dialog is None:
             self._about_dialog = AboutDialog(self.i18n, theme=self.current_theme)
 
@@ -946,10 +1267,84 @@ class TrayApp(QObject):
         self._about_dialog.raise_()
         self._about_dialog.activateWindow()
 
+    def _mark_activity(self) -> None:
+        self.idle_timer.start(IDLE_RELEASE_MS)
+
+    def release_idle_resources(self) -> None:
+        """Drops dialogs nobody is looking at and returns freed memory to the OS."""
+        if self._about_dialog is not None and not self._about_dialog.isVisible():
+            self._about_dialog.deleteLater()
+            self._about_dialog = None
+        if self._diagnostics_dialog is not None and not self._diagnostics_dialog.isVisible():
+            self._diagnostics_dialog.deleteLater()
+            self._diagnostics_dialog = None
+        if not self._update_download_in_progress:
+            self._close_update_progress_dialog()
+        format_release_notes.cache_clear()
+        # deleteLater only runs on the next loop iteration, so trim after it.
+        QTimer.singleShot(0, trim_working_set)
+
+    def _reveal_hidden_actions(self) -> None:
+        shift_held = bool(QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier)
+        self.diagnostics_action.setVisible(shift_held)
+        self.profiling_action.setVisible(shift_held or self.profiler.active)
+
+    def _sync_profiling_action(self) -> None:
+        seconds = self.profiler.duration_sec if self.profiler.active else PROFILE_DEFAULT_SEC
+        self.profiling_action.setText(self.i18n.formatter("profiling_toggle")(seconds=seconds))
+        self._set_checked_silently(self.profiling_action, self.profiler.active)
+
+    def _on_profiling_toggled(self, enabled: bool) -> None:
+        if enabled:
+            self.start_profiling(PROFILE_DEFAULT_SEC)
+        else:
+            self.stop_profiling()
+
+    def start_profiling(self, seconds: int) -> None:
+        if not self.profiler.start(seconds):
+            return
+        self.profile_timer.start(self.profiler.duration_sec * 1000)
+        self._sync_profiling_action()
+        self.tray.showMessage(
+            self.i18n.tr("app_name"),
+            self.i18n.formatter("profiling_started")(seconds=self.profiler.duration_sec),
+            QSystemTrayIcon.MessageIcon.Information,
+            2500,
+        )
+
+    def stop_profiling(self) -> None:
+        self.profile_timer.stop()
+        written = self.profiler.stop()
+        self._sync_profiling_action()
+        if written:
+            self.tray.showMessage(
+                self.i18n.tr("app_name"),
+                self.i18n.formatter("profiling_saved")(path=written[0].parent),
+                QSystemTrayIcon.MessageIcon.Information,
+                4200,
+            )
+
+    def show_diagnostics(self) -> None:
+        self._mark_activity()
+        if self._diagnostics_dialog is None:
+            self._diagnostics_dialog = DiagnosticsDialog(self.i18n, self.settings)
+        self._focus_dialog(self._diagnostics_dialog)
+
     def quit_app(self) -> None:
+        self._cancel_update_download()
         self.timer.stop()
         self.update_timer.stop()
+        self.idle_timer.stop()
+        self.settings_watcher.stop()
+        self.metrics_server.stop()
+        self.autostart.close()
+        if self.profiler.active:
+            self.stop_profiling()
         self._close_update_progress_dialog()
+        self.settings.flush()
+        if self.settings.background_update_download:
+            self.updater.apply_staged_update(relaunch=False)
+        self.updater.http.close()
         self.tray.hide()
         from PyQt6.QtWidgets import QApplication
 
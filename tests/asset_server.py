@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class AssetServer:
+    """Serves one payload over HTTP/1.1 with optional byte ranges, latency and per-connection pacing."""
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.honor_ranges = True
+        self.advertise_ranges = True
+        self.latency = 0.0
+        self.connection_rate = 0
+        self.requests: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+            def do_HEAD(self) -> None:
+                self._serve(body=False)
+
+            def do_GET(self) -> None:
+                self._serve(body=True)
+
+            def _serve(self, body: bool) -> None:
+                range_header = self.headers.get("Range", "")
+                with server._lock:
+                    server.requests.append((self.command, range_header))
+
+                data = server.data
+                start, end, status = 0, len(data) - 1, 200
+                match = re.match(r"bytes=(\d+)-(\d*)", range_header)
+                if match and server.honor_ranges:
+                    start = int(match.group(1))
+                    end = int(match.group(2)) if match.group(2) else end
+                    status = 206
+                if server.latency:
+                    time.sleep(server.latency)
+
+                chunk = data[start:end + 1]
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(chunk)))
+                self.send_header("ETag", '"asset"')
+                if server.advertise_ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                self.end_headers()
+                if not body:
+                    return
+                if not server.connection_rate:
+                    self.wfile.write(chunk)
+                    return
+                # Paces each response on its own, like a CDN that limits every connection.
+                step = max(1, server.connection_rate // 20)
+                for offset in range(0, len(chunk), step):
+                    self.wfile.write(chunk[offset:offset + step])
+                    time.sleep(step / server.connection_rate)
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_port}/Binity.exe"
+
+    def ranged_gets(self) -> list[str]:
+        return [value for method, value in self.requests if method == "GET" and value]
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
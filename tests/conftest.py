@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tests.asset_server import AssetServer  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_app_dirs(tmp_path, monkeypatch):
+    """Settings, update caches and logs go to a per-test folder instead of the real profile."""
+    monkeypatch.setenv("APPDATA", str(tmp_path / "Roaming"))
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "Local"))
+    return tmp_path
+
+
+@pytest.fixture
+def asset_server():
+    server = AssetServer(bytes(range(256)) * 4096 + b"tail")
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def updater():
+    from src.core.settings import Settings
+    from src.core.updater import Updater
+
+    instance = Updater(Settings())
+    yield instance
+    instance.http.close()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import sys
+
+from src.services.autostart import AutostartService
+
+
+class _FakeKey:
+    def __init__(self) -> None:
+        self.closed = 0
+
+    def Close(self) -> None:
+        self.closed += 1
+
+
+def test_rearming_closes_the_previous_watch_handles(monkeypatch):
+    service = AutostartService()
+    old_key = _FakeKey()
+    service._watch_key = old_key
+
+    # Off Windows the new registration fails, which must still leave nothing open.
+    monkeypatch.setitem(sys.modules, "winreg", None)
+    assert not service._arm_change_watch()
+
+    assert old_key.closed == 1
+    assert service._watch_key is None
+    assert service._watch_event is None
+
+
+def test_close_releases_handles_and_forgets_cached_state():
+    service = AutostartService()
+    key = _FakeKey()
+    service._watch_key = key
+    service._cached_state = True
+
+    service.close()
+    service.close()
+
+    assert key.closed == 1
+    assert service._watch_key is None
+    assert service._cached_state is None
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import hashlib
+import os
+
+import pytest
+
+from src.core.updater import UpdateInfo
+
+ASSET = b"MZ" + os.urandom(1_100_000)
+
+
+@pytest.fixture
+def mirror(tmp_path, updater):
+    root = tmp_path / "mirror"
+    root.mkdir()
+    (root / "Binity.exe").write_bytes(ASSET)
+    updater.settings.set("background_download_rate_limit_kib", 0)
+    return root
+
+
+def _release(updater, mirror, manifest_text: str | None) -> None:
+    # "" publishes no manifest; None lists one that is missing from the mirror.
+    manifest = mirror / "SHA256SUMS.txt"
+    if manifest_text is not None:
+        manifest.write_text(manifest_text, encoding="utf-8")
+    updater._info = UpdateInfo(
+        version="v99.0.0",
+        download_url=(mirror / "Binity.exe").as_uri(),
+        body="",
+        asset_name="Binity.exe",
+        asset_size=len(ASSET),
+        manifest_url=manifest.as_uri() if manifest_text != "" else "",
+    )
+
+
+def test_release_without_manifest_is_installed_unverified(updater, mirror):
+    _release(updater, mirror, "")
+
+    path = updater.download_update(stage=True)
+
+    assert path is not None, updater.last_error
+    assert updater.info.sha256 == hashlib.sha256(ASSET).hexdigest()
+
+
+def test_matching_manifest_is_accepted(updater, mirror):
+    _release(updater, mirror, f"{hashlib.sha256(ASSET).hexdigest()} *Binity.exe\n")
+
+    assert updater.download_update(stage=True) is not None, updater.last_error
+
+
+@pytest.mark.parametrize(
+    ("manifest_text", "error"),
+    [
+        (None, "Checksum manifest unavailable"),
+        (f"{'0' * 64}  Other.exe\n", "Checksum manifest has no entry for binity.exe"),
+        (f"{'0' * 64}  Binity.exe\n", "Checksum mismatch"),
+    ],
+    ids=["unreachable", "no-entry", "mismatch"],
+)
+def test_published_manifest_fails_closed(updater, mirror, manifest_text, error):
+    _release(updater, mirror, manifest_text)
+
+    assert updater.download_update(stage=True) is None
+    assert updater.last_error.startswith(error)
+    assert updater.staged_update() is None
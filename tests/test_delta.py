@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import zlib
+
+import pytest
+
+from src.core.delta import (
+    INSERT_MAX_PACKED_SIZE,
+    OP_END,
+    OP_INSERT,
+    PATCH_MAGIC,
+    DeltaError,
+    _HEADER,
+    _INSERT,
+    apply_patch,
+    create_patch,
+    file_sha256,
+)
+
+
+@pytest.fixture
+def builds(tmp_path):
+    old = os.urandom(300_000)
+    new = old[:100_000] + os.urandom(5_000) + old[100_000:250_000] + b"tail" * 100
+    old_path, new_path = tmp_path / "old.exe", tmp_path / "new.exe"
+    old_path.write_bytes(old)
+    new_path.write_bytes(new)
+    patch_path = tmp_path / "update.patch"
+    create_patch(old_path, new_path, patch_path)
+    return old_path, new_path, patch_path
+
+
+def _raw_patch(tmp_path, source: bytes, body: bytes, target_size: int = 4):
+    path = tmp_path / "crafted.patch"
+    header = _HEADER.pack(len(source), hashlib.sha256(source).digest(), target_size, b"\0" * 32)
+    path.write_bytes(PATCH_MAGIC + header + body + OP_END)
+    return path
+
+
+def test_round_trip(builds, tmp_path):
+    old_path, new_path, patch_path = builds
+    output = tmp_path / "out.exe"
+    assert apply_patch(old_path, patch_path, output) == file_sha256(new_path)
+    assert output.read_bytes() == new_path.read_bytes()
+
+
+def test_rejects_source_with_same_size_but_other_content(builds, tmp_path):
+    old_path, _, patch_path = builds
+    tampered = tmp_path / "tampered.exe"
+    data = bytearray(old_path.read_bytes())
+    data[-1] ^= 0xFF
+    tampered.write_bytes(bytes(data))
+    output = tmp_path / "out.exe"
+
+    with pytest.raises(DeltaError, match="different source"):
+        apply_patch(tampered, patch_path, output)
+    assert not output.exists()
+
+
+def test_rejects_oversized_packed_insert(tmp_path):
+    source = tmp_path / "src.exe"
+    source.write_bytes(b"abcd")
+    body = OP_INSERT + _INSERT.pack(4, INSERT_MAX_PACKED_SIZE + 1)
+    with pytest.raises(DeltaError, match="too large"):
+        apply_patch(source, _raw_patch(tmp_path, b"abcd", body), tmp_path / "out.exe")
+
+
+def test_rejects_insert_that_inflates_past_declared_length(tmp_path):
+    source = tmp_path / "src.exe"
+    source.write_bytes(b"abcd")
+    packed = zlib.compress(b"\0" * 1_000_000)
+    body = OP_INSERT + _INSERT.pack(4, len(packed)) + packed
+    with pytest.raises(DeltaError, match="wrong length"):
+        apply_patch(source, _raw_patch(tmp_path, b"abcd", body), tmp_path / "out.exe")
+
+
+def test_rejects_trailing_data_after_compressed_insert(tmp_path):
+    source = tmp_path / "src.exe"
+    source.write_bytes(b"abcd")
+    packed = zlib.compress(b"wxyz") + b"junk"
+    body = OP_INSERT + _INSERT.pack(4, len(packed)) + packed
+    with pytest.raises(DeltaError, match="wrong length"):
+        apply_patch(source, _raw_patch(tmp_path, b"abcd", body), tmp_path / "out.exe")
+
+
+def test_rejects_truncated_patch(builds, tmp_path):
+    old_path, _, patch_path = builds
+    truncated = tmp_path / "short.patch"
+    truncated.write_bytes(patch_path.read_bytes()[:-50])
+    with pytest.raises(DeltaError):
+        apply_patch(old_path, truncated, tmp_path / "out.exe")
+
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+from src.core.delta import create_patch, file_sha256
+from src.core.updater import UpdateInfo
+
+
+@pytest.fixture
+def release_dir(tmp_path, updater, monkeypatch):
+    """A frozen Binity running an old build, and a file mirror with the new build, a delta and SHA256SUMS."""
+    old = b"MZ" + os.urandom(1_200_000)
+    new = old[:400_000] + os.urandom(20_000) + old[400_000:]
+    running = tmp_path / "app" / "Binity.exe"
+    mirror = tmp_path / "mirror"
+    running.parent.mkdir()
+    mirror.mkdir()
+    running.write_bytes(old)
+    (mirror / "Binity.exe").write_bytes(new)
+    (mirror / "SHA256SUMS.txt").write_text(f"{file_sha256(mirror / 'Binity.exe').hex()}  Binity.exe\n", encoding="utf-8")
+
+    monkeypatch.setattr(sys, "executable", str(running))
+    monkeypatch.setattr(updater, "is_frozen", lambda: True)
+    updater.settings.set("background_download_rate_limit_kib", 0)
+    return running, mirror
+
+
+def _use_patch(updater, mirror, patch_path):
+    updater._info = UpdateInfo(
+        version="v99.0.0",
+        download_url=(mirror / "Binity.exe").as_uri(),
+        body="",
+        asset_name="Binity.exe",
+        asset_size=(mirror / "Binity.exe").stat().st_size,
+        delta_url=patch_path.as_uri(),
+        delta_name=patch_path.name,
+        delta_size=patch_path.stat().st_size,
+        manifest_url=(mirror / "SHA256SUMS.txt").as_uri(),
+    )
+
+
+def test_delta_builds_the_release(updater, release_dir):
+    running, mirror = release_dir
+    patch_path = mirror / "Binity-v99.0.0.delta"
+    create_patch(running, mirror / "Binity.exe", patch_path)
+    _use_patch(updater, mirror, patch_path)
+
+    path = updater.download_update(stage=True)
+
+    assert path is not None, updater.last_error
+    assert path.read_bytes() == (mirror / "Binity.exe").read_bytes()
+    assert updater.last_download_stats["source"] == "delta"
+
+
+def test_delta_with_bad_checksum_falls_back_to_full_download(updater, release_dir, tmp_path):
+    running, mirror = release_dir
+    # A patch that applies cleanly but produces a build the manifest does not vouch for.
+    wrong = tmp_path / "wrong.exe"
+    wrong.write_bytes((mirror / "Binity.exe").read_bytes()[:-4] + b"junk")
+    patch_path = mirror / "Binity-v99.0.0.delta"
+    create_patch(running, wrong, patch_path)
+    _use_patch(updater, mirror, patch_path)
+
+    path = updater.download_update(stage=True)
+
+    assert path is not None, updater.last_error
+    assert updater.last_error == ""
+    assert path.read_bytes() == (mirror / "Binity.exe").read_bytes()
+    assert updater.last_download_stats["source"] == "full"
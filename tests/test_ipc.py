@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from src.core import ipc
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs a POSIX FIFO to stand in for the named pipe")
+def test_pipe_exchange_gives_up_on_a_silent_server(tmp_path):
+    fifo = tmp_path / "Binity-test"
+    os.mkfifo(fifo)
+
+    started = time.monotonic()
+    # Without a newline the client keeps reading its own request back and never sees a reply.
+    with pytest.raises(TimeoutError):
+        ipc._exchange_pipe(str(fifo), b"ping", 0.3)
+    assert time.monotonic() - started < 2.0
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs a POSIX FIFO to stand in for the named pipe")
+def test_pipe_exchange_returns_the_reply_line(tmp_path):
+    fifo = tmp_path / "Binity-test"
+    os.mkfifo(fifo)
+
+    assert ipc._exchange_pipe(str(fifo), ipc.encode_message({"ok": True}), 2.0) == b'{"ok": true}\n'
+
+
+def test_pipe_exchange_reraises_open_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ipc._exchange_pipe(str(tmp_path / "missing"), b"{}\n", 1.0)
+
+
+def test_send_command_returns_none_when_the_pipe_times_out(monkeypatch):
+    monkeypatch.setattr(ipc.os, "name", "nt")
+    monkeypatch.setattr(ipc, "_pipe_roundtrip", lambda path, request: time.sleep(5))
+
+    started = time.monotonic()
+    assert ipc.send_command(["status"], timeout=0.2) is None
+    assert time.monotonic() - started < 2.0
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.core.metrics import MetricsRegistry, MetricsServer
+from src.services.recycle_bin import RecycleBinService
+
+
+@pytest.fixture
+def metrics_server():
+    server = MetricsServer(MetricsRegistry())
+    assert server.start(0)
+    yield server
+    server.stop()
+
+
+def _scrape(server: MetricsServer) -> str:
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+        return response.read().decode("utf-8")
+
+
+def test_scrape_serves_the_snapshot_without_querying_drives(metrics_server, monkeypatch):
+    def _no_shell_queries(*args, **kwargs):
+        raise AssertionError("scrape queried the Recycle Bin")
+
+    monkeypatch.setattr(RecycleBinService, "get_drive_info", classmethod(_no_shell_queries))
+    monkeypatch.setattr(RecycleBinService, "get_info", classmethod(_no_shell_queries))
+    registry = metrics_server.registry
+    registry.replace_gauge("binity_drive_bin_items", {"C": 4, "D": 1}, "drive", "Items in the Recycle Bin per drive")
+
+    first = _scrape(metrics_server)
+    assert 'binity_drive_bin_items{drive="C"} 4' in first
+    assert 'binity_drive_bin_items{drive="D"} 1' in first
+
+    # A drive that disappears from the next refresh vanishes from the series.
+    registry.replace_gauge("binity_drive_bin_items", {"C": 5}, "drive", "Items in the Recycle Bin per drive")
+    second = _scrape(metrics_server)
+    assert 'binity_drive_bin_items{drive="C"} 5' in second
+    assert 'drive="D"' not in second
+
+
+def test_unknown_paths_are_not_found(metrics_server):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        urllib.request.urlopen(f"http://127.0.0.1:{metrics_server.port}/other", timeout=5)
+    assert excinfo.value.code == 404
+
+
+def test_histogram_rendering():
+    registry = MetricsRegistry()
+    registry.observe("binity_refresh_duration_seconds", 0.003, "Time spent in one tray refresh tick")
+
+    text = registry.render()
+    assert "# TYPE binity_refresh_duration_seconds histogram" in text
+    assert 'binity_refresh_duration_seconds_bucket{le="0.005"} 1' in text
+    assert "binity_refresh_duration_seconds_count 1" in text
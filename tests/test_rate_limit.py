@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from src.core import updater as updater_module
+from src.core.updater import UpdateInfo
+from tests.asset_server import AssetServer
+
+# The updater only accepts an MZ header and at least 1 MB.
+PAYLOAD = b"MZ" + bytes(range(256)) * 4096
+# Loopback is far faster than any cap; allow for bucket granularity and a slow CI box.
+RATE_TOLERANCE = (0.7, 1.1)
+
+
+@pytest.fixture
+def payload_server():
+    server = AssetServer(PAYLOAD)
+    yield server
+    server.close()
+
+
+@pytest.mark.parametrize(
+    ("stage", "cap_key", "cap_kib"),
+    [
+        (False, "download_rate_limit_kib", 1024),
+        (True, "background_download_rate_limit_kib", 512),
+    ],
+    ids=["interactive", "background"],
+)
+def test_download_throughput_stays_at_cap(updater, payload_server, monkeypatch, stage, cap_key, cap_kib):
+    monkeypatch.setattr(updater_module, "SEGMENTED_MIN_SIZE", 64 * 1024)
+    updater.settings.set_many(
+        {
+            "download_rate_limit_kib": 0,
+            "background_download_rate_limit_kib": 0,
+            cap_key: cap_kib,
+        }
+    )
+    updater._info = UpdateInfo(
+        version="v99.0.0",
+        download_url=payload_server.url,
+        body="",
+        asset_name="Binity.exe",
+        asset_size=len(payload_server.data),
+    )
+
+    started = time.monotonic()
+    path = updater.download_update(stage=stage)
+    elapsed = time.monotonic() - started
+
+    assert path is not None, updater.last_error
+    assert path.read_bytes() == payload_server.data
+    # A capped download stays on one connection even when it is large enough to split.
+    assert payload_server.ranged_gets() == []
+    rate_kib = len(payload_server.data) / elapsed / 1024
+    low, high = RATE_TOLERANCE
+    assert cap_kib * low <= rate_kib <= cap_kib * high
+
+
+def test_background_cap_never_exceeds_interactive_cap(updater):
+    updater.settings.set_many({"download_rate_limit_kib": 128, "background_download_rate_limit_kib": 512})
+    assert updater.download_rate_limit(updater_module.DOWNLOAD_PROFILE_INTERACTIVE) == 128 * 1024
+    assert updater.download_rate_limit(updater_module.DOWNLOAD_PROFILE_BACKGROUND) == 128 * 1024
+    updater.settings.set("download_rate_limit_kib", 0)
+    assert updater.download_rate_limit(updater_module.DOWNLOAD_PROFILE_INTERACTIVE) == 0
+    assert updater.download_rate_limit(updater_module.DOWNLOAD_PROFILE_BACKGROUND) == 512 * 1024
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+
+from release_notes_benchmark import legacy_format_release_notes, load_releases
+from src.core.release_notes import format_release_notes
+
+RELEASES = load_releases()
+
+
+@pytest.mark.parametrize("release", RELEASES, ids=[release["tag"] for release in RELEASES])
+def test_matches_legacy_renderer_on_shipped_release_notes(release):
+    assert format_release_notes(release["body"]) == legacy_format_release_notes(release["body"])
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "",
+        "   ",
+        "#### Title\n\n\n\n* item **bold**\n+ `code`",
+        "Text with ~~strike~~, *italic*, _emphasis_ and [a link](https://example.com).",
+        "![screenshot](shot.png) after\r\nwindows line",
+    ],
+)
+def test_matches_legacy_renderer_on_markdown_samples(body):
+    assert format_release_notes(body) == legacy_format_release_notes(body)
+
+
+def test_keeps_underscores_inside_identifiers():
+    rendered = format_release_notes("- Renamed `update_source` to update_source_location, _now_ documented")
+    assert rendered == "- Renamed update_source to update_source_location, now documented"
+    # The legacy renderer ate the underscores of snake_case names.
+    assert legacy_format_release_notes("update_source_location") == "updatesourcelocation"
+    assert format_release_notes("update_source_location") == "update_source_location"
+    assert format_release_notes("__init__ and _private") == "init and _private"
+
+
+def test_repeated_bodies_are_served_from_cache():
+    body = "\n\n".join(release["body"] for release in RELEASES)
+    format_release_notes.cache_clear()
+    first = format_release_notes(body)
+    assert format_release_notes(body) is first
+    assert format_release_notes.cache_info().hits == 1
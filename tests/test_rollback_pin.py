@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import pytest
+
+from src.core.rollback import RollbackEntry
+from src.core.updater import UpdateInfo
+from src.version import __version__
+from tests.asset_server import AssetServer
+
+CURRENT_TAG = f"v{__version__}"
+ROLLED_BACK_TAG = "v99.0.0"
+NEWER_TAG = "v99.0.1"
+
+
+def _release(tag: str) -> dict:
+    return {
+        "tag_name": tag,
+        "body": "",
+        "assets": [{"name": "Binity.exe", "browser_download_url": "http://127.0.0.1:9/Binity.exe", "size": 2_000_000}],
+    }
+
+
+@pytest.fixture
+def latest_release(updater, monkeypatch):
+    release = {"tag": ROLLED_BACK_TAG}
+    monkeypatch.setattr(updater, "_fetch_latest_release", lambda: _release(release["tag"]))
+    return release
+
+
+def test_forced_automatic_check_honours_skipped_version(updater, latest_release):
+    updater.settings.set("skipped_update_version", ROLLED_BACK_TAG)
+
+    assert updater.check_for_update(force=True) is None
+    assert updater.check_for_update(force=True, manual=True).version == ROLLED_BACK_TAG
+    # The cached result of the manual check is not handed to the next automatic one.
+    assert updater.check_for_update() is None
+
+
+def test_rollback_pin_withholds_versions_at_or_below_it(updater, latest_release):
+    updater.settings.set("rollback_pin_version", ROLLED_BACK_TAG)
+
+    assert updater.check_for_update(force=True) is None
+    latest_release["tag"] = "v98.5.0"
+    assert updater.check_for_update(force=True) is None
+    latest_release["tag"] = NEWER_TAG
+    assert updater.check_for_update(force=True).version == NEWER_TAG
+
+
+def test_rollback_sets_the_pin(updater, monkeypatch):
+    monkeypatch.setattr(updater, "is_frozen", lambda: True)
+    monkeypatch.setattr(updater.rollback_cache, "verify", lambda entry: True)
+    monkeypatch.setattr(updater, "_retain_current_exe", lambda: None)
+    monkeypatch.setattr(updater, "_start_swap", lambda *args, **kwargs: None)
+
+    assert updater.rollback(RollbackEntry(version="3.0.0", sha256="0" * 64, size=1, stored_at=0.0))
+    assert updater.settings.get("rollback_pin_version") == CURRENT_TAG
+    assert updater.settings.get("skipped_update_version") == ""
+
+
+def test_staging_refuses_pinned_versions(updater):
+    server = AssetServer(b"MZ" + bytes(range(256)) * 4096)
+    try:
+        updater.settings.set("background_download_rate_limit_kib", 0)
+        updater._info = UpdateInfo(
+            version=ROLLED_BACK_TAG,
+            download_url=server.url,
+            body="",
+            asset_name="Binity.exe",
+            asset_size=len(server.data),
+        )
+        assert updater.download_update(stage=True) is not None
+        assert updater.staged_update() is not None
+
+        updater.settings.set("rollback_pin_version", ROLLED_BACK_TAG)
+        assert updater.staged_update() is None
+        updater.discard_staged_update()
+        assert updater.download_update(stage=True) is None
+        assert "rolled back" in updater.last_error
+        assert updater.staged_update() is None
+    finally:
+        server.close()
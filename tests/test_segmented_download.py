@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+import pytest
+
+from src.core import updater as updater_module
+
+
+@pytest.fixture(autouse=True)
+def small_segment_threshold(monkeypatch):
+    monkeypatch.setattr(updater_module, "SEGMENTED_MIN_SIZE", 64 * 1024)
+    monkeypatch.setattr(updater_module, "DOWNLOAD_SEGMENTS", 4)
+
+
+def _paths(updater):
+    partial, meta_path = updater._partial_paths("Binity.exe")
+    partial.parent.mkdir(parents=True, exist_ok=True)
+    return partial, meta_path
+
+
+def test_probe_splits_file_into_contiguous_ranges(updater, asset_server):
+    size = len(asset_server.data)
+    meta = updater._probe_segmented_meta(asset_server.url, size)
+
+    segments = meta["segments"]
+    assert len(segments) == 4
+    assert segments[0][0] == 0
+    assert segments[-1][1] == size - 1
+    for previous, current in zip(segments, segments[1:]):
+        assert current[0] == previous[1] + 1
+    assert all(done == 0 for _, _, done in segments)
+    assert max(end - start for start, end, _ in segments) - min(end - start for start, end, _ in segments) <= 4
+
+
+def test_probe_skips_small_files_and_servers_without_ranges(updater, asset_server):
+    assert updater._probe_segmented_meta(asset_server.url, 1024) == {}
+    asset_server.advertise_ranges = False
+    assert updater._probe_segmented_meta(asset_server.url, len(asset_server.data)) == {}
+
+
+def test_segmented_download_fetches_every_range(updater, asset_server):
+    partial, meta_path = _paths(updater)
+    digest = updater._download_to_partial(
+        asset_server.url, len(asset_server.data), partial, meta_path, None, None
+    )
+
+    assert digest == hashlib.sha256(asset_server.data).hexdigest()
+    assert partial.read_bytes() == asset_server.data
+    assert len(asset_server.ranged_gets()) == 4
+
+
+def test_segmented_download_resumes_from_sidecar(updater, asset_server):
+    data = asset_server.data
+    partial, meta_path = _paths(updater)
+    meta = updater._probe_segmented_meta(asset_server.url, len(data))
+
+    # Pretend an earlier run wrote the first half of every segment before it was interrupted.
+    buffer = bytearray(len(data))
+    for segment in meta["segments"]:
+        start, end, _ = segment
+        done = (end - start + 1) // 2
+        buffer[start:start + done] = data[start:start + done]
+        segment[2] = done
+    partial.write_bytes(bytes(buffer))
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    asset_server.requests.clear()
+
+    digest = updater._download_to_partial(asset_server.url, len(data), partial, meta_path, None, None)
+
+    assert digest == hashlib.sha256(data).hexdigest()
+    expected = sorted(f"bytes={start + done}-{end}" for start, end, done in meta["segments"])
+    assert sorted(asset_server.ranged_gets()) == expected
+    assert ("HEAD", "") not in asset_server.requests
+
+
+def test_falls_back_to_single_stream_when_ranges_are_ignored(updater, asset_server):
+    asset_server.honor_ranges = False
+    partial, meta_path = _paths(updater)
+
+    digest = updater._download_to_partial(
+        asset_server.url, len(asset_server.data), partial, meta_path, None, None
+    )
+
+    assert digest == hashlib.sha256(asset_server.data).hexdigest()
+    assert partial.read_bytes() == asset_server.data
+    assert updater._segments_disabled_url == asset_server.url
+    assert ("GET", "") in asset_server.requests
+
+
+def test_segmented_download_hashes_without_rereading_the_file(updater, asset_server, monkeypatch):
+    monkeypatch.setattr(updater_module, "file_sha256", lambda path: pytest.fail("second hashing pass"))
+    partial, meta_path = _paths(updater)
+
+    digest = updater._download_to_partial(asset_server.url, len(asset_server.data), partial, meta_path, None, None)
+
+    assert digest == hashlib.sha256(asset_server.data).hexdigest()
+    assert json.loads(meta_path.read_text(encoding="utf-8"))["sha256"] == digest
+
+
+def test_finished_partial_reuses_the_recorded_digest(updater, asset_server):
+    partial, meta_path = _paths(updater)
+    digest = updater._download_to_partial(asset_server.url, len(asset_server.data), partial, meta_path, None, None)
+    asset_server.requests.clear()
+
+    assert updater._download_to_partial(asset_server.url, len(asset_server.data), partial, meta_path, None, None) == digest
+    assert asset_server.requests == []
+
+
+def test_finished_partial_without_a_digest_is_fetched_again(updater, asset_server):
+    asset_server.advertise_ranges = False
+    partial, meta_path = _paths(updater)
+    partial.write_bytes(asset_server.data)
+    meta_path.write_text(json.dumps({"url": asset_server.url, "size": len(asset_server.data)}), encoding="utf-8")
+
+    digest = updater._download_to_partial(asset_server.url, len(asset_server.data), partial, meta_path, None, None)
+
+    assert digest == hashlib.sha256(asset_server.data).hexdigest()
+    assert ("GET", "") in asset_server.requests
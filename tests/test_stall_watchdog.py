@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import time
+
+from src.core.stall_watchdog import StallWatchdog
+
+
+def test_logs_gui_stack_on_stall_and_recovery(tmp_path):
+    log_path = tmp_path / "stall.log"
+    watchdog = StallWatchdog(log_path, 0.1)
+    watchdog.start()
+    try:
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline:
+            if log_path.exists() and log_path.read_text(encoding="utf-8").endswith("\n\n"):
+                break
+            time.sleep(0.02)
+        watchdog.heartbeat()
+    finally:
+        watchdog.stop()
+
+    text = log_path.read_text(encoding="utf-8")
+    assert "event loop stalled" in text
+    assert "[GUI]" in text
+    assert "test_logs_gui_stack_on_stall_and_recovery" in text
+    assert "recovered after" in text
+
+
+def test_steady_heartbeat_writes_nothing(tmp_path):
+    log_path = tmp_path / "stall.log"
+    watchdog = StallWatchdog(log_path, 0.3)
+    watchdog.start()
+    try:
+        for _ in range(10):
+            time.sleep(0.05)
+            watchdog.heartbeat()
+    finally:
+        watchdog.stop()
+
+    assert not log_path.exists()
@@ -0,0 +1,57 @@
+import pytest
+
+from src.core.update_sources import (
+    DirectoryUpdateSource,
+    GitHubUpdateSource,
+    HttpMirrorUpdateSource,
+    UpdateSource,
+    create_update_source,
+)
+
+
+def _release(*assets):
+    return {"tag_name": "v9.9.9", "assets": list(assets)}
+
+
+def test_update_source_is_abstract():
+    with pytest.raises(TypeError):
+        UpdateSource("x")
+
+
+def test_mirror_resolves_relative_download_urls():
+    source = HttpMirrorUpdateSource("http://mirror.local/binity")
+    release = source.fetch_latest_release(
+        lambda url: _release(
+            {"name": "Binity.exe", "browser_download_url": "/dl/Binity.exe"},
+            {"name": "SHA256SUMS.txt", "browser_download_url": "sums/SHA256SUMS.txt"},
+            {"name": "Binity.delta", "browser_download_url": "https://cdn.local/Binity.delta"},
+            {"name": "notes.txt"},
+        )
+    )
+    urls = [asset["browser_download_url"] for asset in release["assets"]]
+    assert urls == [
+        "http://mirror.local/dl/Binity.exe",
+        "http://mirror.local/binity/sums/SHA256SUMS.txt",
+        "https://cdn.local/Binity.delta",
+        "http://mirror.local/binity/notes.txt",
+    ]
+
+
+def test_directory_source_fills_urls_and_sizes(tmp_path):
+    (tmp_path / "Binity.exe").write_bytes(b"x" * 10)
+    source = DirectoryUpdateSource(str(tmp_path))
+    release = source.fetch_latest_release(lambda url: _release({"name": "Binity.exe"}))
+    asset = release["assets"][0]
+    assert asset["browser_download_url"] == (tmp_path / "Binity.exe").as_uri()
+    assert asset["size"] == 10
+
+
+def test_github_asset_url_points_at_latest_release():
+    source = GitHubUpdateSource()
+    assert source.asset_url("Binity.exe") == "https://github.com/Volfheim/Binity/releases/latest/download/Binity.exe"
+
+
+def test_create_update_source_falls_back_to_github():
+    assert isinstance(create_update_source("http", ""), GitHubUpdateSource)
+    assert isinstance(create_update_source("unknown", "x"), GitHubUpdateSource)
+    assert isinstance(create_update_source("directory", "x"), DirectoryUpdateSource)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from src.core import update_swap
+from src.core.update_swap import APPLY_UPDATE_SWITCH, SwapPlan, retry_with_backoff, run_swap, wait_for_process_exit
+
+
+def _short_lived_child(seconds: float) -> subprocess.Popen:
+    child = subprocess.Popen([sys.executable, "-c", f"import time; time.sleep({seconds})"])
+    # Reap it as soon as it exits, as the parent Binity process would be gone by then.
+    threading.Thread(target=child.wait, daemon=True).start()
+    return child
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="pidfd_open is Linux-only")
+def test_wait_for_process_exit_with_pidfd():
+    child = _short_lived_child(0.3)
+    started = time.monotonic()
+    assert wait_for_process_exit(child.pid, 10.0)
+    assert time.monotonic() - started < 5.0
+    assert child.wait(1.0) == 0
+
+
+@pytest.mark.skipif(os.name == "nt", reason="the polling fallback is POSIX-only")
+def test_wait_for_process_exit_polling_fallback(monkeypatch):
+    monkeypatch.delattr(os, "pidfd_open", raising=False)
+    child = _short_lived_child(0.3)
+    assert wait_for_process_exit(child.pid, 10.0)
+    assert child.wait(1.0) == 0
+
+
+def test_wait_for_process_exit_times_out_on_a_live_process():
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        started = time.monotonic()
+        assert not wait_for_process_exit(child.pid, 0.3)
+        assert 0.25 <= time.monotonic() - started < 5.0
+    finally:
+        child.kill()
+        child.wait()
+
+
+def test_wait_for_process_exit_skips_own_and_invalid_pids():
+    assert wait_for_process_exit(0, 0.1)
+    assert wait_for_process_exit(os.getpid(), 0.1)
+
+
+def test_retry_with_backoff_doubles_delay_up_to_the_cap(monkeypatch):
+    sleeps: list[float] = []
+    monkeypatch.setattr(update_swap.time, "sleep", sleeps.append)
+    calls = []
+
+    def _always_locked():
+        calls.append(1)
+        raise PermissionError("locked")
+
+    with pytest.raises(PermissionError):
+        retry_with_backoff(_always_locked, attempts=5, initial_delay=0.05, max_delay=0.15)
+    assert len(calls) == 5
+    assert sleeps == pytest.approx([0.05, 0.1, 0.15, 0.15])
+
+
+def test_retry_with_backoff_returns_after_a_transient_error(monkeypatch):
+    sleeps: list[float] = []
+    monkeypatch.setattr(update_swap.time, "sleep", sleeps.append)
+    outcomes = [OSError("busy"), OSError("busy"), "done"]
+
+    def _flaky():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert retry_with_backoff(_flaky, attempts=8, initial_delay=0.05) == "done"
+    assert sleeps == pytest.approx([0.05, 0.1])
+
+
+def test_retry_with_backoff_does_not_retry_other_errors(monkeypatch):
+    monkeypatch.setattr(update_swap.time, "sleep", lambda delay: pytest.fail("unexpected retry"))
+    with pytest.raises(ValueError):
+        retry_with_backoff(lambda: (_ for _ in ()).throw(ValueError("bad")))
+
+
+def _plan(tmp_path, **overrides) -> SwapPlan:
+    source = tmp_path / "updates" / "staged-Binity.exe"
+    final = tmp_path / "app" / "Binity.exe"
+    source.parent.mkdir(parents=True, exist_ok=True)
+    final.parent.mkdir(parents=True, exist_ok=True)
+    source.write_bytes(b"MZ new build")
+    final.write_bytes(b"MZ old build")
+    values = dict(
+        pid=0,
+        source=str(source),
+        final=str(final),
+        flag_file=str(tmp_path / "applied.flag"),
+        log_file=str(tmp_path / "update.log"),
+        ready_file=str(tmp_path / "ready.flag"),
+        launch_info_file=str(tmp_path / "launch-info.txt"),
+        relaunch=False,
+    )
+    values.update(overrides)
+    return SwapPlan(**values)
+
+
+@pytest.mark.parametrize("keep_source", [False, True])
+def test_run_swap_installs_staged_update_without_relaunch(tmp_path, keep_source):
+    plan = _plan(tmp_path, keep_source=keep_source)
+
+    assert run_swap(plan) == 0
+
+    assert (tmp_path / "app" / "Binity.exe").read_bytes() == b"MZ new build"
+    assert (tmp_path / "updates" / "staged-Binity.exe").exists() == keep_source
+    assert (tmp_path / "applied.flag").read_text(encoding="utf-8") == "1"
+    assert not (tmp_path / "launch-info.txt").exists()
+    assert not (tmp_path / "app" / "Binity.exe.new").exists()
+    assert "Staged update installed for next launch" in (tmp_path / "update.log").read_text(encoding="utf-8")
+
+
+def test_run_swap_fails_when_the_download_is_missing(tmp_path):
+    plan = _plan(tmp_path)
+    os.unlink(plan.source)
+
+    assert run_swap(plan) == 1
+    assert (tmp_path / "app" / "Binity.exe").read_bytes() == b"MZ old build"
+    assert not (tmp_path / "applied.flag").exists()
+
+
+@pytest.mark.parametrize(
+    "plan_text",
+    [None, "{not json", json.dumps({"pid": 1, "source": "x"}), json.dumps(["pid"])],
+    ids=["missing", "invalid-json", "missing-fields", "not-an-object"],
+)
+def test_main_rejects_malformed_plans(tmp_path, plan_text):
+    plan_path = tmp_path / "swap-plan-1.json"
+    if plan_text is not None:
+        plan_path.write_text(plan_text, encoding="utf-8")
+
+    assert update_swap.main(["Binity.exe", APPLY_UPDATE_SWITCH, str(plan_path)]) == 2
+    assert update_swap.main(["Binity.exe", APPLY_UPDATE_SWITCH]) == 2
+
+
+def test_main_runs_and_removes_a_valid_plan(tmp_path):
+    plan = _plan(tmp_path)
+    plan_path = tmp_path / "swap-plan-1.json"
+    plan.save(plan_path)
+
+    assert update_swap.main(["Binity.exe", APPLY_UPDATE_SWITCH, str(plan_path)]) == 0
+    assert not plan_path.exists()
+    assert (tmp_path / "app" / "Binity.exe").read_bytes() == b"MZ new build"